@@ -1,5 +1,6 @@
 from flask import Flask
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_bcrypt import Bcrypt
@@ -7,6 +8,9 @@ from flask_jwt_extended import JWTManager,create_access_token, jwt_required,get_
 from flask_cors import CORS
 from config import Config
 from .utilis.redis import init_redis
+from .utilis.cache import init_cache
+from .utilis.events import init_events
+from .utilis.metrics import init_metrics
 
 db = SQLAlchemy(engine_options=Config.SQLALCHEMY_ENGINE_OPTIONS)
 bcrypt = Bcrypt()
@@ -17,10 +21,17 @@ def create_app():
     app = Flask(__name__)
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     app.config.from_object(Config)
-    # a central invalidation logic is required
-    # init_redis(app)
-    CORS(app)
+    if Config.TRUSTED_PROXY_HOPS > 0:
+        # request.remote_addr becomes the client's address, not the proxy's
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=Config.TRUSTED_PROXY_HOPS,
+                                x_proto=Config.TRUSTED_PROXY_HOPS)
+    init_redis(app)
+    init_metrics(app)
+    # Content-Disposition carries the certificate filename to the browser client
+    CORS(app, expose_headers=["Content-Disposition"])
     db.init_app(app)
+    init_cache(db.session)
+    init_events(db.session)
     migrate.init_app(app,db)
     bcrypt.init_app(app)
     jwt.init_app(app)
@@ -31,16 +42,21 @@ def create_app():
     from .routes.buyer_routes import buyer_bp
     from .routes.auditor_routes import auditor_bp
     from .routes.health_routes import health_bp
+    from .routes.stream_routes import stream_bp
+    from .routes.chain_routes import chain_bp
     
     app.register_blueprint(auth_bp)
     app.register_blueprint(NGO_bp)
     app.register_blueprint(buyer_bp)
     app.register_blueprint(auditor_bp)
     app.register_blueprint(health_bp)
-    
-    with app.app_context():
-        db.create_all()
-        print("Connected to NeonPostgresql !")
+    app.register_blueprint(stream_bp)
+    app.register_blueprint(chain_bp)
+
+    from .utilis.indexer import index_chain_command
+    app.cli.add_command(index_chain_command)
+    from .utilis.stats import rebuild_stats_command
+    app.cli.add_command(rebuild_stats_command)
 
     # print(app.url_map)
 
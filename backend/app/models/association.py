@@ -1,5 +1,18 @@
 from app import db
+from datetime import datetime
+
 class AuditorAssociation(db.Model):
     __tablename__ = 'auditor_association'
+    __table_args__ = (
+        # Open assignments of an auditor, read by the auditor dashboard
+        db.Index('ix_auditor_association_pending', 'auditor_id', postgresql_where=db.text('voted_at IS NULL')),
+    )
     credit_id = db.Column(db.Integer, db.ForeignKey('credits.id'), primary_key=True)
     auditor_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    # None until the auditor votes; also None for votes recorded before this table was used
+    vote = db.Column(db.Boolean)
+    assigned_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    voted_at = db.Column(db.DateTime)
+
+    credit = db.relationship('Credit', backref='auditor_assignments')
+    auditor = db.relationship('User', backref='audit_assignments')
@@ -0,0 +1,62 @@
+from app import db
+from datetime import datetime
+
+# Wide enough for any uint256 in wei
+Uint256 = db.Numeric(78, 0)
+
+
+class ChainCheckpoint(db.Model):
+    """How far an indexer has synced."""
+    __tablename__ = 'chain_checkpoints'
+    name = db.Column(db.String(64), primary_key=True)
+    block_number = db.Column(db.BigInteger, nullable=False)
+    # generateCredit does not carry the id it creates; it is the number of
+    # earlier successful generateCredit calls
+    next_credit_id = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ChainBlock(db.Model):
+    """Hashes of recently indexed blocks, kept to detect reorgs."""
+    __tablename__ = 'chain_blocks'
+    number = db.Column(db.BigInteger, primary_key=True, autoincrement=False)
+    hash = db.Column(db.String(66), nullable=False)
+    parent_hash = db.Column(db.String(66), nullable=False)
+
+
+class ChainCall(db.Model):
+    """A successful call to the CarbonCredit contract, decoded."""
+    __tablename__ = 'chain_calls'
+    __table_args__ = (
+        db.Index('ix_chain_calls_credit_order', 'credit_id', 'block_number', 'tx_index'),
+        # generateCredits creates several credits in one transaction
+        db.UniqueConstraint('txn_hash', 'credit_id', name='uq_chain_calls_txn_credit'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    block_number = db.Column(db.BigInteger, nullable=False, index=True)
+    tx_index = db.Column(db.Integer, nullable=False)
+    txn_hash = db.Column(db.String(66), nullable=False)
+    method = db.Column(db.String(32), nullable=False)
+    credit_id = db.Column(db.Integer, nullable=False)
+    sender = db.Column(db.String(42), nullable=False)
+    value = db.Column(Uint256, nullable=False, default=0)
+    args = db.Column(db.JSON, nullable=False)
+
+
+class ChainCredit(db.Model):
+    """Contract state of a credit, rebuilt from its calls."""
+    __tablename__ = 'chain_credits'
+    credit_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    creator = db.Column(db.String(42), nullable=False)
+    owner = db.Column(db.String(42), nullable=False)
+    amount = db.Column(Uint256, nullable=False)
+    price = db.Column(Uint256, nullable=False)
+    for_sale = db.Column(db.Boolean, nullable=False, default=False)
+    expired = db.Column(db.Boolean, nullable=False, default=False)
+    request_status = db.Column(db.SmallInteger, nullable=False, default=0)
+    num_auditors = db.Column(db.Integer, nullable=False)
+    audit_fees = db.Column(Uint256, nullable=False, default=0)
+    audit_score = db.Column(db.Integer, nullable=False, default=0)
+    # [[auditor address, vote], ...] in voting order
+    auditors = db.Column(db.JSON, nullable=False, default=list)
+    updated_block = db.Column(db.BigInteger, nullable=False)
@@ -1,18 +1,30 @@
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from app import db
 from app.models.user import User
-from sqlalchemy.dialects.postgresql import ARRAY
-# from app.models.association import AuditorAssociation
+from app.models.association import AuditorAssociation
 
 class Credit(db.Model):
     __tablename__ = 'credits'
+    __table_args__ = (
+        # The marketplace only ever reads listed credits
+        db.Index('ix_credits_active', 'id', postgresql_where=db.text('is_active')),
+        # Marketplace filters and keyset sort orders, all over listed credits only
+        db.Index('ix_credits_active_price', 'price', 'id', postgresql_where=db.text('is_active')),
+        db.Index('ix_credits_active_amount', 'amount', 'id', postgresql_where=db.text('is_active')),
+        db.Index('ix_credits_active_creator', 'creator_id', 'id', postgresql_where=db.text('is_active')),
+        db.Index('ix_credits_active_search', 'search_vector', postgresql_using='gin',
+                 postgresql_where=db.text('is_active')),
+    )
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     amount = db.Column(db.Integer, nullable=False)
     price = db.Column(db.Float, nullable=False)
     is_active = db.Column(db.Boolean, default=False)
     is_expired = db.Column(db.Boolean, default=False)
-    creator_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    creator_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     docu_url = db.Column(db.String(200))
-    auditors = db.Column(ARRAY(db.INTEGER))
     req_status = db.Column(db.Integer, nullable=False)
+    # Maintained by Postgres; the 'simple' config keeps project names as typed
+    # (no stemming or stop words)
+    search_vector = db.Column(TSVECTOR, db.Computed("to_tsvector('simple', coalesce(name, ''))", persisted=True))
     creator = db.relationship('User', backref='credits')
@@ -0,0 +1,33 @@
+from app import db
+from datetime import datetime
+
+# Dashboard totals, kept up to date by the routes that change them
+# (app/utilis/stats.py) so a summary is one primary-key read.
+# `flask rebuild-stats` recomputes them from the base tables.
+
+class NGOStats(db.Model):
+    __tablename__ = 'ngo_stats'
+    ngo_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True, autoincrement=False)
+    credits_issued = db.Column(db.Integer, nullable=False, default=0)
+    tons_issued = db.Column(db.BigInteger, nullable=False, default=0)
+    # Credits still waiting for auditor votes (req_status 1)
+    pending_audits = db.Column(db.Integer, nullable=False, default=0)
+    # Every sale of this NGO's credits, resales included
+    sales = db.Column(db.Integer, nullable=False, default=0)
+    tons_sold = db.Column(db.BigInteger, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0)
+    tons_retired = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class BuyerStats(db.Model):
+    __tablename__ = 'buyer_stats'
+    buyer_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True, autoincrement=False)
+    purchases = db.Column(db.Integer, nullable=False, default=0)
+    spent = db.Column(db.Float, nullable=False, default=0)
+    # Unexpired credits the buyer currently holds
+    credits_held = db.Column(db.Integer, nullable=False, default=0)
+    tons_held = db.Column(db.BigInteger, nullable=False, default=0)
+    # Credits that expired while the buyer held them
+    tons_retired = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
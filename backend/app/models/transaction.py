@@ -2,7 +2,20 @@ from app import db
 from datetime import datetime
 
 class PurchasedCredit(db.Model):
+    """Ownership ledger: one row per purchase of a credit, never deleted.
+
+    The holder's row is the credit's only one with is_current set; a resale
+    closes it (released_at) and appends the new buyer's row.
+    """
     __tablename__ = 'purchased_credits'
+    __table_args__ = (
+        # At most one current owner per credit
+        db.Index('ix_purchased_credits_current', 'credit_id', unique=True, postgresql_where=db.text('is_current')),
+        # Current holdings of a user
+        db.Index('ix_purchased_credits_holdings', 'user_id', postgresql_where=db.text('is_current')),
+        # Ownership history of a credit, oldest first
+        db.Index('ix_purchased_credits_history', 'credit_id', 'purchase_date'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     credit_id = db.Column(db.Integer, db.ForeignKey('credits.id'), nullable=False)
@@ -10,17 +23,30 @@ class PurchasedCredit(db.Model):
     purchase_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     is_expired = db.Column(db.Boolean, default=False)
     creator_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
-    
+    is_current = db.Column(db.Boolean, nullable=False, default=True)
+    released_at = db.Column(db.DateTime)
+    # The purchase that started this ownership
+    transaction_id = db.Column(db.Integer, db.ForeignKey('transactions.id'))
+
     user = db.relationship('User', foreign_keys=[user_id], backref='purchased_credits')
     credit = db.relationship('Credit', backref='purchases')
     creator = db.relationship('User', foreign_keys=[creator_id], backref='created_purchases')
+    transaction = db.relationship('Transactions')
 
 class Transactions(db.Model):
     __tablename__ = 'transactions'
+    __table_args__ = (
+        # Keyset pagination of the transaction feed orders on (timestamp, id);
+        # it also serves plain timestamp ordering
+        db.Index('ix_transactions_timestamp_id', 'timestamp', 'id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     buyer_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    credit_id = db.Column(db.Integer, db.ForeignKey('credits.id'), nullable=False)
+    credit_id = db.Column(db.Integer, db.ForeignKey('credits.id'), nullable=False, index=True)
     amount = db.Column(db.Integer, nullable=False)
     total_price = db.Column(db.Float, nullable=False)
     timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
-    txn_hash = db.Column(db.String, nullable=False)
+    # One row per on-chain purchase; retried requests find it instead of inserting
+    txn_hash = db.Column(db.String, nullable=False, unique=True)
+    # Set by the chain indexer once the purchase is seen in a block
+    block_number = db.Column(db.BigInteger)
@@ -1,94 +1,79 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from app import db, bcrypt
+from flask_jwt_extended import jwt_required
+from app import db
+from app.models.association import AuditorAssociation
 from app.models.credit import Credit
 from app.models.request import Request
+from app.models.stats import NGOStats
 from app.models.transaction import PurchasedCredit, Transactions
-from app.models.user import User
-from app.utilis.redis import get_redis
-import random
+from app.utilis.auditor_pool import NotEnoughAuditors, auditor_count, auditor_pool
+from app.utilis.auth import current_identity, current_user, role_required
+from app.utilis.cache import get_or_set, touch
+from app.utilis.events import emit
+from app.utilis.passwords import PasswordPoolBusy, check_password
+from app.utilis.rate_limit import rate_limit
+from app.utilis.stats import NGO_FIELDS, bump_buyer, bump_ngo, stats_payload
+from app.utilis.pagination import decode_cursor, encode_cursor, parse_limit
+from sqlalchemy import func, insert, tuple_
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime
+from config import Config
 import json
 
 NGO_bp = Blueprint('NGO', __name__)
-redis_client = get_redis()
-def get_current_user():
-    try:
-        return json.loads(get_jwt_identity())
-    except json.JSONDecodeError:
-        return None
-
 def numberOfAuditors(k) -> int:
     return int((k//500)*2 + 3)
 
 @NGO_bp.route('/api/NGO/credits', methods=['GET', 'POST'])
-@jwt_required()
+@role_required('NGO')
 def manage_credits():
-    current_user = get_current_user()
-    if current_user.get('role') != 'NGO':
-        return jsonify({"message": "Unauthorized"}), 403
+    user = current_identity()
 
-    user = User.query.filter_by(username=current_user.get('username')).first()
-
-    key = user.username
     # Ensure only credits created by this NGO are visible
     if request.method == 'GET':
-        if redis_client:
-            try:
-                cached_credits = redis_client.get(key)
-                if cached_credits:
-                    print("cache hit credit")
-                    print(f"key: {key}")
-                    return jsonify(json.loads(cached_credits))
-                else:
-                    print("cache miss credit")
-                    print(f"key: {key}")
-            except Exception as e:
-                print(f"redis get client error: {e}")
-        credits = Credit.query.filter_by(creator_id=user.id).order_by(Credit.id.asc()).all()
-        data = []
-        for c in credits:
-            req = Request.query.filter_by(credit_id=c.id).first()
-            data.append({
-                "id": c.id,
-                "name": c.name,
-                "amount": c.amount,
-                "price": c.price,
-                "is_active": c.is_active,
-                "is_expired": c.is_expired,
-                "creator_id": c.creator_id,
-                "secure_url": c.docu_url,
-                "req_status": c.req_status,
-                "auditors_count": len(c.auditors),
-                "auditor_left": len(req.auditors) if req and req.auditors else 0,
-                "score": req.score if req else 0
-            })
-        if redis_client:
-            try:
-                redis_client.set(key, json.dumps(data))
-            except Exception as e:
-                print(f"Redis error: {e}")
+        def load_credits():
+            # One query: requests and auditor assignments are LEFT JOINed and
+            # aggregated per credit
+            rows = (db.session.query(
+                        Credit,
+                        Request.score,
+                        func.count(AuditorAssociation.auditor_id),
+                        func.count(AuditorAssociation.auditor_id).filter(AuditorAssociation.voted_at.is_(None)))
+                    .outerjoin(Request, Request.credit_id == Credit.id)
+                    .outerjoin(AuditorAssociation, AuditorAssociation.credit_id == Credit.id)
+                    .filter(Credit.creator_id == user.id)
+                    .group_by(Credit.id, Request.id)
+                    .order_by(Credit.id.asc())
+                    .all())
+            data = []
+            for c, score, auditors_count, auditor_left in rows:
+                data.append({
+                    "id": c.id,
+                    "name": c.name,
+                    "amount": c.amount,
+                    "price": c.price,
+                    "is_active": c.is_active,
+                    "is_expired": c.is_expired,
+                    "creator_id": c.creator_id,
+                    "secure_url": c.docu_url,
+                    "req_status": c.req_status,
+                    "auditors_count": auditors_count,
+                    "auditor_left": auditor_left,
+                    "score": score or 0
+                })
+            return data
+        data = get_or_set(f"ngo_credits:{user.id}", ('credit', 'request'), load_credits)
         return jsonify(data), 200
 
     # Allow the NGO to create new credits
     if request.method == 'POST':
-        
-        if redis_client:
-            try:
-                # cached_credits = redis_client.get(key)
-                redis_client.delete(key)
-                print("cache credit delete")
-                print(f"key: {key}")
-            except:
-                pass
         #do something regarding the amount 
         data = request.json
 
-        auditors = User.query.filter_by(role = 'auditor').all()
-        auditor_ids = [auditor.id for auditor in auditors]
         k = numberOfAuditors(int(data['amount']))
         try:
-            selected_auditor_ids = random.sample(auditor_ids, k)
-        except ValueError:
+            selected_auditor_ids = auditor_pool.assign(k, exclude=(user.id,))
+        except NotEnoughAuditors:
             return jsonify({"message": "Not enough auditors"}), 503
         
         new_credit = Credit(
@@ -98,33 +83,116 @@ def manage_credits():
             price=data['price'], 
             creator_id=user.id,
             docu_url = data['secure_url'],
-            auditors = selected_auditor_ids,
             req_status = 1
         )
         db.session.add(new_credit)
 
         new_request = Request(
             credit_id=data['creditId'],
-            creator_id=user.id,
-            auditors=selected_auditor_ids
+            creator_id=user.id
         )
         db.session.add(new_request)
+        db.session.add_all([
+            AuditorAssociation(credit=new_credit, auditor_id=auditor_id)
+            for auditor_id in selected_auditor_ids
+        ])
 
-        
-        db.session.commit()
+        try:
+            bump_ngo(db.session, user.id, credits_issued=1, tons_issued=int(data['amount']), pending_audits=1)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            auditor_pool.release(*selected_auditor_ids)
+            raise
         return jsonify({"message": "Credit created successfully"}), 201
 
 
+BULK_CREDIT_FIELDS = ('creditId', 'name', 'amount', 'price', 'secure_url')
+
+@NGO_bp.route('/api/NGO/credits/bulk', methods=['POST'])
+@role_required('NGO')
+def bulk_create_credits():
+    """Register many credits at once, e.g. after one generateCredits transaction.
+
+    Body: {"credits": [{"creditId", "name", "amount", "price", "secure_url"}, ...]}
+    """
+    data = request.get_json(silent=True) or {}
+    credits = data.get('credits')
+    if not isinstance(credits, list) or not credits:
+        return jsonify({"message": "'credits' must be a non-empty list"}), 400
+    if len(credits) > Config.BULK_CREDITS_MAX:
+        return jsonify({"message": f"At most {Config.BULK_CREDITS_MAX} credits per request"}), 400
+    try:
+        credits = [{
+            "creditId": int(c['creditId']),
+            "name": str(c['name']),
+            "amount": int(c['amount']),
+            "price": float(c['price']),
+            "secure_url": c['secure_url'],
+        } for c in credits]
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"message": f"Every credit needs {', '.join(BULK_CREDIT_FIELDS)}"}), 400
+
+    credit_ids = [c['creditId'] for c in credits]
+    if len(set(credit_ids)) != len(credit_ids):
+        return jsonify({"message": "Duplicate creditId in request"}), 400
+    existing = [credit_id for (credit_id,) in
+                db.session.query(Credit.id).filter(Credit.id.in_(credit_ids))]
+    if existing:
+        return jsonify({"message": f"Credits already exist: {sorted(existing)}"}), 409
+
+    user = current_identity()
+    now = datetime.utcnow()
+    credit_rows, request_rows, assignment_rows = [], [], []
+    # Assigned one credit at a time, so each credit goes to whoever is least
+    # loaded after the previous ones
+    assigned = []
+    for c in credits:
+        try:
+            auditor_ids = auditor_pool.assign(numberOfAuditors(c['amount']), exclude=(user.id,))
+        except NotEnoughAuditors:
+            auditor_pool.release(*assigned)
+            return jsonify({"message": f"Not enough auditors for credit {c['creditId']}. Maybe split the credits !"}), 503
+        assigned.extend(auditor_ids)
+        credit_rows.append({
+            "id": c['creditId'],
+            "name": c['name'],
+            "amount": c['amount'],
+            "price": c['price'],
+            "creator_id": user.id,
+            "docu_url": c['secure_url'],
+            "req_status": 1,
+            "is_active": False,
+            "is_expired": False,
+        })
+        request_rows.append({"credit_id": c['creditId'], "creator_id": user.id})
+        assignment_rows.extend({"credit_id": c['creditId'], "auditor_id": auditor_id, "assigned_at": now}
+                               for auditor_id in auditor_ids)
+
+    # executemany inserts, bypassing the unit of work; caches are invalidated
+    # once when the transaction commits
+    try:
+        db.session.execute(insert(Credit), credit_rows)
+        db.session.execute(insert(Request), request_rows)
+        db.session.execute(insert(AuditorAssociation), assignment_rows)
+        bump_ngo(db.session, user.id, credits_issued=len(credit_rows), pending_audits=len(credit_rows),
+                 tons_issued=sum(c['amount'] for c in credit_rows))
+        touch(db.session, 'credit', 'request')
+        db.session.commit()
+    except IntegrityError:
+        # Another request registered one of these ids first
+        db.session.rollback()
+        auditor_pool.release(*assigned)
+        return jsonify({"message": "Some of these credits already exist"}), 409
+    return jsonify({"message": f"{len(credit_rows)} credits created successfully", "credit_ids": credit_ids}), 201
+
+
 @NGO_bp.route('/api/NGO/credits/expire/<int:credit_id>', methods=['PATCH'])
-@jwt_required()
+@role_required('NGO')
 def expire_credit(credit_id):
-    current_user = get_current_user()
-    if current_user.get('role') != 'NGO':
-        return jsonify({"message": "Unauthorized"}), 403
-
-    user = User.query.filter_by(username=current_user.get('username')).first()
+    user = current_identity()
     credit = Credit.query.get(credit_id)
-    pc = PurchasedCredit.query.filter_by(credit_id=credit.id).first()
+    pc = PurchasedCredit.query.filter_by(credit_id=credit_id, is_current=True).first()
 
     if not credit:
         return jsonify({"message": "Credit not found"}), 404
@@ -133,79 +201,97 @@ def expire_credit(credit_id):
     # Ensure only the creator NGO can expire the credit
     if credit.creator_id != user.id:
         return jsonify({"message": "You do not have permission to expire this credit"}), 403
-    key = user.username 
+    # Count the retirement once; the chain indexer may have flagged the
+    # credit itself already, but only this route marks the holding
+    if not pc.is_expired:
+        bump_ngo(db.session, credit.creator_id, tons_retired=credit.amount)
+        bump_buyer(db.session, pc.user_id, credits_held=-1, tons_held=-pc.amount, tons_retired=pc.amount)
     # Expire the credit
-    if redis_client:
-        redis_client.delete(key)
     credit.is_active = False
     credit.is_expired = True
     pc.is_expired = True
+    emit(db.session, 'credit.expired', {"id": credit.id, "creator_id": credit.creator_id})
     db.session.commit()
     return jsonify({"message": "Credit expired successfully"}), 200
 
+@NGO_bp.route('/api/NGO/summary', methods=['GET'])
+@role_required('NGO')
+def get_summary():
+    """Dashboard totals: credits and tons issued, audits pending, sales, revenue and tons retired."""
+    stats = db.session.get(NGOStats, current_identity().id)
+    return jsonify(stats_payload(stats, NGO_FIELDS)), 200
+
 @NGO_bp.route('/api/NGO/transactions', methods=['GET'])
-@jwt_required()
+@role_required('NGO')
 def get_transactions():
-    current_user = get_current_user()
-    if current_user.get('role') != 'NGO':
-        return jsonify({"message": "Unauthorized"}), 403
-    key = current_user.get('username')+"trans"
-    if redis_client:
+
+    cursor = request.args.get('cursor')
+    try:
+        limit = parse_limit(request.args)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    after = None
+    if cursor:
         try:
-            cached_txns = redis_client.get(key)
-            if cached_txns:
-                print("Cache hit")
-                return jsonify(json.loads(cached_txns)), 200
-            else:
-                print("Cache miss")
-        except Exception as e:
-            print(f"redis get client error: {e}")
-    transactions = Transactions.query.order_by(Transactions.timestamp.desc()).all()
-    transaction_list = []
-    for t in transactions:
-        transaction_list.append({
-            "id": t.id,
-            "buyer": t.buyer_id,
-            "credit": t.credit_id,
-            "amount": t.amount,
-            "total_price": t.total_price,
-            "timestamp": t.timestamp.isoformat(),
-            "txn_hash": t.txn_hash
-        })
-        if redis_client:
-            try:
-                redis_client.set(key,json.dumps(transaction_list),px=500)
-            except Exception as e:
-                print(f"Redis error: {e}")
-    return jsonify(transaction_list)
+            timestamp, last_id = decode_cursor(cursor)
+            after = (datetime.fromisoformat(timestamp), int(last_id))
+        except (ValueError, TypeError):
+            return jsonify({"message": "Invalid 'cursor' parameter"}), 400
+
+    user = current_identity()
+
+    def load_transactions():
+        # Only sales of this NGO's credits, newest first, keyset-paginated on (timestamp, id)
+        query = (Transactions.query
+                 .join(Credit, Credit.id == Transactions.credit_id)
+                 .filter(Credit.creator_id == user.id))
+        if after:
+            query = query.filter(tuple_(Transactions.timestamp, Transactions.id) < after)
+        rows = (query.order_by(Transactions.timestamp.desc(), Transactions.id.desc())
+                .limit(limit + 1)
+                .all())
+        page = rows[:limit]
+        return {
+            "transactions": [{
+                "id": t.id,
+                "buyer": t.buyer_id,
+                "credit": t.credit_id,
+                "amount": t.amount,
+                "total_price": t.total_price,
+                "timestamp": t.timestamp.isoformat(),
+                "txn_hash": t.txn_hash
+            } for t in page],
+            "next_cursor": encode_cursor(page[-1].timestamp, page[-1].id) if len(rows) > limit else None
+        }
+    key = f"ngo_transactions:{user.id}:{limit}:{cursor or ''}"
+    return jsonify(get_or_set(key, ('transaction', 'credit'), load_transactions))
 
 
 @NGO_bp.route('/api/NGO/expire-req', methods=['POST'])
-@jwt_required()
+@rate_limit('expire-req', Config.LOGIN_RATE_LIMIT, Config.RATE_LIMIT_WINDOW)
+@role_required('NGO')
 def check_expire_request():
     data = request.json
 
-    current_user = get_current_user()
-    if current_user.get('role') != 'NGO':
-        return jsonify({"message": "Unauthorized"}), 403
-
-    username = current_user.get('username')
     # Fetch user details from the database
-    user = User.query.filter_by(username=username).first()
+    user = current_user()
 
     if not user:
         return jsonify({"message": "User not found"}), 404
 
     #check if the given password was true 
-    if bcrypt.check_password_hash(user.password, data['password']):
+    try:
+        verified = check_password(user.password, data['password'])
+    except PasswordPoolBusy:
+        return jsonify({"message": "Server busy, try again shortly"}), 503
+    if verified:
         return jsonify({"message": "User verified succesfully! can proceed to expire credit"}), 200
     return jsonify({"message": "Invalid credentials"}), 401
 
 @NGO_bp.route('/api/NGO/audit-req', methods=['GET'])
 @jwt_required()
 def check_audit_request():
-    auditors = User.query.filter_by(role = 'auditor').all()
-    num_auditors = len(auditors)
+    num_auditors = auditor_count()
     # print("auditors avail:",num_auditors)
 
     carbon_amount = request.args.get('amount')
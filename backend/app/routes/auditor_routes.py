@@ -1,88 +1,89 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db, bcrypt
+from app.models.association import AuditorAssociation
 from app.models.credit import Credit
 from app.models.request import Request
 from app.models.transaction import PurchasedCredit, Transactions 
 from app.models.user import User
-from app.utilis.redis import get_redis
+from app.utilis.auditor_pool import auditor_pool
+from app.utilis.auth import current_identity, role_required
+from app.utilis.cache import get_or_set, touch
+from app.utilis.events import emit
+from app.utilis.stats import bump_ngo
+from sqlalchemy import func, update
+from datetime import datetime
 import json
 auditor_bp = Blueprint('auditor', __name__)
-redis_client = get_redis()
-def get_current_user():
-    try:
-        return json.loads(get_jwt_identity())
-    except json.JSONDecodeError:
-        return None
-
 @auditor_bp.route('/api/auditor/credits', methods=['GET'])
-@jwt_required()
+@role_required('auditor')
 def manage_credits():
-    current_user = get_current_user()
-    if current_user.get('role') != 'auditor':
-        return jsonify({"message": "Unauthorized"}), 403
-    user = User.query.filter_by(username=current_user.get('username')).first()
-    # key = user.username
-    requests = Request.query.filter(Request.auditors.contains([user.id])).all()
-    
-    credit_ids = [r.credit_id for r in requests]
+    user = current_identity()
 
-    credits = Credit.query.filter(Credit.id.in_(credit_ids)).all()
-    data = [{
-        "id": credit.id,
-        "name": credit.name,
-        "amount": credit.amount,
-        "price": credit.price,
-        "is_active": credit.is_active,
-        "is_expired": credit.is_expired,
-        "secure_url": credit.docu_url
-    }for credit in credits]
+    def load_credits():
+        credits = (Credit.query
+                   .join(AuditorAssociation, AuditorAssociation.credit_id == Credit.id)
+                   .filter(AuditorAssociation.auditor_id == user.id,
+                           AuditorAssociation.voted_at.is_(None))
+                   .all())
+        return [{
+            "id": credit.id,
+            "name": credit.name,
+            "amount": credit.amount,
+            "price": credit.price,
+            "is_active": credit.is_active,
+            "is_expired": credit.is_expired,
+            "secure_url": credit.docu_url
+        }for credit in credits]
+    data = get_or_set(f"auditor_credits:{user.id}", ('request', 'credit'), load_credits)
     return jsonify(data), 200
 
 @auditor_bp.route('/api/auditor/audit/<int:credit_id>', methods=['PATCH'])
-@jwt_required()
+@role_required('auditor')
 def audit_credit(credit_id):
-    current_user = get_current_user()
-    if current_user.get('role') != 'auditor':
-        return jsonify({"message": "Unauthorized"}), 403
-    
     data = request.json
 
     
-    # print("credit id", credit_id)
-    user = User.query.filter_by(username=current_user.get('username')).first()
-    request_obj = Request.query.filter_by(credit_id=credit_id).first()
-    cid = request_obj.creator_id
-    print(f"creator_id: {cid}")
-    cu_ngo = User.query.filter_by(id =cid).first()
-    key = cu_ngo.username
-    print(f"key: {key}")
-    if redis_client:
-        try:
-            redis_client.delete(key)
-            print("deleted cached credits")
-        except:
-            pass
+    vote = bool(data['vote'])
+    user = current_identity()
 
-    if not request_obj or user.id not in request_obj.auditors:
+    # Votes on a credit are serialized on its request row (SELECT ... FOR UPDATE),
+    # so the last vote always sees every earlier one and closes the audit.
+    request_obj = Request.query.filter_by(credit_id=credit_id).with_for_update().first()
+    if not request_obj:
         return jsonify({"message": "Not assigned or already audited"}), 404
 
-    
-    if(data['vote']):
-        request_obj.score += 1
-    else:
-        request_obj.score -= 1
+    # Conditional UPDATE: a repeated vote matches no row instead of counting twice
+    voted = db.session.execute(
+        update(AuditorAssociation)
+        .where(AuditorAssociation.credit_id == credit_id,
+               AuditorAssociation.auditor_id == user.id,
+               AuditorAssociation.voted_at.is_(None))
+        .values(vote=vote, voted_at=datetime.utcnow())
+    ).rowcount
+    if not voted:
+        db.session.rollback()
+        return jsonify({"message": "Not assigned or already audited"}), 404
 
-    
-    # Remove auditor
-    request_obj.auditors.remove(user.id)
+    db.session.execute(
+        update(Request)
+        .where(Request.id == request_obj.id)
+        .values(score=func.coalesce(Request.score, 0) + (1 if vote else -1))
+    )
 
     # If no auditors left, update req_status in Credit table
-    if len(request_obj.auditors) == 0:
-        credit = Credit.query.filter_by(id=credit_id).first()
-        if credit:
-            credit.req_status = 2
-            
+    pending = AuditorAssociation.query.filter_by(credit_id=credit_id, voted_at=None).count()
+    if pending == 0:
+        db.session.execute(update(Credit).where(Credit.id == credit_id).values(req_status=2))
+        bump_ngo(db.session, request_obj.creator_id, pending_audits=-1)
+
+    touch(db.session, 'request', 'credit')
+    emit(db.session, 'credit.audited', {
+        "id": credit_id,
+        "creator_id": request_obj.creator_id,
+        "auditor_left": pending,
+        "req_status": 2 if pending == 0 else 1,
+    })
     db.session.commit()
+    auditor_pool.release(user.id)
 
     return jsonify({"message": f"Audit completed, vote: {data['vote']}"}), 200
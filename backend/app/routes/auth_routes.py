@@ -1,45 +1,52 @@
-import requests
 from flask import Blueprint, request, jsonify
-from app import db, bcrypt, create_access_token
+from app import db, create_access_token
 from app.models.user import User
+from app.utilis.auditor_pool import auditor_pool
+from app.utilis.auth import identity_claims
+from app.utilis.captcha import verify_captcha
+from app.utilis.passwords import PasswordPoolBusy, check_password, hash_password
+from app.utilis.rate_limit import rate_limit
+from config import Config
 import json
-import os
-from dotenv import load_dotenv
 from datetime import timedelta
 
-load_dotenv()
-
 auth_bp = Blueprint('auth', __name__)
-SECRET_KEY =os.getenv('SECRET_KEY','1x0000000000000000000000000000000AA')
 @auth_bp.route('/api/signup', methods=['POST'])
+@rate_limit('signup', Config.SIGNUP_RATE_LIMIT, Config.RATE_LIMIT_WINDOW)
 def signup():
     data = request.json
 
     captcha_response = data.get('cf-turnstile-response')
-    captcha_verify = requests.post('https://challenges.cloudflare.com/turnstile/v0/siteverify',
-                                   data={
-                                   'secret': SECRET_KEY,
-                                   'response': captcha_response,
-                                   }).json()
-    if not captcha_verify.get('success'):
+    if not verify_captcha(captcha_response, request.remote_addr):
         return jsonify({"message":"CAPTCHA failed"}),400
-    hashed_password = bcrypt.generate_password_hash(data['password']).decode('utf-8')
+    try:
+        hashed_password = hash_password(data['password'])
+    except PasswordPoolBusy:
+        return jsonify({"message": "Server busy, try again shortly"}), 503
     new_user = User(username=data['username'], email=data['email'], password=hashed_password, role=data['role'])
     db.session.add(new_user)
     db.session.commit()
+    if new_user.role == 'auditor':
+        auditor_pool.add(new_user.id)
     return jsonify({"message": f"{data['role']} created successfully"}), 201
 
 @auth_bp.route('/api/login', methods=['POST'])
+@rate_limit('login', Config.LOGIN_RATE_LIMIT, Config.RATE_LIMIT_WINDOW)
 def login():
     data = request.json
     user = User.query.filter_by(username=data['username']).first()
 
-    if user and bcrypt.check_password_hash(user.password, data['password']):
+    try:
+        verified = user is not None and check_password(user.password, data['password'])
+    except PasswordPoolBusy:
+        return jsonify({"message": "Server busy, try again shortly"}), 503
+    if verified:
         if data['role'] != user.role:
             return jsonify({"message": "Unauthorized"}),403
         identity = json.dumps({"username": user.username, "role": user.role})
         expires = timedelta(hours=12)
-        access_token = create_access_token(identity=identity, expires_delta= expires)
+        access_token = create_access_token(identity=identity, expires_delta= expires,
+                                           additional_claims=identity_claims(user))
         return jsonify(access_token=access_token,role=user.role), 200
     return jsonify({"message": "Invalid credentials"}), 401
 
@@ -1,85 +1,206 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, Response, request, jsonify, send_file
+from sqlalchemy import func, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 from app.models.user import User
+from app.models.association import AuditorAssociation
+from app.models.chain import ChainCall, ChainCredit
+from app.models.stats import BuyerStats
 from app.models.credit import Credit
 from app.models.transaction import PurchasedCredit
 from app.models.transaction import Transactions
-from app.utilis.redis import get_redis
-from app.utilis.certificate_generator import generate_certificate_data
+from app.utilis.auth import current_identity, role_required
+from app.utilis.cache import get_or_set
+from app.utilis.chain import chain_credit_payload
+from app.utilis.events import emit
+from app.utilis.stats import BUYER_FIELDS, bump_buyer, bump_ngo, stats_payload
+from app.utilis.certificate_generator import CERTIFICATE_FIELDS, certificate_context, generate_certificate_data
+from app.utilis import certificate_renderer
+from app.utilis.pagination import InvalidCursor, decode_cursor, encode_cursor, parse_limit
+import hashlib
 import json
-import io
-import base64
-from weasyprint import HTML
+import re
+from datetime import datetime
 from app import db
+from config import Config
 
 buyer_bp = Blueprint('buyer_bp', __name__)
-redis_client = get_redis()
-def get_current_user():
-    try:
-        return json.loads(get_jwt_identity())
-    except json.JSONDecodeError:
-        return None
+def marketplace_item(c):
+    # Shape of a listed credit, shared by the marketplace and its event stream
+    return {"id": c.id, "name": c.name, "amount": c.amount, "price": c.price,"creator":c.creator_id, "secure_url": c.docu_url}
+
+# sort parameter -> (column, descending); every order is tie-broken on id
+MARKETPLACE_SORTS = {
+    "id": (Credit.id, False),
+    "-id": (Credit.id, True),
+    "price": (Credit.price, False),
+    "-price": (Credit.price, True),
+    "amount": (Credit.amount, False),
+    "-amount": (Credit.amount, True),
+}
+MARKETPLACE_FILTERS = {
+    "min_price": float,
+    "max_price": float,
+    "min_amount": int,
+    "max_amount": int,
+    "creator": int,
+}
+
+def _parse_marketplace_query(args):
+    """Normalize the listing query string; raises ValueError with a client-facing message."""
+    query = {"sort": args.get('sort', 'id'), "limit": parse_limit(args), "cursor": args.get('cursor') or None}
+    if query["sort"] not in MARKETPLACE_SORTS:
+        raise ValueError(f"'sort' must be one of {', '.join(MARKETPLACE_SORTS)}")
+    if query["cursor"]:
+        # (id,) when sorting by id, else (sort value, id)
+        values = decode_cursor(query["cursor"])
+        expected = 1 if MARKETPLACE_SORTS[query["sort"]][0] is Credit.id else 2
+        if len(values) != expected or not all(
+                isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+            raise InvalidCursor("Invalid 'cursor' parameter")
+    for name, cast in MARKETPLACE_FILTERS.items():
+        value = args.get(name)
+        if value is None or value == '':
+            continue
+        try:
+            query[name] = cast(value)
+        except ValueError:
+            raise ValueError(f"'{name}' must be a number")
+    # Words of the search text; the last one matches as a prefix so results
+    # narrow while the user is still typing
+    terms = re.findall(r'\w+', args.get('q', '').lower())
+    if terms:
+        query["q"] = ' & '.join(terms[:-1] + [terms[-1] + ':*'])
+    return query
+
+def _marketplace_query(query):
+    """The listing SELECT for a parsed query, one row past the page to detect a next page."""
+    column, descending = MARKETPLACE_SORTS[query["sort"]]
+    # `= true`, not IS TRUE: only the former lets Postgres match the partial
+    # ix_credits_active* indexes (WHERE is_active)
+    credits = Credit.query.filter(Credit.is_active == True)
+    if "min_price" in query:
+        credits = credits.filter(Credit.price >= query["min_price"])
+    if "max_price" in query:
+        credits = credits.filter(Credit.price <= query["max_price"])
+    if "min_amount" in query:
+        credits = credits.filter(Credit.amount >= query["min_amount"])
+    if "max_amount" in query:
+        credits = credits.filter(Credit.amount <= query["max_amount"])
+    if "creator" in query:
+        credits = credits.filter(Credit.creator_id == query["creator"])
+    if "q" in query:
+        credits = credits.filter(Credit.search_vector.op('@@')(func.to_tsquery('simple', query["q"])))
+    if query["cursor"]:
+        last = tuple_(*decode_cursor(query["cursor"]))
+        key = tuple_(column, Credit.id)
+        credits = credits.filter(key < last if descending else key > last)
+    if column is Credit.id:
+        order = [Credit.id.desc() if descending else Credit.id.asc()]
+    else:
+        order = [column.desc(), Credit.id.desc()] if descending else [column.asc(), Credit.id.asc()]
+    return credits.order_by(*order).limit(query["limit"] + 1)
+
+def _marketplace_page(query):
+    column, _ = MARKETPLACE_SORTS[query["sort"]]
+    rows = _marketplace_query(query).all()
+    page = rows[:query["limit"]]
+    next_cursor = None
+    if len(rows) > query["limit"]:
+        last = page[-1]
+        next_cursor = encode_cursor(last.id) if column is Credit.id else encode_cursor(getattr(last, column.key), last.id)
+    return {"credits": [marketplace_item(c) for c in page], "next_cursor": next_cursor}
 
 @buyer_bp.route('/api/buyer/credits', methods=['GET'])
-@jwt_required()
+@role_required()
 def buyer_credits():
-    key = "buyer_credits"
-    if redis_client:
-        try:
-            cached_credits = redis_client.get(key)
-            if cached_credits:
-                print("cache hit buyer_credits")
-                return jsonify(json.loads(cached_credits))
-            else:
-                print("cache miss buyer_credits")
-        except Exception as e:
-            print(f"redis get client error: {e}")
-    credits = Credit.query.filter_by(is_active =True).all()
-    data = [{"id": c.id, "name": c.name, "amount": c.amount, "price": c.price,"creator":c.creator_id, "secure_url": c.docu_url} for c in credits]
-    if redis_client:
-        try:
-            redis_client.set(key, json.dumps(data),px = 500)
-            print("buyer_credits cached")
-        except:
-            pass
-    return jsonify(data)
+    """Listed credits, filtered, sorted and keyset-paginated.
+
+    Query: q (name search), min_price, max_price, min_amount, max_amount,
+    creator, sort (id, price, amount; prefix - for descending), limit, cursor.
+    """
+    try:
+        query = _parse_marketplace_query(request.args)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    # One cache entry per distinct query; the key is the normalized query so
+    # equivalent query strings share it
+    shape = hashlib.sha1(json.dumps(query, sort_keys=True).encode('utf-8')).hexdigest()
+    return jsonify(get_or_set(f"buyer_credits:{shape}", ('credit',), lambda: _marketplace_page(query)))
+
+def _purchase_result(transaction):
+    return {"message": "Credit purchased successfully", "transaction_id": transaction.id}
+
+def _replay_purchase(txn_hash, buyer_id, credit_id):
+    """The response already given for `txn_hash`, or None if it is new."""
+    transaction = Transactions.query.filter_by(txn_hash=txn_hash).first()
+    if transaction is None:
+        return None
+    if transaction.buyer_id != buyer_id or transaction.credit_id != credit_id:
+        return jsonify({"message": "txn_hash already recorded for another purchase"}), 409
+    return jsonify(_purchase_result(transaction)), 200
 
 @buyer_bp.route('/api/buyer/purchase', methods=['POST'])
-@jwt_required()
+@role_required()
 def purchase_credit():
-    current_user = get_current_user()
-    if not current_user:
-        return jsonify({"message": "Invalid token"}), 401
+    """Record a purchase made on chain; idempotent on txn_hash.
 
+    Retrying with the same txn_hash returns the original result without
+    writing. Purchases of one credit are serialized on its row, so of two
+    buyers racing for a listing only the first is recorded.
+    """
     data = request.json
     if not data or 'credit_id' not in data:
         return jsonify({"message": "Missing credit_id"}), 400
     # print(data) 
     if 'txn_hash' not in data:
         return jsonify({"message": "Missing txn_hash"}), 400
-
-    # Retrieve the credit
-    credit = Credit.query.get(data['credit_id'])
-    if not credit:
-        return jsonify({"message": "Credit not found"}), 404
+    txn_hash = str(data['txn_hash']).strip().lower()
+    try:
+        credit_id = int(data['credit_id'])
+    except (TypeError, ValueError):
+        return jsonify({"message": "'credit_id' must be an integer"}), 400
 
     # Check if the current user exists
-    user = User.query.filter_by(username=current_user['username']).first()
+    user = current_identity()
     if not user:
         return jsonify({"message": "User not found"}), 404
 
-    # Check if the credit already exists in the purchased_credits table
-    existing_credit = PurchasedCredit.query.filter_by(credit_id=credit.id).first()
-    if existing_credit:
-        db.session.delete(existing_credit)
+    # Retries are answered from the transaction row, without locking anything
+    replay = _replay_purchase(txn_hash, user.id, credit_id)
+    if replay is not None:
+        return replay
 
-    # Add new entry to purchased_credits
-    purchased_credit = PurchasedCredit(
-        user_id=user.id,
-        credit_id=credit.id,
-        amount=credit.amount,
-        creator_id=credit.creator_id,
-    )
+    # Retrieve and lock the credit
+    credit = Credit.query.filter_by(id=credit_id).with_for_update().first()
+    if not credit:
+        db.session.rollback()
+        return jsonify({"message": "Credit not found"}), 404
+    # A concurrent retry may have committed while we waited for the lock
+    replay = _replay_purchase(txn_hash, user.id, credit.id)
+    if replay is not None:
+        db.session.rollback()
+        return replay
+    # The chain indexer delists a credit as soon as it sees the buy, which
+    # can be before the buyer's client reports it
+    seen_on_chain = (ChainCall.query
+                     .filter_by(txn_hash=txn_hash, credit_id=credit.id, method='buyCredit')
+                     .first()) is not None
+    if not credit.is_active and not seen_on_chain:
+        db.session.rollback()
+        return jsonify({"message": "Credit is not for sale"}), 409
+
+    # Close the previous owner's entry in the ownership ledger
+    now = datetime.utcnow()
+    previous = PurchasedCredit.query.filter_by(credit_id=credit.id, is_current=True).first()
+    if previous:
+        if not previous.is_expired:
+            bump_buyer(db.session, previous.user_id, credits_held=-1, tons_held=-previous.amount)
+        previous.is_current = False
+        previous.released_at = now
+        # Before the new row goes in: one current owner per credit
+        db.session.flush()
 
     # Record the transaction
     transaction = Transactions(
@@ -87,34 +208,53 @@ def purchase_credit():
         credit_id=credit.id,
         amount=credit.amount,
         total_price=credit.price,
-        txn_hash=data['txn_hash']
+        timestamp=now,
+        txn_hash=txn_hash
+    )
+    # And the buyer's ownership, started by it
+    purchased_credit = PurchasedCredit(
+        user_id=user.id,
+        credit_id=credit.id,
+        amount=credit.amount,
+        creator_id=credit.creator_id,
+        purchase_date=now,
+        transaction=transaction,
     )
-    key = "buyer_credits"
-    if redis_client:
-        try:
-            redis_client.delete(key)
-        except Exception as e:
-            print(f"redis get client error: {e}")
     # Update the credit to inactive
     credit.is_active = False
 
     # Add and commit the changes
     db.session.add(purchased_credit)
     db.session.add(transaction)
+    try:
+        db.session.flush()
+    except IntegrityError:
+        # The same txn_hash was just recorded against another credit
+        db.session.rollback()
+        return _replay_purchase(txn_hash, user.id, credit_id) or (
+            jsonify({"message": "txn_hash already recorded for another purchase"}), 409)
+    bump_buyer(db.session, user.id, purchases=1, spent=credit.price, credits_held=1, tons_held=credit.amount)
+    bump_ngo(db.session, credit.creator_id, sales=1, tons_sold=credit.amount, revenue=credit.price)
+    emit(db.session, 'credit.purchased', {
+        "id": credit.id,
+        "creator_id": credit.creator_id,
+        "buyer_id": user.id,
+        "amount": transaction.amount,
+        "total_price": transaction.total_price,
+        "timestamp": transaction.timestamp.isoformat(),
+        "txn_hash": transaction.txn_hash,
+        "transaction_id": transaction.id,
+    })
     db.session.commit()
 
-    return jsonify({"message": "Credit purchased successfully"}), 200
+    return jsonify(_purchase_result(transaction)), 200
 
 
 @buyer_bp.route('/api/buyer/sell', methods=['PATCH'])
-@jwt_required()
+@role_required()
 def sell_credit():
     # get creditId from request and in credits DB set is_active == true for object that same id
 
-    current_user  = get_current_user()
-    if not current_user:
-        return jsonify({"message" : "Invalid token"}),401
-
     # Parse request data
     data = request.json
     if not data or 'credit_id' not in data or 'salePrice' not in data:
@@ -128,18 +268,16 @@ def sell_credit():
         if(credit.req_status != 3):
             credit.req_status = 3
             
+        emit(db.session, 'credit.listed', marketplace_item(credit))
         db.session.commit()
 
         return jsonify({"message": f"Credit put to sale with price {data['salePrice']}" }), 200
     return jsonify({"message": "Can't sell at this point"}), 400
 
 @buyer_bp.route('/api/buyer/remove-from-sale', methods=['PATCH'])
-@jwt_required()
+@role_required()
 def remove_credit():
     # get creditId from request and in credits DB set is_active == false for object with same id
-    current_user  = get_current_user()
-    if not current_user:
-        return jsonify({"message" : "Invalid token"}),401
 
     # Parse request data
     data = request.json
@@ -149,127 +287,177 @@ def remove_credit():
     credit = Credit.query.get(data['credit_id'])
     if credit:
         credit.is_active = False
+        emit(db.session, 'credit.delisted', {"id": credit.id, "creator_id": credit.creator_id})
         db.session.commit()
 
         return jsonify({"message": "Credit removed from sale" }), 200
     return jsonify({"message": "For some reason cant remove from sale, man if error is coming here we are cooked"}), 400
 
+@buyer_bp.route('/api/buyer/summary', methods=['GET'])
+@role_required()
+def get_summary():
+    """Dashboard totals: purchases, spend, credits and tons held, tons retired."""
+    stats = db.session.get(BuyerStats, current_identity().id)
+    return jsonify(stats_payload(stats, BUYER_FIELDS)), 200
+
 @buyer_bp.route('/api/buyer/purchased', methods=['GET'])
-@jwt_required()
+@role_required()
 def get_purchased_credits():
-    current_user = get_current_user()
-    if not current_user:
-        return jsonify({"message": "Invalid token"}), 401
+    user = current_identity()
 
-    user = User.query.filter_by(username=current_user['username']).first()
-    key = user.username
-    if redis_client:
-        try:
-            cached_purchased = redis_client.get(key)
-            if cached_purchased:
-                return jsonify(json.loads(cached_purchased)), 200
-        except Exception as e:
-            print(f"redis get client error: {e}")
-
-    purchased_credits = PurchasedCredit.query.filter_by(user_id=user.id).all()
-    credits = []
-    for pc in purchased_credits:
-        credit = Credit.query.get(pc.credit_id)
-        creator = User.query.get(pc.creator_id) if pc.creator_id else None
-        credits.append({
-            "id": credit.id,
-            "name": credit.name,
-            "amount": pc.amount,
-            "price": credit.price,
-            "is_active": credit.is_active,
-            "is_expired": credit.is_expired,
-            "creator": {
-                "id": creator.id,
-                "username": creator.username,
-                "email": creator.email
-            } if creator else None
-        })
-        if redis_client:
-            try:
-                redis_client.set(key,json.dumps(credits),px=500)
-                print("puchased cached")
-            except:
-                pass
+    def load_purchased():
+        purchased_credits = (PurchasedCredit.query
+                             .options(joinedload(PurchasedCredit.credit), joinedload(PurchasedCredit.creator))
+                             .filter_by(user_id=user.id, is_current=True)
+                             .all())
+        credits = []
+        for pc in purchased_credits:
+            credit = pc.credit
+            creator = pc.creator
+            credits.append({
+                "id": credit.id,
+                "name": credit.name,
+                "amount": pc.amount,
+                "price": credit.price,
+                "is_active": credit.is_active,
+                "is_expired": credit.is_expired,
+                "creator": {
+                    "id": creator.id,
+                    "username": creator.username,
+                    "email": creator.email
+                } if creator else None
+            })
+        return credits
+    credits = get_or_set(f"purchased:{user.id}", ('purchase', 'credit', 'user'), load_purchased)
     return jsonify(credits), 200
 
+def _current_holding(credit_id, user_id):
+    """The caller's ledger entry for a credit they hold, with its credit and purchase, in one query."""
+    return (PurchasedCredit.query
+            .options(joinedload(PurchasedCredit.credit), joinedload(PurchasedCredit.transaction))
+            .filter_by(credit_id=credit_id, user_id=user_id, is_current=True)
+            .first())
+
 @buyer_bp.route('/api/buyer/generate-certificate/<int:creditId>', methods=['GET'])
-@jwt_required()
+@role_required()
 def generate_certificate(creditId):
-    current_user = get_current_user()
-    if not current_user:
-        return jsonify({"message": "Invalid token"}), 401
-    
-    user = User.query.filter_by(username=current_user['username']).first()
-    purchased_credit = PurchasedCredit.query.filter_by(credit_id=creditId, user_id=user.id).first()
+    user = current_identity()
+    purchased_credit = _current_holding(creditId, user.id)
     if not purchased_credit:
         return jsonify({"message": f"Credit with {creditId} was never purchased"}), 404
 
-    credit = Credit.query.get(purchased_credit.credit_id)
+    credit = purchased_credit.credit
     if credit is None:
         return jsonify({"message":"No such credit found"}),404
 
-    transaction = Transactions.query.filter_by(credit_id=purchased_credit.credit_id).order_by(Transactions.timestamp.desc()).first()
+    transaction = purchased_credit.transaction
     if transaction is None:
         return jsonify({"message": f"Respective transaction with {purchased_credit.credit_id} not found"}), 404
     
-    certificate_data = generate_certificate_data(purchased_credit.id, user, purchased_credit, credit, transaction) if credit.is_expired else None
+    # ?fields=certificate_id,buyer_name,... returns only those keys; leaving
+    # out certificate_html skips rendering it
+    fields = request.args.get('fields')
+    if fields is not None:
+        fields = [field.strip() for field in fields.split(',') if field.strip()]
+        unknown = set(fields) - set(CERTIFICATE_FIELDS)
+        if unknown:
+            return jsonify({"message": f"Unknown fields: {', '.join(sorted(unknown))}"}), 400
+
+    certificate_data = generate_certificate_data(purchased_credit.id, user, purchased_credit, credit, transaction, fields) if credit.is_expired else None
     if certificate_data is None:
         return jsonify({"message":f"No credit with {credit.id} has expired"}), 404
     
     return jsonify(certificate_data), 200
 @buyer_bp.route('/api/buyer/download-certificate/<int:creditId>',methods=['GET'])
-@jwt_required()
+@role_required()
 def download_certificate(creditId):
-    current_user = get_current_user()
-    if not current_user:
-        return jsonify({"message": "Invalid token"}), 401
-    
-    user = User.query.filter_by(username=current_user['username']).first()
-    purchased_credit = PurchasedCredit.query.filter_by(credit_id=creditId, user_id=user.id).first()
+    user = current_identity()
+    purchased_credit = _current_holding(creditId, user.id)
     if not purchased_credit:
         return jsonify({"message": f"Credit with {creditId} was never purchased"}), 404
 
-    credit = Credit.query.get(purchased_credit.credit_id)
+    credit = purchased_credit.credit
     if credit is None:
         return jsonify({"message":"No such credit found"}),404
-    transaction = Transactions.query.filter_by(credit_id=purchased_credit.credit_id).order_by(Transactions.timestamp.desc()).first()
+    transaction = purchased_credit.transaction
     if transaction is None:
         return jsonify({"message": "Respective transaction not found"}), 404
     # creator = User.query.get(purchased_credit.creator_id) if purchased_credit.creator_id else None
     
-    certificate_data = generate_certificate_data(purchased_credit.id, user, purchased_credit, credit, transaction) if credit.is_expired else None
-    if certificate_data is None:
+    if not credit.is_expired:
         return jsonify({"message":f"No credit with {credit.id} has expired"}), 404
     
-    output_buffer = io.BytesIO()
-    html_content = certificate_data['certificate_html']
-    HTML(string=html_content).write_pdf(output_buffer)
-    output_buffer.seek(0)
-    return jsonify({
-        "filename":f"Carbon_Credit_Certificate_{purchased_credit.id}.pdf",
-        "pdf_base64":base64.b64encode(output_buffer.getvalue()).decode('utf-8')
-    })
+    # Rendering happens in a process pool; until the PDF is in the cache the
+    # client is told to come back instead of holding this worker.
+    pdf_path = certificate_renderer.lookup_or_render(
+        certificate_context(purchased_credit.id, user, purchased_credit, credit, transaction))
+    if pdf_path is None:
+        response = jsonify({"message": "Certificate is being generated, retry shortly"})
+        response.headers['Retry-After'] = '1'
+        return response, 202
+    return send_file(
+        pdf_path,
+        mimetype='application/pdf',
+        as_attachment=True,
+        download_name=f"Carbon_Credit_Certificate_{purchased_credit.id}.pdf",
+    )
+
+@buyer_bp.route('/api/buyer/certificates/export', methods=['POST'])
+@role_required()
+def export_certificates():
+    """Stream a ZIP with the certificates of several expired holdings.
+
+    Body: {"credit_ids": [...]} for specific credits, or {} for every
+    expired credit the caller holds.
+    """
+    data = request.get_json(silent=True) or {}
+    credit_ids = data.get('credit_ids')
+    if credit_ids is not None and (not isinstance(credit_ids, list)
+                                   or not all(isinstance(i, int) for i in credit_ids)):
+        return jsonify({"message": "'credit_ids' must be a list of integers"}), 400
+
+    user = current_identity()
+
+    # Holdings, credits and the purchase behind each holding in one query
+    query = (db.session.query(PurchasedCredit, Credit, Transactions)
+             .join(Credit, Credit.id == PurchasedCredit.credit_id)
+             .join(Transactions, Transactions.id == PurchasedCredit.transaction_id)
+             .filter(PurchasedCredit.user_id == user.id, PurchasedCredit.is_current == True,
+                     Credit.is_expired == True))
+    if credit_ids is not None:
+        query = query.filter(PurchasedCredit.credit_id.in_(credit_ids))
+    rows = query.order_by(PurchasedCredit.credit_id).limit(Config.CERTIFICATE_EXPORT_MAX + 1).all()
+
+    if not rows:
+        return jsonify({"message": "No expired credits to export"}), 404
+    if len(rows) > Config.CERTIFICATE_EXPORT_MAX:
+        return jsonify({"message": f"At most {Config.CERTIFICATE_EXPORT_MAX} certificates per export"}), 400
+
+    certificates = [
+        (f"Carbon_Credit_Certificate_{pc.id}.pdf", certificate_context(pc.id, user, pc, credit, transaction))
+        for pc, credit, transaction in rows
+    ]
+    return Response(
+        certificate_renderer.stream_zip(certificates),
+        mimetype='application/zip',
+        headers={"Content-Disposition": "attachment; filename=Carbon_Credit_Certificates.zip"},
+    )
 
 @buyer_bp.route('/api/buyer/credits/<int:credit_id>', methods=['GET'])
-@jwt_required()
+@role_required()
 def get_credit_details(credit_id):
     try:
         credit = Credit.query.get_or_404(credit_id)
         user = User.query.get_or_404(credit.creator_id)
-        # Fetch usernames for auditors
-        auditors = credit.auditors or []
-        auditor_users = User.query.filter(User.id.in_(auditors)).all()
-        auditor_usernames = {user.id: user.username for user in auditor_users}
-        # Map auditor IDs to usernames, preserving order
-        auditor_list = [
-            {"id": auditor_id, "username": auditor_usernames.get(auditor_id, "Unknown")}
-            for auditor_id in auditors
-        ]
+        # Fetch usernames for auditors, in assignment order
+        auditor_users = (db.session.query(User.id, User.username)
+                         .join(AuditorAssociation, AuditorAssociation.auditor_id == User.id)
+                         .filter(AuditorAssociation.credit_id == credit.id)
+                         .order_by(AuditorAssociation.assigned_at, User.id)
+                         .all())
+        auditor_list = [{"id": auditor_id, "username": username} for auditor_id, username in auditor_users]
+        # Contract state as last seen by the chain indexer, if it has seen this credit
+        chain_credit = db.session.get(ChainCredit, credit.id)
 
         return jsonify({
             "id": credit.id,
@@ -282,7 +470,31 @@ def get_credit_details(credit_id):
             "creator_name": user.username,
             "docu_url": credit.docu_url,
             "auditors": auditor_list,  # Return list of {id, username}
-            "req_status": credit.req_status
+            "req_status": credit.req_status,
+            "onchain": chain_credit_payload(chain_credit) if chain_credit else None
         })
     except Exception as e:
         return jsonify({"error": "Credit not found"}), 404
+
+@buyer_bp.route('/api/buyer/credits/<int:credit_id>/history', methods=['GET'])
+@role_required()
+def get_credit_history(credit_id):
+    """Every owner of a credit, oldest first, from the ownership ledger."""
+    def load_history():
+        rows = (db.session.query(PurchasedCredit, User.username, Transactions.txn_hash)
+                .join(User, User.id == PurchasedCredit.user_id)
+                .outerjoin(Transactions, Transactions.id == PurchasedCredit.transaction_id)
+                .filter(PurchasedCredit.credit_id == credit_id)
+                .order_by(PurchasedCredit.purchase_date, PurchasedCredit.id)
+                .all())
+        return [{
+            "owner_id": pc.user_id,
+            "owner": username,
+            "amount": pc.amount,
+            "acquired_at": pc.purchase_date.isoformat(),
+            "released_at": pc.released_at.isoformat() if pc.released_at else None,
+            "is_current": pc.is_current,
+            "is_expired": bool(pc.is_expired),
+            "txn_hash": txn_hash,
+        } for pc, username, txn_hash in rows]
+    return jsonify(get_or_set(f"credit_history:{credit_id}", ('purchase', 'user'), load_history)), 200
@@ -0,0 +1,27 @@
+from flask import Blueprint, jsonify
+from app import db
+from app.models.chain import ChainCheckpoint, ChainCredit
+from app.utilis.auth import role_required
+from app.utilis.chain import chain_credit_payload
+from app.utilis.indexer import CHECKPOINT
+
+chain_bp = Blueprint('chain', __name__)
+
+@chain_bp.route('/api/chain/status', methods=['GET'])
+def chain_status():
+    checkpoint = db.session.get(ChainCheckpoint, CHECKPOINT)
+    if checkpoint is None:
+        return jsonify({"message": "Chain indexer has not run yet"}), 404
+    return jsonify({
+        "block_number": checkpoint.block_number,
+        "next_credit_id": checkpoint.next_credit_id,
+        "updated_at": checkpoint.updated_at.isoformat(),
+    }), 200
+
+@chain_bp.route('/api/chain/credits/<int:credit_id>', methods=['GET'])
+@role_required()
+def chain_credit(credit_id):
+    credit = db.session.get(ChainCredit, credit_id)
+    if credit is None:
+        return jsonify({"message": f"Credit {credit_id} not indexed"}), 404
+    return jsonify(chain_credit_payload(credit)), 200
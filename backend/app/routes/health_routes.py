@@ -1,4 +1,6 @@
 from flask import Blueprint, request, jsonify
+from app.utilis.metrics import metrics_response
+from app.utilis.readiness import cached_probe
 
 health_bp = Blueprint('health', __name__)
 
@@ -9,3 +11,14 @@ def heath_check():
 @health_bp.route('/api/healthz', methods = ["GET"])
 def send_healthz():
     return jsonify({'status':'Up'}), 200
+
+@health_bp.route('/api/readyz', methods=["GET"])
+def send_readyz():
+    report, ready, age = cached_probe()
+    response = jsonify({**report, 'age': age})
+    response.headers['Cache-Control'] = 'no-store'
+    return response, 200 if ready else 503
+
+@health_bp.route('/api/metrics', methods=["GET"])
+def metrics():
+    return metrics_response()
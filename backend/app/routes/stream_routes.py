@@ -0,0 +1,68 @@
+import json
+import random
+import time
+from threading import BoundedSemaphore
+from flask import Blueprint, Response, jsonify, request
+from app.utilis import events
+from app.utilis.auth import role_required
+from config import Config
+
+stream_bp = Blueprint('stream', __name__)
+
+# Open streams in this worker; None when uncapped
+_stream_slots = BoundedSemaphore(Config.EVENT_STREAM_MAX_PER_WORKER) if Config.EVENT_STREAM_MAX_PER_WORKER > 0 else None
+
+
+def _format(message):
+    return f"event: {message['event']}\ndata: {json.dumps(message['data'])}\n\n"
+
+
+@stream_bp.route('/api/stream/marketplace', methods=['GET'])
+@role_required(locations=['headers', 'query_string'])
+def marketplace_stream():
+    """Server-Sent Events feed of marketplace changes.
+
+    Events: credit.listed, credit.delisted, credit.purchased, credit.audited,
+    credit.expired, and resync when the client should refetch everything.
+    EventSource cannot send headers, so the token may be passed as ?jwt=.
+    The stream ends after about EVENT_STREAM_MAX_AGE seconds; the browser
+    reconnects and, since events may have been missed meanwhile, is sent a
+    resync first.
+    """
+    if _stream_slots is not None and not _stream_slots.acquire(blocking=False):
+        response = jsonify({"message": "Too many open streams, try again later"})
+        response.headers['Retry-After'] = '10'
+        return response, 503
+
+    # Set by the browser only when it reconnects to a stream we gave an id
+    reconnected = request.headers.get('Last-Event-ID') is not None
+    # Jittered so clients that connected together do not reconnect together
+    deadline = time.monotonic() + Config.EVENT_STREAM_MAX_AGE * random.uniform(0.9, 1.0)
+
+    def generate():
+        # Runs after the request context is gone; it touches no database
+        # connection, only this worker's event queue
+        with events.subscribe() as subscription:
+            yield "id: 0\nretry: 5000\n\n"
+            if reconnected:
+                yield _format(events.RESYNC)
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                message = subscription.get(timeout=min(Config.EVENT_STREAM_HEARTBEAT, remaining))
+                if message is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield _format(message)
+
+    response = Response(generate(), mimetype='text/event-stream', headers={
+        "Cache-Control": "no-cache",
+        # Stop nginx from buffering the stream
+        "X-Accel-Buffering": "no",
+    })
+    if _stream_slots is not None:
+        # close() is called even when the generator never started, unlike a
+        # finally block inside it
+        response.call_on_close(_stream_slots.release)
+    return response
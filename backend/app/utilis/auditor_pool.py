@@ -0,0 +1,107 @@
+import random
+import time
+from threading import Lock
+from sqlalchemy import func
+from config import Config
+from app import db
+from app.models.association import AuditorAssociation
+from app.models.user import User
+
+
+class NotEnoughAuditors(Exception):
+    pass
+
+
+class AuditorPool:
+    """In-process index of auditors bucketed by their open assignment count.
+
+    Assignments and votes made by this process update it incrementally;
+    every `ttl` seconds it is reloaded from the database, which also picks up
+    new auditors and work assigned by other workers.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._lock = Lock()
+        self._loaded_at = None
+        # auditor id -> open assignments, and open assignments -> auditor ids
+        self._load = {}
+        self._buckets = {}
+
+    def load(self, counts):
+        """Replace the index with {auditor_id: open assignments}."""
+        with self._lock:
+            self._load = dict(counts)
+            self._buckets = {}
+            for auditor_id, count in self._load.items():
+                self._buckets.setdefault(count, set()).add(auditor_id)
+            self._loaded_at = time.monotonic()
+
+    def refresh(self):
+        rows = (db.session.query(User.id, func.count(AuditorAssociation.auditor_id))
+                .outerjoin(AuditorAssociation, (AuditorAssociation.auditor_id == User.id)
+                           & AuditorAssociation.voted_at.is_(None))
+                .filter(User.role == 'auditor')
+                .group_by(User.id)
+                .all())
+        self.load(dict(rows))
+
+    def _ensure_fresh(self):
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl:
+            self.refresh()
+
+    def _move(self, auditor_id, delta):
+        # Caller holds the lock
+        count = self._load[auditor_id]
+        bucket = self._buckets[count]
+        bucket.discard(auditor_id)
+        if not bucket:
+            del self._buckets[count]
+        count = max(count + delta, 0)
+        self._load[auditor_id] = count
+        self._buckets.setdefault(count, set()).add(auditor_id)
+
+    def assign(self, k, exclude=()):
+        """Pick the `k` least-loaded auditors not in `exclude` and count the new work.
+
+        Ties are broken at random so equally loaded auditors share new credits.
+        """
+        self._ensure_fresh()
+        exclude = set(exclude)
+        with self._lock:
+            chosen = []
+            for count in sorted(self._buckets):
+                candidates = [a for a in self._buckets[count] if a not in exclude]
+                needed = k - len(chosen)
+                chosen.extend(random.sample(candidates, min(needed, len(candidates))))
+                if len(chosen) == k:
+                    break
+            if len(chosen) < k:
+                raise NotEnoughAuditors(f"{k} auditors needed, {len(chosen)} eligible")
+            for auditor_id in chosen:
+                self._move(auditor_id, 1)
+            return chosen
+
+    def release(self, *auditor_ids):
+        """An assignment was completed (or never committed)."""
+        with self._lock:
+            for auditor_id in auditor_ids:
+                if auditor_id in self._load:
+                    self._move(auditor_id, -1)
+
+    def add(self, auditor_id):
+        with self._lock:
+            if auditor_id not in self._load:
+                self._load[auditor_id] = 0
+                self._buckets.setdefault(0, set()).add(auditor_id)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._load)
+
+
+auditor_pool = AuditorPool(Config.AUDITOR_POOL_TTL)
+
+
+def auditor_count():
+    return db.session.query(func.count(User.id)).filter(User.role == 'auditor').scalar()
@@ -0,0 +1,109 @@
+import json
+import time
+from collections import OrderedDict, namedtuple
+from functools import wraps
+from threading import Lock
+from flask import g, jsonify
+from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
+from config import Config
+from app import db
+from app.models.user import User
+
+# What handlers need to know about the caller, straight from the JWT
+CurrentUser = namedtuple('CurrentUser', ['id', 'username', 'role'])
+
+
+class TTLCache:
+    """Small thread-safe LRU whose entries also expire after `ttl` seconds."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+# username -> user id, for tokens issued before ids were put in the claims
+_user_ids = TTLCache(Config.IDENTITY_CACHE_SIZE, Config.IDENTITY_CACHE_TTL)
+
+
+def identity_claims(user):
+    """Extra JWT claims, so authenticated calls need no User lookup."""
+    return {"user_id": user.id, "role": user.role}
+
+
+def _resolve_identity():
+    try:
+        identity = json.loads(get_jwt_identity())
+    except (TypeError, json.JSONDecodeError):
+        return None
+    claims = get_jwt()
+    username = identity.get('username')
+    role = claims.get('role', identity.get('role'))
+    user_id = claims.get('user_id')
+    if user_id is None:
+        user_id = _user_ids.get(username)
+        if user_id is None:
+            user = User.query.filter_by(username=username).first()
+            if user is None:
+                return None
+            user_id = user.id
+            _user_ids.set(username, user_id)
+    return CurrentUser(user_id, username, role)
+
+
+def current_identity():
+    """The caller's CurrentUser, resolved once per request."""
+    if 'current_identity' not in g:
+        g.current_identity = _resolve_identity()
+    return g.current_identity
+
+
+def current_user():
+    """The caller's full User row, loaded at most once per request."""
+    if 'current_user' not in g:
+        g.current_user = db.session.get(User, current_identity().id)
+    return g.current_user
+
+
+def role_required(*roles, locations=None):
+    """jwt_required() plus the role check; with no roles any signed-in user passes.
+
+    `locations` overrides where the token is read from, e.g. the query string
+    for EventSource clients that cannot set headers.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        @jwt_required(locations=locations)
+        def wrapper(*args, **kwargs):
+            identity = current_identity()
+            if identity is None:
+                return jsonify({"message": "Invalid token"}), 401
+            if roles and identity.role not in roles:
+                return jsonify({"message": "Unauthorized"}), 403
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,108 @@
+import itertools
+import json
+from sqlalchemy import event
+from config import Config
+from app.utilis.metrics import record_cache
+from app.utilis.redis import get_redis
+
+# Entity tags a cached payload can depend on
+ENTITIES = ('credit', 'request', 'purchase', 'transaction', 'user')
+
+# Maps each table to the entity tag its writes invalidate
+TABLE_ENTITIES = {
+    'credits': 'credit',
+    'requests': 'request',
+    'auditor_association': 'request',
+    'purchased_credits': 'purchase',
+    'transactions': 'transaction',
+    'users': 'user',
+}
+
+_PENDING = 'cache_dirty_entities'
+
+
+def _version_key(entity):
+    return f"cache:version:{entity}"
+
+
+def _cache_key(client, key, depends_on):
+    # Every entity carries a version counter; bumping it makes all keys built
+    # on the old version unreachable, so a reader that raced a writer can
+    # never publish a stale payload under the new version.
+    versions = client.mget([_version_key(entity) for entity in depends_on])
+    return f"cache:{key}:" + ".".join(v or "0" for v in versions)
+
+
+def get_or_set(key, depends_on, loader, ttl=None):
+    """Return the cached payload for `key`, calling `loader` on a miss.
+
+    `depends_on` lists the entity tags the payload is built from; a committed
+    write to any of them invalidates the entry.
+    """
+    client = get_redis()
+    if client is None:
+        record_cache(key, 'bypass')
+        return loader()
+    try:
+        cache_key = _cache_key(client, key, depends_on)
+        cached = client.get(cache_key)
+        if cached is not None:
+            record_cache(key, 'hit')
+            return json.loads(cached)
+    except Exception as e:
+        print(f"redis get client error: {e}")
+        record_cache(key, 'error')
+        return loader()
+
+    record_cache(key, 'miss')
+    data = loader()
+    try:
+        client.set(cache_key, json.dumps(data), ex=ttl or Config.CACHE_DEFAULT_TTL)
+    except Exception as e:
+        print(f"Redis error: {e}")
+    return data
+
+
+def invalidate(*entities):
+    client = get_redis()
+    if client is None or not entities:
+        return
+    try:
+        pipe = client.pipeline()
+        for entity in sorted(set(entities)):
+            pipe.incr(_version_key(entity))
+        pipe.execute()
+    except Exception as e:
+        print(f"redis invalidate error: {e}")
+
+
+def touch(session, *entities):
+    """Mark entities as written by statements that bypass the unit of work
+    (bulk inserts, core UPDATEs); they are invalidated on commit."""
+    session.info.setdefault(_PENDING, set()).update(entities)
+
+
+def _collect_entities(session, flush_context):
+    pending = session.info.setdefault(_PENDING, set())
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        entity = TABLE_ENTITIES.get(getattr(obj, '__tablename__', None))
+        if entity:
+            pending.add(entity)
+
+
+def _invalidate_committed(session):
+    pending = session.info.pop(_PENDING, None)
+    if pending:
+        invalidate(*pending)
+
+
+def _discard_pending(session):
+    session.info.pop(_PENDING, None)
+
+
+def init_cache(session):
+    if event.contains(session, 'after_flush', _collect_entities):
+        return
+    event.listen(session, 'after_flush', _collect_entities)
+    event.listen(session, 'after_commit', _invalidate_committed)
+    event.listen(session, 'after_rollback', _discard_pending)
@@ -0,0 +1,36 @@
+import requests
+from requests.adapters import HTTPAdapter
+from threading import Lock
+from config import Config
+
+_session = None
+_lock = Lock()
+
+
+def _get_session():
+    # One keep-alive connection pool per process instead of a new TLS
+    # handshake for every signup
+    global _session
+    with _lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=Config.CAPTCHA_POOL_SIZE)
+            _session.mount('https://', adapter)
+            _session.mount('http://', adapter)
+        return _session
+
+
+def verify_captcha(token, remote_ip=None):
+    """Check a Turnstile token. Network errors and timeouts count as failures.
+
+    TURNSTILE_VERIFY_URL can point at a local stub for development and load tests.
+    """
+    data = {'secret': Config.TURNSTILE_SECRET_KEY, 'response': token}
+    if remote_ip:
+        data['remoteip'] = remote_ip
+    try:
+        response = _get_session().post(Config.TURNSTILE_VERIFY_URL, data=data, timeout=Config.CAPTCHA_TIMEOUT)
+        return bool(response.json().get('success'))
+    except (requests.RequestException, ValueError) as e:
+        print(f"captcha verification error: {e}")
+        return False
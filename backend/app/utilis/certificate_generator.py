@@ -1,112 +1,77 @@
-def generate_certificate_data(purchase_id, user, purchased_credit, credit, transaction):
+import hashlib
+import os
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from app.utilis.metrics import timed_render
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Compiled once per process and reused for every certificate
+_env = Environment(
+    loader=FileSystemLoader(os.path.join(_APP_DIR, 'templates')),
+    autoescape=select_autoescape(['html']),
+)
+_template = _env.get_template('certificate.html')
+
+STYLESHEET_PATH = os.path.join(_APP_DIR, 'static', 'certificate.css')
+with open(STYLESHEET_PATH, encoding='utf-8') as f:
+    STYLESHEET = f.read()
+
+# Changes whenever the template or stylesheet does, so cached PDFs rendered
+# from an older layout are never served
+with open(_template.filename, encoding='utf-8') as f:
+    LAYOUT_VERSION = hashlib.sha256((f.read() + STYLESHEET).encode('utf-8')).hexdigest()[:16]
+
+CERTIFICATE_FIELDS = (
+    "certificate_id",
+    "buyer_name",
+    "credit_name",
+    "amount",
+    "purchase_date",
+    "transaction_hash",
+    "certificate_html",
+)
+
+
+def certificate_context(purchase_id, user, purchased_credit, credit, transaction):
+    """Everything the certificate template needs, as plain JSON-able values."""
     return {
-        "certificate_id": f"CC-{purchase_id}-{user.id}-{credit.id-1}",
+        "purchase_id": purchase_id,
+        "user_id": user.id,
         "buyer_name": user.username,
+        "credit_id": credit.id,
         "credit_name": credit.name,
+        "credit_amount": credit.amount,
+        "credit_price": credit.price,
         "amount": purchased_credit.amount,
         "purchase_date": purchased_credit.purchase_date.strftime("%Y-%m-%d"),
+        "purchase_date_long": purchased_credit.purchase_date.strftime("%B %d, %Y"),
         "transaction_hash": transaction.txn_hash,
-        "certificate_html": f"""
-            <div style="
-                border: 4px double #2c3e50; 
-                border-radius: 15px; 
-                padding: 30px; 
-                max-width: 700px; 
-                margin: 0 auto; 
-                font-family: 'Arial', sans-serif; 
-                background: linear-gradient(to bottom right, #f0f0f0, #ffffff);
-                box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-                position: relative;
-                overflow: hidden;
-            ">
-                <!-- Decorative Elements -->
-                <div style="
-                    position: absolute; 
-                    top: 0; 
-                    left: 0; 
-                    right: 0; 
-                    height: 15px; 
-                    background: linear-gradient(to right, #2ecc71, #3498db);
-                "></div>
-                <div style="
-                    position: absolute; 
-                    bottom: 0; 
-                    left: 0; 
-                    right: 0; 
-                    height: 15px; 
-                    background: linear-gradient(to right, #3498db, #2ecc71);
-                "></div>
-                
-                <!-- Logo -->
-                <div style="text-align: center; margin-bottom: 20px;">
-                    <img src="https://i.ibb.co/TDn711NW/leaf-8993153.png" alt="Website Logo" style="max-width: 50px; height: auto;">
-                </div>
+    }
 
-                <!-- Certificate Content -->
-                <h1 style="
-                    font-family: 'Georgia', serif; 
-                    text-align: center; 
-                    color: #2c3e50; 
-                    margin-bottom: 20px; 
-                    font-size: 2.5em; 
-                    text-shadow: 2px 2px 4px rgba(0,0,0,0.1);
-                ">Carbon Credit Certificate</h1>
 
-                <div style="text-align: center; margin-bottom: 20px; color: #34495e;">
-                    <p style="font-size: 1em; margin-bottom: 10px;">This certifies that</p>
-                    <h2 style="
-                        font-family: 'Palatino Linotype', serif; 
-                        color: #2c3e50; 
-                        font-size: 2em; 
-                        margin-bottom: 15px;
-                    ">{user.username}</h2>
-                    <p style="font-size: 1em; margin-bottom: 10px;">has purchased</p>
-                    <h3 style="
-                        font-family: 'Palatino Linotype', serif; 
-                        color: #16a085; 
-                        font-size: 1.5em; 
-                        margin-bottom: 15px;
-                    ">{credit.name}</h3>
-                    <p style="font-size: 1em; margin-bottom: 10px;">
-                        on {purchased_credit.purchase_date.strftime("%B %d, %Y")}
-                    </p>
-                    <p style="font-size: 1em; margin-bottom: 20px;">
-                        and has helped offset <strong>{credit.amount} tons</strong> of carbon with <strong>ETH {credit.price}</strong>
-                    </p>
-                </div>
+def render_certificate_html(context, inline_styles=True):
+    """Render the certificate markup.
 
-                <div style="
-                    margin-top: 40px; 
-                    text-align: center; 
-                    font-family: 'Courier New', monospace;
-                    color: #7f8c8d;
-                ">
-                    <p style="
-                        border-top: 1px solid #bdc3c7; 
-                        padding-top: 15px; 
-                        margin-bottom: 15px;
-                        display: inline-block;
-                        word-break: break-all;
-                        max-width: 90%;
-                    ">
-                        Transaction Hash: {transaction.txn_hash}
-                    </p>
-                    <p style="
-                        padding-bottom: 15px;
-                        display: inline-block;
-                        width: 90%
-                    ">
-                        Certificate ID: CC-{purchase_id}-{user.id}-{credit.id}
-                    </p>
-                    <p style="
-                        padding-bottom: 15px;
-                        border-bottom: 1px solid #bdc3c7;
-                        display: inline-block;
-                        width: 90%
-                    ">
-                        Credit ID: CC-{credit.id}
-                    </p>
-                </div>
-            </div>
-        """
+    With inline_styles=False the stylesheet is left out so the PDF renderer
+    can apply its pre-parsed copy instead of parsing it for every document.
+    """
+    return _template.render(inline_styles=inline_styles, stylesheet=STYLESHEET, **context)
+
+
+def generate_certificate_data(purchase_id, user, purchased_credit, credit, transaction, fields=None):
+    """Certificate metadata plus its HTML; `fields` limits the keys returned
+    (the HTML is only rendered when it is asked for)."""
+    context = certificate_context(purchase_id, user, purchased_credit, credit, transaction)
+    fields = CERTIFICATE_FIELDS if fields is None else fields
+    data = {
+        "certificate_id": f"CC-{purchase_id}-{user.id}-{credit.id-1}",
+        "buyer_name": context["buyer_name"],
+        "credit_name": context["credit_name"],
+        "amount": context["amount"],
+        "purchase_date": context["purchase_date"],
+        "transaction_hash": context["transaction_hash"],
     }
+    if "certificate_html" in fields:
+        with timed_render('html'):
+            data["certificate_html"] = render_certificate_html(context)
+    return {key: value for key, value in data.items() if key in fields}
@@ -0,0 +1,231 @@
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from threading import Lock
+from config import Config
+from app.utilis.certificate_generator import LAYOUT_VERSION, STYLESHEET, render_certificate_html
+from app.utilis.metrics import observe_render
+
+_executor = None
+_executor_lock = Lock()
+# digest -> Future of a render that is queued or running
+_in_flight = {}
+_in_flight_lock = Lock()
+# WeasyPrint stylesheet, parsed once per pool process
+_stylesheet = None
+_last_sweep = 0.0
+_sweep_lock = Lock()
+# Seconds a PDF is safe from eviction after it was last served, so a path
+# just handed to send_file or a ZIP export is still there when it is read
+_EVICTION_GRACE = 300
+
+
+def certificate_digest(context):
+    """Content address of a certificate: the same inputs always render the same PDF."""
+    payload = json.dumps([LAYOUT_VERSION, context], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def cached_path(digest):
+    return os.path.join(Config.CERTIFICATE_CACHE_DIR, f"{digest}.pdf")
+
+
+def _touch(path):
+    # mtime is the LRU clock: a hit marks the PDF as recently served
+    try:
+        os.utime(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def sweep_cache(max_bytes=None):
+    """Delete the least recently served PDFs until the cache fits CERTIFICATE_CACHE_MAX_MB.
+
+    Returns the number of files removed.
+    """
+    if max_bytes is None:
+        max_bytes = Config.CERTIFICATE_CACHE_MAX_MB * 1024 * 1024
+    now = time.time()
+    entries = []
+    with os.scandir(Config.CERTIFICATE_CACHE_DIR) as scan:
+        for entry in scan:
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            if entry.name.endswith('.part'):
+                # Left behind by a pool process that died mid-render
+                if now - stat.st_mtime > _EVICTION_GRACE:
+                    _unlink(entry.path)
+            elif entry.name.endswith('.pdf'):
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for mtime, size, path in sorted(entries):
+        if total <= max_bytes or now - mtime < _EVICTION_GRACE:
+            break
+        _unlink(path)
+        total -= size
+        removed += 1
+    return removed
+
+
+def _unlink(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _maybe_sweep():
+    global _last_sweep
+    if Config.CERTIFICATE_CACHE_MAX_MB <= 0:
+        return
+    now = time.monotonic()
+    if now - _last_sweep < Config.CERTIFICATE_CACHE_SWEEP_INTERVAL or not _sweep_lock.acquire(blocking=False):
+        return
+    try:
+        _last_sweep = now
+        sweep_cache()
+    except OSError as e:
+        print(f"certificate cache sweep error: {e}")
+    finally:
+        _sweep_lock.release()
+
+
+def _init_worker():
+    global _stylesheet
+    from weasyprint import CSS
+
+    _stylesheet = CSS(string=STYLESHEET)
+
+
+def _render(context, path):
+    # Runs in a pool process; write to a temp file first so readers never
+    # see a half-written PDF under the final name.
+    from weasyprint import HTML
+
+    html = render_certificate_html(context, inline_styles=False)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            HTML(string=html).write_pdf(out, stylesheets=[_stylesheet])
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return path
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            os.makedirs(Config.CERTIFICATE_CACHE_DIR, exist_ok=True)
+            # spawn: forking a threaded web worker is not safe
+            _executor = ProcessPoolExecutor(
+                max_workers=Config.CERTIFICATE_RENDER_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+            )
+        return _executor
+
+
+def schedule(context):
+    """Return the future rendering the certificate for `context`, starting one if needed.
+
+    Concurrent requests for the same certificate share a single render.
+    """
+    digest = certificate_digest(context)
+    path = cached_path(digest)
+    executor = _get_executor()
+    with _in_flight_lock:
+        future = _in_flight.get(digest)
+        if future is None:
+            submitted = time.perf_counter()
+            future = executor.submit(_render, context, path)
+            _in_flight[digest] = future
+            future.add_done_callback(lambda _: _in_flight.pop(digest, None))
+            # Includes time queued behind other renders, which is what callers wait for
+            future.add_done_callback(lambda _: observe_render('pdf', time.perf_counter() - submitted))
+            # Every render adds a file, so that is when the cache can outgrow its cap
+            future.add_done_callback(lambda _: _maybe_sweep())
+    return future
+
+
+def lookup_or_render(context, wait=None):
+    """Return the path of the cached PDF, or None while it is still rendering.
+
+    A miss schedules a render in the process pool and waits at most `wait`
+    seconds (CERTIFICATE_RENDER_WAIT by default) so the web worker is never
+    tied up for a full render.
+    """
+    path = cached_path(certificate_digest(context))
+    if _touch(path):
+        return path
+    future = schedule(context)
+    wait = Config.CERTIFICATE_RENDER_WAIT if wait is None else wait
+    if wait <= 0 and not future.done():
+        return None
+    try:
+        return future.result(timeout=wait)
+    except TimeoutError:
+        return None
+
+
+class _ZipStream(io.RawIOBase):
+    """Write-only sink that hands out what zipfile wrote since the last drain."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_zip(certificates):
+    """Yield a ZIP archive of (filename, context) pairs chunk by chunk.
+
+    All missing PDFs are scheduled up front so the pool renders them in
+    parallel; each one is added as soon as it is ready, so at most one
+    PDF's worth of output is buffered at a time. The response has started
+    by then, so a certificate that fails to render is replaced by a
+    "<filename>.error.txt" entry instead of cutting the archive short.
+    """
+    pending = []
+    for filename, context in certificates:
+        path = cached_path(certificate_digest(context))
+        pending.append((filename, path if _touch(path) else schedule(context)))
+
+    sink = _ZipStream()
+    # The sink cannot seek, so zipfile writes sizes in data descriptors
+    with zipfile.ZipFile(sink, mode='w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for filename, path_or_future in pending:
+            try:
+                path = path_or_future if isinstance(path_or_future, str) else path_or_future.result()
+                # Opens the PDF before writing the entry header, so a failure
+                # here leaves nothing half-written in the archive
+                archive.write(path, arcname=filename)
+            except Exception as e:
+                print(f"certificate export error for {filename}: {e}")
+                archive.writestr(f"{filename}.error.txt",
+                                 "This certificate could not be generated. Download it again later.\n")
+            yield sink.drain()
+    yield sink.drain()
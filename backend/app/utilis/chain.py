@@ -0,0 +1,161 @@
+import itertools
+import requests
+from requests.adapters import HTTPAdapter
+
+WEI_PER_ETH = 10 ** 18
+
+# Four-byte selectors (first bytes of keccak256 of the signature) of the
+# CarbonCredit.sol functions that change state, with their argument types
+METHODS = {
+    '3047456f': ('generateCredit', ('uint256', 'uint256')),   # generateCredit(uint256,uint256)
+    '7211dde4': ('buyCredit', ('uint256',)),                   # buyCredit(uint256)
+    'ca850692': ('sellCredit', ('uint256', 'uint256')),       # sellCredit(uint256,uint256)
+    '1361a3b6': ('removeFromSale', ('uint256',)),              # removeFromSale(uint256)
+    'a33fd53b': ('Expire', ('uint256',)),                      # Expire(uint256)
+    '4b6dd590': ('requestAudit', ('uint256',)),                # requestAudit(uint256)
+    'a35bcbef': ('auditCredit', ('uint256', 'bool')),         # auditCredit(uint256,bool)
+    'e060a45b': ('generateCredits', ('uint256[]', 'uint256[]')),  # generateCredits(uint256[],uint256[])
+}
+
+
+class RpcError(Exception):
+    pass
+
+
+class JsonRpcClient:
+    """Minimal Ethereum JSON-RPC client that sends calls in batches."""
+
+    def __init__(self, url, timeout):
+        self.url = url
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self._session = requests.Session()
+        self._session.mount(url, HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
+    def call(self, method, *params):
+        return self.batch([(method, list(params))])[0]
+
+    def batch(self, calls):
+        """Send [(method, params), ...] as one request; results come back in order."""
+        if not calls:
+            return []
+        payload = [{"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}
+                   for method, params in calls]
+        try:
+            response = self._session.post(self.url, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+            replies = {reply["id"]: reply for reply in response.json()}
+        except (requests.RequestException, ValueError, TypeError, KeyError) as e:
+            raise RpcError(f"JSON-RPC request to {self.url} failed: {e}")
+        results = []
+        for request in payload:
+            reply = replies.get(request["id"])
+            if reply is None or "error" in reply:
+                error = reply.get("error") if reply else "no reply"
+                raise RpcError(f"{request['method']} failed: {error}")
+            results.append(reply["result"])
+        return results
+
+
+def decode_call(data):
+    """Decode contract calldata into (method, args), or None if it is not a known call."""
+    data = (data or '').lower()
+    if data.startswith('0x'):
+        data = data[2:]
+    method = METHODS.get(data[:8])
+    if method is None:
+        return None
+    name, types = method
+    words = data[8:]
+
+    def word(index):
+        chunk = words[64 * index:64 * (index + 1)]
+        if len(chunk) != 64:
+            raise ValueError("calldata too short")
+        return int(chunk, 16)
+
+    args = []
+    try:
+        for i, kind in enumerate(types):
+            if kind == 'uint256[]':
+                # Head holds the byte offset of the array: its length, then the items
+                start = word(i) // 32
+                args.append([word(start + 1 + j) for j in range(word(start))])
+            else:
+                args.append(word(i) != 0 if kind == 'bool' else word(i))
+    except ValueError:
+        return None
+    return name, args
+
+
+def new_credit_state(credit_id, creator, amount, price, block_number):
+    return {
+        "credit_id": credit_id,
+        "creator": creator,
+        "owner": creator,
+        "amount": amount,
+        "price": price,
+        "for_sale": False,
+        "expired": False,
+        "request_status": 0,
+        "num_auditors": (amount // 500) * 2 + 3,
+        "audit_fees": 0,
+        "audit_score": 0,
+        "auditors": [],
+        "updated_block": block_number,
+    }
+
+
+def project_credit(calls):
+    """Fold a credit's calls, oldest first, into its contract state.
+
+    Mirrors CarbonCredit.sol. Only successful calls are indexed, so the
+    contract's own checks have already passed. Returns None when the credit
+    was never generated.
+    """
+    state = None
+    for call in calls:
+        args = call.args
+        if call.method == 'generateCredit':
+            state = new_credit_state(call.credit_id, call.sender, args[0], args[1], call.block_number)
+            continue
+        if state is None:
+            continue
+        if call.method == 'buyCredit':
+            state["owner"] = call.sender
+            state["for_sale"] = False
+        elif call.method == 'sellCredit':
+            state["price"] = args[1]
+            state["for_sale"] = True
+        elif call.method == 'removeFromSale':
+            state["for_sale"] = False
+        elif call.method == 'Expire':
+            state["expired"] = True
+        elif call.method == 'requestAudit':
+            state["request_status"] = 1
+            state["audit_fees"] = int(call.value)
+        elif call.method == 'auditCredit':
+            state["auditors"] = state["auditors"] + [[call.sender, args[1]]]
+            state["audit_score"] += 1 if args[1] else -1
+            if len(state["auditors"]) == state["num_auditors"]:
+                state["request_status"] = 2
+        state["updated_block"] = call.block_number
+    return state
+
+
+def chain_credit_payload(chain_credit):
+    """Indexed contract state in the shape the client reads from the contract."""
+    return {
+        "amount": str(chain_credit.amount),
+        "owner": chain_credit.owner,
+        "creator": chain_credit.creator,
+        "expired": chain_credit.expired,
+        "price": str(chain_credit.price),
+        "forSale": chain_credit.for_sale,
+        "requestStatus": chain_credit.request_status,
+        "numOfAuditors": chain_credit.num_auditors,
+        "auditFees": str(chain_credit.audit_fees),
+        "auditScore": chain_credit.audit_score,
+        "auditorsList": [auditor for auditor, _ in chain_credit.auditors],
+        "blockNumber": chain_credit.updated_block,
+    }
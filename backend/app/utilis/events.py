@@ -0,0 +1,132 @@
+import json
+import queue
+import time
+from threading import Lock, Thread
+from sqlalchemy import event
+from config import Config
+from app.utilis.redis import get_redis
+
+# Redis channel every worker publishes to and listens on
+CHANNEL = 'marketplace:events'
+
+# Delivered to a subscriber that fell behind or missed events; the client
+# should refetch its snapshot
+RESYNC = {"event": "resync", "data": {}}
+
+_PENDING = 'pending_events'
+
+_subscribers = set()
+_subscribers_lock = Lock()
+_listener = None
+_listener_lock = Lock()
+
+
+class Subscription:
+    """A bounded queue of events for one stream client."""
+
+    def __init__(self):
+        self._queue = queue.Queue(maxsize=Config.EVENT_QUEUE_SIZE)
+
+    def put(self, message):
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            # Too slow to keep up: drop the backlog and ask for a refetch
+            # rather than buffering without bound
+            with self._queue.mutex:
+                self._queue.queue.clear()
+            self._queue.put_nowait(RESYNC)
+
+    def get(self, timeout):
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def __enter__(self):
+        _ensure_listener()
+        with _subscribers_lock:
+            _subscribers.add(self)
+        return self
+
+    def __exit__(self, *exc):
+        with _subscribers_lock:
+            _subscribers.discard(self)
+
+
+def subscribe():
+    return Subscription()
+
+
+def _deliver(message):
+    with _subscribers_lock:
+        subscribers = list(_subscribers)
+    for subscription in subscribers:
+        subscription.put(message)
+
+
+def _listen():
+    # One Redis subscription per process, fanned out to local clients, so
+    # the number of open streams never shows up on the Redis side
+    while True:
+        client = get_redis()
+        try:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(CHANNEL)
+            # Anything published while we were disconnected is gone
+            _deliver(RESYNC)
+            while True:
+                message = pubsub.get_message(timeout=1.0)
+                if message is not None:
+                    _deliver(json.loads(message['data']))
+        except Exception as e:
+            print(f"redis event listener error: {e}")
+            time.sleep(1)
+
+
+def _ensure_listener():
+    global _listener
+    if get_redis() is None:
+        return
+    with _listener_lock:
+        if _listener is None:
+            _listener = Thread(target=_listen, name='marketplace-events', daemon=True)
+            _listener.start()
+
+
+def publish(*messages):
+    """Send events to every stream client, in all workers when Redis is up."""
+    client = get_redis()
+    if client is not None:
+        try:
+            pipe = client.pipeline()
+            for message in messages:
+                pipe.publish(CHANNEL, json.dumps(message))
+            pipe.execute()
+            return
+        except Exception as e:
+            print(f"redis publish error: {e}")
+    for message in messages:
+        _deliver(message)
+
+
+def emit(session, name, data):
+    """Queue an event on `session`; it is published only if the session commits."""
+    session.info.setdefault(_PENDING, []).append({"event": name, "data": data})
+
+
+def _publish_committed(session):
+    pending = session.info.pop(_PENDING, None)
+    if pending:
+        publish(*pending)
+
+
+def _discard_pending(session):
+    session.info.pop(_PENDING, None)
+
+
+def init_events(session):
+    if event.contains(session, 'after_commit', _publish_committed):
+        return
+    event.listen(session, 'after_commit', _publish_committed)
+    event.listen(session, 'after_rollback', _discard_pending)
@@ -0,0 +1,251 @@
+"""Sync CarbonCredit contract state from a JSON-RPC node into Postgres.
+
+Run it as its own process next to the web workers:
+
+    CHAIN_CONTRACT_ADDRESS=0x... CHAIN_START_BLOCK=<deployment block> flask index-chain
+
+Blocks are fetched in batches and every successful call to the contract is
+decoded into chain_calls. Touched credits are then rebuilt from their calls
+into chain_credits and mirrored onto the credits table: listing state,
+expiry and price. Sales are not written: users have no wallet address, so a
+buyCredit sent to the contract directly cannot be attributed to a buyer and
+never reaches transactions, purchased_credits or the dashboard stats. A
+purchase reported through the API is matched by its transaction hash and
+gets its block number; chain_credits.owner always holds the on-chain owner.
+A block whose parent hash does not match the stored one means a reorg: the
+indexer rewinds to the last common block and replays from there.
+"""
+import time
+from decimal import Decimal
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import update
+
+from app import db
+from app.models.chain import ChainBlock, ChainCall, ChainCheckpoint, ChainCredit
+from app.models.credit import Credit
+from app.models.transaction import Transactions
+from app.utilis.cache import touch
+from app.utilis.chain import WEI_PER_ETH, JsonRpcClient, decode_call, project_credit
+from config import Config
+
+CHECKPOINT = 'carbon_credit'
+# Seconds between retries once errors keep recurring
+MAX_BACKOFF = 300
+
+
+class ReorgTooDeep(Exception):
+    pass
+
+
+class Indexer:
+    def __init__(self, rpc, contract_address, start_block=0, batch_size=100, reorg_depth=64):
+        self.rpc = rpc
+        self.contract = contract_address.lower()
+        self.start_block = start_block
+        self.batch_size = batch_size
+        self.reorg_depth = reorg_depth
+
+    def checkpoint(self):
+        checkpoint = db.session.get(ChainCheckpoint, CHECKPOINT)
+        if checkpoint is None:
+            checkpoint = ChainCheckpoint(name=CHECKPOINT, block_number=self.start_block - 1, next_credit_id=0)
+            db.session.add(checkpoint)
+        return checkpoint
+
+    def sync_once(self):
+        """Index the next batch of blocks.
+
+        Returns how many blocks were indexed or rewound; 0 once caught up.
+        """
+        head = int(self.rpc.call('eth_blockNumber'), 16)
+        checkpoint = self.checkpoint()
+        first = checkpoint.block_number + 1
+        if first > head:
+            db.session.rollback()
+            return 0
+        last = min(head, first + self.batch_size - 1)
+        blocks = self.rpc.batch([('eth_getBlockByNumber', [hex(n), True]) for n in range(first, last + 1)])
+
+        parent = db.session.get(ChainBlock, first - 1)
+        if parent is not None and blocks[0]['parentHash'] != parent.hash:
+            return self.rewind(checkpoint)
+        # Blocks in one batch can straddle a reorg on the node; keep the
+        # consistent prefix and pick up the rest next round
+        for i in range(1, len(blocks)):
+            if blocks[i]['parentHash'] != blocks[i - 1]['hash']:
+                blocks = blocks[:i]
+                break
+
+        contract_txs = [(block, tx) for block in blocks for tx in block['transactions']
+                        if (tx.get('to') or '').lower() == self.contract]
+        receipts = self.rpc.batch([('eth_getTransactionReceipt', [tx['hash']]) for _, tx in contract_txs])
+
+        touched = set()
+        purchases = {}
+        for (block, tx), receipt in zip(contract_txs, receipts):
+            if receipt is None or int(receipt['status'], 16) != 1:
+                continue
+            decoded = decode_call(tx['input'])
+            if decoded is None:
+                continue
+            method, args = decoded
+            block_number = int(block['number'], 16)
+            if method == 'generateCredits':
+                # Stored as one generateCredit per credit, ids in array order
+                calls = [('generateCredit', [amount, price]) for amount, price in zip(*args)]
+            else:
+                calls = [(method, args)]
+            for method, args in calls:
+                if method == 'generateCredit':
+                    credit_id = checkpoint.next_credit_id
+                    checkpoint.next_credit_id += 1
+                else:
+                    credit_id = args[0]
+                    # e.g. requestAudit on an id never generated succeeds but
+                    # touches no credit
+                    if credit_id >= checkpoint.next_credit_id:
+                        continue
+                db.session.add(ChainCall(
+                    block_number=block_number,
+                    tx_index=int(tx['transactionIndex'], 16),
+                    txn_hash=tx['hash'],
+                    method=method,
+                    credit_id=credit_id,
+                    sender=tx['from'].lower(),
+                    value=int(tx['value'], 16),
+                    args=args,
+                ))
+                touched.add(credit_id)
+            if method == 'buyCredit':
+                purchases[tx['hash']] = block_number
+
+        db.session.add_all([ChainBlock(number=int(block['number'], 16), hash=block['hash'],
+                                       parent_hash=block['parentHash']) for block in blocks])
+        last = int(blocks[-1]['number'], 16)
+        db.session.query(ChainBlock).filter(ChainBlock.number <= last - self.reorg_depth).delete()
+        db.session.flush()
+
+        self.project(touched)
+        for txn_hash, block_number in purchases.items():
+            db.session.execute(update(Transactions)
+                               .where(Transactions.txn_hash == txn_hash)
+                               .values(block_number=block_number))
+        if purchases:
+            touch(db.session, 'transaction')
+        checkpoint.block_number = last
+        db.session.commit()
+        return len(blocks)
+
+    def rewind(self, checkpoint):
+        """Undo everything above the last block the node still agrees with.
+
+        Returns the number of blocks undone.
+        """
+        stored = (ChainBlock.query.filter(ChainBlock.number <= checkpoint.block_number)
+                  .order_by(ChainBlock.number.desc()).all())
+        canonical = self.rpc.batch([('eth_getBlockByNumber', [hex(b.number), False]) for b in stored])
+        ancestor = next((b.number for b, c in zip(stored, canonical) if c and c['hash'] == b.hash), None)
+        if ancestor is None:
+            db.session.rollback()
+            raise ReorgTooDeep(f"No common block in the last {len(stored)} indexed blocks")
+        print(f"chain reorg: rewinding from block {checkpoint.block_number} to {ancestor}")
+
+        touched = {credit_id for (credit_id,) in
+                   db.session.query(ChainCall.credit_id).filter(ChainCall.block_number > ancestor).distinct()}
+        # Credits generated in the undone blocks get their ids again on replay.
+        # Counted back from the checkpoint rather than from all calls, which
+        # start at CHAIN_START_BLOCK or a seeded checkpoint, not at genesis
+        generated = ChainCall.query.filter(ChainCall.block_number > ancestor,
+                                           ChainCall.method == 'generateCredit').count()
+        db.session.query(ChainCall).filter(ChainCall.block_number > ancestor).delete()
+        db.session.query(ChainBlock).filter(ChainBlock.number > ancestor).delete()
+        db.session.execute(update(Transactions)
+                           .where(Transactions.block_number > ancestor)
+                           .values(block_number=None))
+        touch(db.session, 'transaction')
+        db.session.flush()
+        undone = checkpoint.block_number - ancestor
+        checkpoint.block_number = ancestor
+        checkpoint.next_credit_id -= generated
+        self.project(touched)
+        db.session.commit()
+        return undone
+
+    def project(self, credit_ids):
+        """Rebuild chain_credits for `credit_ids` and mirror them onto credits."""
+        if not credit_ids:
+            return
+        calls = (ChainCall.query.filter(ChainCall.credit_id.in_(credit_ids))
+                 .order_by(ChainCall.credit_id, ChainCall.block_number, ChainCall.tx_index)
+                 .all())
+        by_credit = {credit_id: [] for credit_id in credit_ids}
+        for call in calls:
+            by_credit[call.credit_id].append(call)
+        existing = {c.credit_id: c for c in ChainCredit.query.filter(ChainCredit.credit_id.in_(credit_ids))}
+        credits = {c.id: c for c in Credit.query.filter(Credit.id.in_(credit_ids))}
+
+        for credit_id, credit_calls in by_credit.items():
+            state = project_credit(credit_calls)
+            chain_credit = existing.get(credit_id)
+            if state is None:
+                if chain_credit is not None:
+                    db.session.delete(chain_credit)
+                continue
+            if chain_credit is None:
+                chain_credit = ChainCredit(credit_id=credit_id)
+                db.session.add(chain_credit)
+            for key, value in state.items():
+                setattr(chain_credit, key, value)
+
+            # The contract is the source of truth for listing state and price
+            credit = credits.get(credit_id)
+            if credit is not None:
+                credit.is_active = state["for_sale"] and not state["expired"]
+                credit.is_expired = state["expired"]
+                credit.price = float(Decimal(state["price"]) / WEI_PER_ETH)
+
+    def run(self, poll_interval):
+        failures = 0
+        while True:
+            try:
+                indexed = self.sync_once()
+            except ReorgTooDeep:
+                raise
+            except Exception as e:
+                # Node outages, lost database connections, constraint errors:
+                # nothing was committed, so retry the same batch after a pause
+                db.session.rollback()
+                failures += 1
+                print(f"chain indexer error ({type(e).__name__}): {e}")
+                time.sleep(min(poll_interval * 2 ** failures, MAX_BACKOFF))
+                continue
+            failures = 0
+            if not indexed:
+                time.sleep(poll_interval)
+
+
+def create_indexer():
+    if not Config.CHAIN_CONTRACT_ADDRESS:
+        raise click.UsageError("CHAIN_CONTRACT_ADDRESS is not set")
+    return Indexer(
+        JsonRpcClient(Config.CHAIN_RPC_URL, Config.CHAIN_RPC_TIMEOUT),
+        Config.CHAIN_CONTRACT_ADDRESS,
+        start_block=Config.CHAIN_START_BLOCK,
+        batch_size=Config.CHAIN_BATCH_SIZE,
+        reorg_depth=Config.CHAIN_REORG_DEPTH,
+    )
+
+
+@click.command('index-chain')
+@click.option('--once', is_flag=True, help="Index until caught up with the node, then exit.")
+@with_appcontext
+def index_chain_command(once):
+    """Tail the CarbonCredit contract into Postgres."""
+    indexer = create_indexer()
+    if once:
+        while indexer.sync_once():
+            pass
+        return
+    indexer.run(Config.CHAIN_POLL_INTERVAL)
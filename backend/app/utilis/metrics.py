@@ -0,0 +1,113 @@
+"""Request, database, cache and rendering metrics.
+
+Exposed in Prometheus text format on /api/metrics, next to the other API
+routes (set metrics_path: /api/metrics in the scrape config). Under gunicorn, set
+PROMETHEUS_MULTIPROC_DIR to an empty directory so every worker's samples
+are aggregated (gunicorn.conf.py cleans up after exited workers).
+With SERVER_TIMING enabled, each response also carries a Server-Timing
+header with the app, database and cache time of that request.
+"""
+import os
+import time
+from contextlib import contextmanager
+from flask import Response, g, has_request_context, request
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram,
+                               generate_latest, multiprocess)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from config import Config
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Time to produce a response (first byte for streams)',
+    ['method', 'endpoint', 'status'])
+DB_STATEMENTS = Histogram(
+    'db_statements_per_request', 'SQL statements executed per request', ['endpoint'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89))
+DB_TIME = Histogram(
+    'db_time_per_request_seconds', 'Time spent executing SQL per request', ['endpoint'])
+CACHE_REQUESTS = Counter(
+    'cache_requests_total', 'Cache lookups by key family and result', ['family', 'result'])
+RENDER_TIME = Histogram(
+    'certificate_render_seconds', 'Certificate rendering time; for PDFs from pool submission to file written',
+    ['kind'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30))
+
+
+def _endpoint():
+    rule = request.url_rule
+    return rule.rule if rule is not None else 'unmatched'
+
+
+def record_cache(key, result):
+    """Count a cache hit, miss or error; the family is the key up to the first ':'."""
+    family = key.split(':', 1)[0]
+    CACHE_REQUESTS.labels(family, result).inc()
+    if has_request_context():
+        g.setdefault('cache_results', []).append(result)
+
+
+@contextmanager
+def timed_render(kind):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        RENDER_TIME.labels(kind).observe(time.perf_counter() - start)
+
+
+def observe_render(kind, seconds):
+    RENDER_TIME.labels(kind).observe(seconds)
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        context._metrics_start = time.perf_counter()
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, '_metrics_start', None)
+    if start is not None and has_request_context():
+        g.db_statements = g.get('db_statements', 0) + 1
+        g.db_time = g.get('db_time', 0.0) + time.perf_counter() - start
+
+
+def _start_timer():
+    g.request_start = time.perf_counter()
+
+
+def _record_request(response):
+    start = g.get('request_start')
+    if start is None:
+        return response
+    elapsed = time.perf_counter() - start
+    endpoint = _endpoint()
+    statements, db_time = g.get('db_statements', 0), g.get('db_time', 0.0)
+    REQUEST_LATENCY.labels(request.method, endpoint, str(response.status_code)).observe(elapsed)
+    DB_STATEMENTS.labels(endpoint).observe(statements)
+    DB_TIME.labels(endpoint).observe(db_time)
+
+    if Config.SERVER_TIMING:
+        timings = [f"app;dur={elapsed * 1000:.1f}",
+                   f'db;dur={db_time * 1000:.1f};desc="{statements} queries"']
+        cache_results = g.get('cache_results')
+        if cache_results:
+            hits = cache_results.count('hit')
+            timings.append(f'cache;desc="{hits}/{len(cache_results)} hits"')
+        response.headers.add('Server-Timing', ', '.join(timings))
+    return response
+
+
+def metrics_response():
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_metrics(app):
+    app.before_request(_start_timer)
+    app.after_request(_record_request)
@@ -0,0 +1,56 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from threading import BoundedSemaphore, Lock
+import bcrypt
+from config import Config
+
+_executor = None
+_slots = None
+_lock = Lock()
+
+
+class PasswordPoolBusy(Exception):
+    """Raised when too many hashes are already queued; callers answer 503."""
+
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _check(pw_hash, password):
+    return bcrypt.checkpw(password.encode('utf-8'), pw_hash.encode('utf-8'))
+
+
+def _get_executor():
+    global _executor, _slots
+    with _lock:
+        if _executor is None:
+            workers = Config.BCRYPT_POOL_WORKERS
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _slots = BoundedSemaphore(workers + Config.BCRYPT_MAX_QUEUED)
+        return _executor
+
+
+def _run(fn, *args):
+    # bcrypt is CPU-bound and holds the GIL for the whole hash; running it in
+    # a bounded process pool keeps web threads free to serve other requests.
+    if Config.BCRYPT_POOL_WORKERS <= 0:
+        return fn(*args)
+    executor = _get_executor()
+    if not _slots.acquire(timeout=Config.BCRYPT_QUEUE_TIMEOUT):
+        raise PasswordPoolBusy()
+    try:
+        future = executor.submit(fn, *args)
+    except BaseException:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    return future.result()
+
+
+def hash_password(password):
+    return _run(_hash, password, Config.BCRYPT_LOG_ROUNDS)
+
+
+def check_password(pw_hash, password):
+    return _run(_check, pw_hash, password)
@@ -0,0 +1,48 @@
+import time
+from functools import wraps
+from threading import Lock
+from flask import jsonify, request
+from app.utilis.redis import get_redis
+
+# Fallback counters when Redis is unavailable: key -> count
+_local_counts = {}
+_local_lock = Lock()
+
+
+def _hit(key, window):
+    client = get_redis()
+    if client is not None:
+        try:
+            pipe = client.pipeline()
+            pipe.incr(key)
+            pipe.expire(key, window)
+            return pipe.execute()[0]
+        except Exception as e:
+            print(f"redis rate limit error: {e}")
+    with _local_lock:
+        # Keys embed their window, so anything not from the current one is stale
+        window_suffix = key.rsplit(':', 1)[1]
+        for stale in [k for k in _local_counts if not k.endswith(':' + window_suffix)]:
+            del _local_counts[stale]
+        _local_counts[key] = _local_counts.get(key, 0) + 1
+        return _local_counts[key]
+
+
+def rate_limit(scope, limit, window):
+    """Allow `limit` calls per client IP every `window` seconds (fixed window).
+
+    A limit of 0 disables the check.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if limit > 0:
+                now = time.time()
+                key = f"ratelimit:{scope}:{request.remote_addr}:{int(now // window)}"
+                if _hit(key, window) > limit:
+                    response = jsonify({"message": "Too many requests, try again later"})
+                    response.headers['Retry-After'] = str(window - int(now) % window)
+                    return response, 429
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,91 @@
+"""Readiness probe for the load balancer.
+
+Checks this worker's own view of its dependencies: the Postgres connection
+pool, a `SELECT 1` through it, and a Redis PING. Results are cached for
+READYZ_CACHE_TTL seconds per process so frequent probes do not add load.
+"""
+import time
+from threading import Lock
+from sqlalchemy import text
+from config import Config
+from app import db
+from app.utilis.redis import get_redis
+
+_lock = Lock()
+_cached = None
+_cached_at = 0.0
+
+
+def _ms(start):
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+def check_pool():
+    pool = db.engine.pool
+    if not hasattr(pool, 'checkedout') or not hasattr(pool, 'size'):
+        return {"status": "up", "pool": type(pool).__name__}
+    checked_out = pool.checkedout()
+    capacity = pool.size() + max(getattr(pool, '_max_overflow', 0), 0)
+    saturation = checked_out / capacity if capacity else 0.0
+    return {
+        "status": "up" if saturation < Config.READYZ_POOL_SATURATION else "down",
+        "checked_out": checked_out,
+        "size": pool.size(),
+        "overflow": pool.overflow(),
+        "capacity": capacity,
+        "saturation": round(saturation, 2),
+    }
+
+
+def check_database():
+    start = time.perf_counter()
+    try:
+        with db.engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+    except Exception as e:
+        print(f"readiness database error: {e}")
+        return {"status": "down", "latency_ms": _ms(start), "error": type(e).__name__}
+    return {"status": "up", "latency_ms": _ms(start)}
+
+
+def check_redis():
+    client = get_redis()
+    if client is None:
+        # Not connected at boot; the app runs without cache and cross-worker events
+        return {"status": "disabled"}
+    start = time.perf_counter()
+    try:
+        client.ping()
+    except Exception as e:
+        print(f"readiness redis error: {e}")
+        return {"status": "down", "latency_ms": _ms(start), "error": type(e).__name__}
+    return {"status": "up", "latency_ms": _ms(start)}
+
+
+def probe():
+    """Run every check; returns (report, ready)."""
+    checks = {"db_pool": check_pool()}
+    if checks["db_pool"]["status"] == "up":
+        checks["database"] = check_database()
+    else:
+        # A connection checkout would block for pool_timeout; the pool being
+        # exhausted is answer enough
+        checks["database"] = {"status": "skipped"}
+    checks["redis"] = check_redis()
+
+    required = ["db_pool", "database"]
+    if Config.READYZ_REQUIRE_REDIS:
+        required.append("redis")
+    ready = all(checks[name]["status"] == "up" for name in required)
+    return {"status": "ready" if ready else "degraded", "checks": checks}, ready
+
+
+def cached_probe():
+    """probe(), reused for READYZ_CACHE_TTL seconds; also returns the result's age."""
+    global _cached, _cached_at
+    with _lock:
+        now = time.monotonic()
+        if _cached is None or now - _cached_at >= Config.READYZ_CACHE_TTL:
+            _cached = probe()
+            _cached_at = now
+        return _cached[0], _cached[1], round(now - _cached_at, 2)
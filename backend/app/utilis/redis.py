@@ -1,4 +1,5 @@
 from redis import Redis
+from redis.exceptions import RedisError
 from config import Config
 redis_client = None
 def init_redis(app):
@@ -11,7 +12,7 @@ def init_redis(app):
         )
         redis_client.ping()
         print("Connected to redis")
-    except ConnectionError as e:
+    except RedisError as e:
         print("No redis server connected")
         redis_client = None
 
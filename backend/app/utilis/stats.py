@@ -0,0 +1,105 @@
+"""Incrementally maintained dashboard totals (ngo_stats, buyer_stats).
+
+Routes that issue, sell, audit or expire credits add their deltas in the
+same transaction as the change itself, as one upsert per affected user.
+Writes that bypass the routes (the chain indexer, benchmark seeding) can
+leave them behind; `flask rebuild-stats` recomputes everything.
+"""
+from datetime import datetime
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+
+from app import db
+from app.models.stats import BuyerStats, NGOStats
+
+NGO_FIELDS = ('credits_issued', 'tons_issued', 'pending_audits', 'sales', 'tons_sold', 'revenue', 'tons_retired')
+BUYER_FIELDS = ('purchases', 'spent', 'credits_held', 'tons_held', 'tons_retired')
+
+REBUILD_NGO_STATS = """
+WITH issued AS (
+    SELECT creator_id AS id, count(*) AS credits, sum(amount) AS tons,
+           count(*) FILTER (WHERE req_status = 1) AS pending,
+           coalesce(sum(amount) FILTER (WHERE is_expired), 0) AS retired
+    FROM credits GROUP BY creator_id
+), sold AS (
+    SELECT c.creator_id AS id, count(*) AS sales, sum(t.amount) AS tons, sum(t.total_price) AS revenue
+    FROM transactions t JOIN credits c ON c.id = t.credit_id GROUP BY c.creator_id
+)
+INSERT INTO ngo_stats (ngo_id, credits_issued, tons_issued, pending_audits, sales, tons_sold, revenue,
+                       tons_retired, updated_at)
+SELECT u.id, coalesce(i.credits, 0), coalesce(i.tons, 0), coalesce(i.pending, 0), coalesce(s.sales, 0),
+       coalesce(s.tons, 0), coalesce(s.revenue, 0), coalesce(i.retired, 0), now()
+FROM users u LEFT JOIN issued i ON i.id = u.id LEFT JOIN sold s ON s.id = u.id
+WHERE u.role = 'NGO'
+"""
+
+REBUILD_BUYER_STATS = """
+WITH bought AS (
+    SELECT buyer_id AS id, count(*) AS purchases, sum(total_price) AS spent
+    FROM transactions GROUP BY buyer_id
+), held AS (
+    SELECT user_id AS id,
+           count(*) FILTER (WHERE NOT coalesce(is_expired, false)) AS credits,
+           coalesce(sum(amount) FILTER (WHERE NOT coalesce(is_expired, false)), 0) AS tons,
+           coalesce(sum(amount) FILTER (WHERE is_expired), 0) AS retired
+    FROM purchased_credits WHERE is_current GROUP BY user_id
+)
+INSERT INTO buyer_stats (buyer_id, purchases, spent, credits_held, tons_held, tons_retired, updated_at)
+SELECT u.id, coalesce(b.purchases, 0), coalesce(b.spent, 0), coalesce(h.credits, 0), coalesce(h.tons, 0),
+       coalesce(h.retired, 0), now()
+FROM users u LEFT JOIN bought b ON b.id = u.id LEFT JOIN held h ON h.id = u.id
+WHERE u.role = 'buyer'
+"""
+
+
+def _bump(session, model, key, owner_id, deltas):
+    deltas = {field: value for field, value in deltas.items() if value}
+    if owner_id is None or not deltas:
+        return
+    stmt = insert(model).values({key: owner_id, "updated_at": datetime.utcnow(), **deltas})
+    columns = model.__table__.c
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[key],
+        set_={**{field: columns[field] + stmt.excluded[field] for field in deltas},
+              "updated_at": stmt.excluded.updated_at},
+    )
+    session.execute(stmt)
+
+
+def bump_ngo(session, ngo_id, **deltas):
+    """Add `deltas` (NGO_FIELDS) to an NGO's totals."""
+    _bump(session, NGOStats, 'ngo_id', ngo_id, deltas)
+
+
+def bump_buyer(session, buyer_id, **deltas):
+    """Add `deltas` (BUYER_FIELDS) to a buyer's totals."""
+    _bump(session, BuyerStats, 'buyer_id', buyer_id, deltas)
+
+
+def stats_payload(row, fields):
+    """A stats row as JSON; users without a row yet get zeros."""
+    payload = {field: getattr(row, field) if row is not None else 0 for field in fields}
+    payload["updated_at"] = row.updated_at.isoformat() if row is not None else None
+    return payload
+
+
+def rebuild_stats():
+    # Routes bump stats before they commit, so once the lock is granted every
+    # change either is visible to the rebuild or waits to apply its delta on top
+    db.session.execute(text('LOCK TABLE ngo_stats, buyer_stats IN EXCLUSIVE MODE'))
+    db.session.execute(text('DELETE FROM ngo_stats'))
+    db.session.execute(text('DELETE FROM buyer_stats'))
+    db.session.execute(text(REBUILD_NGO_STATS))
+    db.session.execute(text(REBUILD_BUYER_STATS))
+    db.session.commit()
+
+
+@click.command('rebuild-stats')
+@with_appcontext
+def rebuild_stats_command():
+    """Recompute ngo_stats and buyer_stats from credits, transactions and holdings."""
+    rebuild_stats()
+    print("Dashboard stats rebuilt")
@@ -0,0 +1,117 @@
+"""Simulate audit completion times under random and least-loaded assignment.
+
+Credits arrive at random, each needs numberOfAuditors(amount) votes, and
+every auditor works through their own queue at their own pace (a few are
+much slower than the rest). The same arrivals are replayed with auditors
+picked uniformly at random (the old behaviour) and by AuditorPool, which
+picks the least-loaded ones. No database is needed:
+
+    python -m benchmarks.auditor_assignment_sim --auditors 60 --credits 5000
+"""
+import argparse
+import heapq
+import random
+
+from app.utilis.auditor_pool import AuditorPool
+from benchmarks.common import percentile
+
+
+def auditors_needed(amount):
+    return (amount // 500) * 2 + 3
+
+
+class RandomAssignment:
+    def __init__(self, auditor_ids, rng):
+        self.auditor_ids = list(auditor_ids)
+        self.rng = rng
+
+    def assign(self, k):
+        return self.rng.sample(self.auditor_ids, k)
+
+    def release(self, auditor_id):
+        pass
+
+
+class PoolAssignment:
+    def __init__(self, auditor_ids, seed):
+        random.seed(seed)  # AuditorPool breaks ties with the random module
+        self.pool = AuditorPool(ttl=float('inf'))
+        self.pool.load({auditor_id: 0 for auditor_id in auditor_ids})
+
+    def assign(self, k):
+        return self.pool.assign(k)
+
+    def release(self, auditor_id):
+        self.pool.release(auditor_id)
+
+
+def simulate(strategy, arrivals, service_means, rng):
+    """Returns (completion time of each credit, longest queue seen)."""
+    queues = {auditor_id: [] for auditor_id in service_means}
+    busy = set()
+    remaining, arrived_at, done = {}, {}, []
+    events = [(t, 0, 'arrive', credit_id, amount) for credit_id, (t, amount) in enumerate(arrivals)]
+    heapq.heapify(events)
+    seq = len(events)
+    longest = 0
+
+    def start(now, auditor_id):
+        nonlocal seq
+        if queues[auditor_id] and auditor_id not in busy:
+            busy.add(auditor_id)
+            seq += 1
+            finish = now + rng.expovariate(1 / service_means[auditor_id])
+            heapq.heappush(events, (finish, seq, 'vote', auditor_id, None))
+
+    while events:
+        now, _, kind, subject, amount = heapq.heappop(events)
+        if kind == 'arrive':
+            arrived_at[subject] = now
+            auditors = strategy.assign(auditors_needed(amount))
+            remaining[subject] = len(auditors)
+            for auditor_id in auditors:
+                queues[auditor_id].append(subject)
+                longest = max(longest, len(queues[auditor_id]))
+                start(now, auditor_id)
+        else:
+            credit_id = queues[subject].pop(0)
+            busy.discard(subject)
+            strategy.release(subject)
+            remaining[credit_id] -= 1
+            if remaining[credit_id] == 0:
+                done.append(now - arrived_at[credit_id])
+            start(now, subject)
+    return done, longest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--auditors', type=int, default=60)
+    parser.add_argument('--credits', type=int, default=5000)
+    parser.add_argument('--arrival-rate', type=float, default=1.5, help="credits per hour")
+    parser.add_argument('--service-hours', type=float, default=4.0, help="mean hours per vote")
+    parser.add_argument('--slow-share', type=float, default=0.15, help="share of much slower auditors")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    service_means = {
+        auditor_id: args.service_hours * (rng.uniform(5, 10) if rng.random() < args.slow_share
+                                          else rng.lognormvariate(0, 0.3))
+        for auditor_id in range(args.auditors)
+    }
+    t, arrivals = 0.0, []
+    for _ in range(args.credits):
+        t += rng.expovariate(args.arrival_rate)
+        arrivals.append((t, rng.randint(1, 2000)))
+
+    print(f"{'strategy':<14} {'mean h':>8} {'p50 h':>8} {'p95 h':>8} {'p99 h':>8} {'max queue':>10}")
+    for name, strategy in (('random', RandomAssignment(service_means, random.Random(args.seed))),
+                           ('least-loaded', PoolAssignment(service_means, args.seed))):
+        done, longest = simulate(strategy, arrivals, service_means, random.Random(args.seed + 1))
+        print(f"{name:<14} {sum(done) / len(done):>8.1f} {percentile(done, 50):>8.1f} "
+              f"{percentile(done, 95):>8.1f} {percentile(done, 99):>8.1f} {longest:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+"""Latency and SQL statements per request for every API blueprint.
+
+Reads repeat the same request; writes get fresh ids from `unique` or
+consume seeded state (open audits, unexpired sales) one item per round.
+PDF rendering, the event stream and signup (Turnstile) are covered by
+certificate_benchmark, serve_load and login_load instead.
+"""
+import itertools
+import random
+
+import pytest
+
+from app import db
+from app.models.association import AuditorAssociation
+from app.models.credit import Credit
+from app.models.transaction import PurchasedCredit
+from app.models.user import User
+
+WRITE_ROUNDS = 30
+
+
+@pytest.fixture(scope='session')
+def state(app, seeded):
+    """Seeded rows the write benchmarks consume, looked up once."""
+    rng = random.Random(0)
+    with app.app_context():
+        ngo_id = seeded.ngo_ids[0]
+        open_audits = (db.session.query(AuditorAssociation.credit_id, User.username)
+                       .join(User, User.id == AuditorAssociation.auditor_id)
+                       .filter(AuditorAssociation.voted_at.is_(None), User.username.in_(
+                           [f"auditor_{i}" for i in range(5)]))
+                       .all())
+        expirable = [credit_id for (credit_id,) in
+                     db.session.query(Credit.id)
+                     .join(PurchasedCredit, PurchasedCredit.credit_id == Credit.id)
+                     .filter(Credit.creator_id == ngo_id, Credit.is_expired == False,
+                             PurchasedCredit.is_current == True)]
+        certificate = (db.session.query(PurchasedCredit.credit_id, User.username)
+                       .join(User, User.id == PurchasedCredit.user_id)
+                       .filter(PurchasedCredit.is_current == True, PurchasedCredit.is_expired == True)
+                       .first())
+        owned = (db.session.query(PurchasedCredit.credit_id, User.username)
+                 .join(User, User.id == PurchasedCredit.user_id)
+                 .filter(PurchasedCredit.is_current == True, PurchasedCredit.is_expired == False)
+                 .first())
+        active = [credit_id for (credit_id,) in db.session.query(Credit.id).filter(Credit.is_active == True)]
+    rng.shuffle(open_audits)
+    rng.shuffle(expirable)
+    return {
+        "ngo": 'ngo_0',
+        "open_audits": open_audits,
+        "expirable": expirable,
+        "certificate": certificate,
+        "owned": owned,
+        "active": active,
+        "next_credit_id": max(seeded.credit_ids, default=-1) + 1,
+    }
+
+
+def _rounds(items):
+    # One item goes to the statement-counting warm-up call
+    if len(items) < 2:
+        pytest.skip("not enough seeded rows; raise --scale-credits")
+    return min(WRITE_ROUNDS, len(items) - 1)
+
+
+# auth
+
+def test_login(benchmark, api):
+    benchmark.group = 'auth'
+    api('POST', '/api/login', payload={"username": "buyer_0", "password": "benchmark", "role": "buyer"})
+
+
+# buyer
+
+@pytest.mark.parametrize('query', [
+    '',
+    '?sort=-price&min_price=1&max_price=2',
+    '?sort=amount&creator=1',
+    '?q=project%2012',
+])
+def test_marketplace(benchmark, api, headers, query):
+    benchmark.group = 'buyer'
+    api('GET', f"/api/buyer/credits{query}", headers('buyer_0'))
+
+
+def test_buyer_summary(benchmark, api, headers):
+    benchmark.group = 'buyer'
+    api('GET', '/api/buyer/summary', headers('buyer_0'))
+
+
+def test_purchased(benchmark, api, headers):
+    benchmark.group = 'buyer'
+    api('GET', '/api/buyer/purchased', headers('buyer_0'))
+
+
+def test_credit_details(benchmark, api, headers, seeded):
+    benchmark.group = 'buyer'
+    api('GET', f"/api/buyer/credits/{seeded.credit_ids[-1]}", headers('buyer_0'))
+
+
+def test_credit_history(benchmark, api, headers, seeded):
+    benchmark.group = 'buyer'
+    api('GET', f"/api/buyer/credits/{seeded.credit_ids[0]}/history", headers('buyer_0'))
+
+
+def test_generate_certificate(benchmark, api, headers, state):
+    benchmark.group = 'buyer'
+    if state["certificate"] is None:
+        pytest.skip("no expired holdings seeded")
+    credit_id, username = state["certificate"]
+    api('GET', f"/api/buyer/generate-certificate/{credit_id}", headers(username))
+
+
+def test_purchase(benchmark, api, headers, state, unique):
+    benchmark.group = 'buyer'
+    # A purchase delists the credit, so every round buys another listing
+    active = iter(state["active"])
+    rounds = _rounds(state["active"])
+
+    def prepare():
+        return '/api/buyer/purchase', {"credit_id": next(active), "txn_hash": f"0x{next(unique):064x}"}
+    api('POST', headers=headers('buyer_1'), prepare=prepare, rounds=rounds)
+
+
+def test_purchase_replay(benchmark, api, headers, state):
+    benchmark.group = 'buyer'
+    # A client retry of a recorded purchase, on a listing test_purchase leaves alone
+    if len(state["active"]) <= WRITE_ROUNDS + 1:
+        pytest.skip("not enough listed credits seeded")
+    credit_id = state["active"][-1]
+    payload = {"credit_id": credit_id, "txn_hash": f"0x{credit_id:064x}"}
+    api('POST', '/api/buyer/purchase', headers('buyer_2'), payload=payload)
+
+
+def test_sell_and_delist(benchmark, api, headers, state):
+    benchmark.group = 'buyer'
+    if state["owned"] is None:
+        pytest.skip("no unexpired holdings seeded")
+    credit_id, username = state["owned"]
+    toggle = itertools.count()
+
+    def prepare():
+        if next(toggle) % 2:
+            return '/api/buyer/remove-from-sale', {"credit_id": credit_id}
+        return '/api/buyer/sell', {"credit_id": credit_id, "salePrice": 1.5}
+    # Both endpoints are PATCH; alternating keeps the credit's state bounded
+    api('PATCH', headers=headers(username), prepare=prepare, rounds=2 * WRITE_ROUNDS)
+
+
+# NGO
+
+def test_ngo_credits(benchmark, api, headers, state):
+    benchmark.group = 'NGO'
+    api('GET', '/api/NGO/credits', headers(state["ngo"]))
+
+
+def test_ngo_transactions(benchmark, api, headers, state):
+    benchmark.group = 'NGO'
+    api('GET', '/api/NGO/transactions', headers(state["ngo"]))
+
+
+def test_ngo_summary(benchmark, api, headers, state):
+    benchmark.group = 'NGO'
+    api('GET', '/api/NGO/summary', headers(state["ngo"]))
+
+
+def test_audit_request(benchmark, api, headers, state):
+    benchmark.group = 'NGO'
+    api('GET', '/api/NGO/audit-req?amount=1200', headers(state["ngo"]))
+
+
+def test_create_credit(benchmark, api, headers, state, unique):
+    benchmark.group = 'NGO'
+
+    def prepare():
+        credit_id = state["next_credit_id"] + next(unique)
+        return '/api/NGO/credits', {"creditId": credit_id, "name": f"Bench {credit_id}", "amount": 700,
+                                    "price": 0.5, "secure_url": f"https://example.invalid/docs/{credit_id}.pdf"}
+    api('POST', headers=headers(state["ngo"]), expect=201, prepare=prepare, rounds=WRITE_ROUNDS)
+
+
+def test_expire_credit(benchmark, api, headers, state):
+    benchmark.group = 'NGO'
+    expirable = iter(state["expirable"])
+    rounds = _rounds(state["expirable"])
+    api('PATCH', headers=headers(state["ngo"]), rounds=rounds,
+        prepare=lambda: (f"/api/NGO/credits/expire/{next(expirable)}", None))
+
+
+# auditor
+
+def test_auditor_credits(benchmark, api, headers):
+    benchmark.group = 'auditor'
+    api('GET', '/api/auditor/credits', headers('auditor_0'))
+
+
+def test_audit_vote(benchmark, api, headers, state):
+    benchmark.group = 'auditor'
+    open_audits = iter(state["open_audits"])
+    rounds = _rounds(state["open_audits"])
+    current = {}
+
+    def prepare():
+        credit_id, username = next(open_audits)
+        # Each vote comes from a different auditor; swap the header in place
+        current.clear()
+        current.update(headers(username))
+        return f"/api/auditor/audit/{credit_id}", {"vote": True}
+    api('PATCH', headers=current, prepare=prepare, rounds=rounds)
+
+
+# chain and health
+
+def test_chain_status(benchmark, api):
+    benchmark.group = 'chain'
+    api('GET', '/api/chain/status')
+
+
+@pytest.mark.parametrize('path', ['/api/healthz', '/api/readyz', '/api/metrics'])
+def test_health(benchmark, api, path):
+    benchmark.group = 'health'
+    api('GET', path)
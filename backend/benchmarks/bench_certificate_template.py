@@ -0,0 +1,36 @@
+"""The certificate template renders its inline stylesheet verbatim.
+
+Needs no database; the HTML returned by generate-certificate embeds the
+stylesheet, and any escaping there breaks declarations such as quoted
+font-family names.
+"""
+import re
+
+from app.utilis.certificate_generator import STYLESHEET, render_certificate_html
+
+CONTEXT = {
+    "purchase_id": 1,
+    "user_id": 2,
+    "buyer_name": "buyer <&> 'quoted'",
+    "credit_id": 3,
+    "credit_name": "Project \"3\"",
+    "credit_amount": 700,
+    "credit_price": 1.5,
+    "amount": 700,
+    "purchase_date": "2026-01-02",
+    "purchase_date_long": "January 02, 2026",
+    "transaction_hash": "0x" + "ab" * 32,
+}
+
+
+def test_inline_stylesheet_is_not_escaped():
+    html = render_certificate_html(CONTEXT)
+    styles = re.search(r'<style>(.*?)</style>', html, re.S).group(1)
+    assert styles == STYLESHEET
+    assert not re.search(r'&(#\d+|#x[0-9a-f]+|amp|lt|gt|quot|apos);', styles, re.I)
+
+
+def test_context_values_are_still_escaped():
+    html = render_certificate_html(CONTEXT, inline_styles=False)
+    assert "buyer <&>" not in html
+    assert "buyer &lt;&amp;&gt;" in html
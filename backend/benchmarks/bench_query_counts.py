@@ -0,0 +1,81 @@
+"""SQL statements per request must not grow with the data behind it.
+
+Unlike the timed benchmarks these assert: an endpoint that issues one query
+per row (N+1) fails here as soon as the row count changes.
+"""
+import pytest
+from sqlalchemy import delete, insert
+
+from app import db
+from app.models.association import AuditorAssociation
+from app.models.credit import Credit
+from app.models.request import Request
+from app.models.user import User
+from benchmarks.common import count_statements
+
+# Far above the seeded and benchmark-created credit ids
+FIRST_CREDIT_ID = 50_000_000
+# Identity, the credits query and nothing per credit
+MAX_STATEMENTS = 3
+
+
+@pytest.fixture
+def scaling_ngo(app, seeded):
+    """An NGO of its own, so credits can be added without disturbing the seeded ones."""
+    with app.app_context():
+        password = db.session.get(User, seeded.ngo_ids[0]).password
+        user = User(username='ngo_scaling', email='ngo_scaling@bench.local', password=password, role='NGO')
+        db.session.add(user)
+        db.session.commit()
+        ngo_id = user.id
+    added = []
+
+    def add_credits(count):
+        start = FIRST_CREDIT_ID + len(added)
+        credit_ids = list(range(start, start + count))
+        with app.app_context():
+            db.session.execute(insert(Credit), [{
+                "id": credit_id, "name": f"Scaling {credit_id}", "amount": 700, "price": 1.0,
+                "is_active": False, "is_expired": False, "creator_id": ngo_id, "req_status": 1,
+            } for credit_id in credit_ids])
+            db.session.execute(insert(Request), [
+                {"credit_id": credit_id, "creator_id": ngo_id, "score": 1} for credit_id in credit_ids])
+            db.session.execute(insert(AuditorAssociation), [
+                {"credit_id": credit_id, "auditor_id": auditor_id, "vote": None}
+                for credit_id in credit_ids for auditor_id in seeded.auditor_ids[:3]])
+            db.session.commit()
+        added.extend(credit_ids)
+
+    yield add_credits
+
+    with app.app_context():
+        db.session.execute(delete(AuditorAssociation).where(AuditorAssociation.credit_id.in_(added)))
+        db.session.execute(delete(Request).where(Request.credit_id.in_(added)))
+        db.session.execute(delete(Credit).where(Credit.id.in_(added)))
+        db.session.execute(delete(User).where(User.id == ngo_id))
+        db.session.commit()
+
+
+def _statements(app, client, path, headers):
+    with count_statements(app.bench_engine) as counter:
+        response = client.get(path, headers=headers)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return counter['statements'], response.get_json()
+
+
+@pytest.mark.parametrize('credits', [20])
+def test_ngo_credits_statements_bounded(app, client, headers, scaling_ngo, credits):
+    scaling_ngo(credits)
+    ngo_headers = headers('ngo_scaling')
+    # The first request may resolve and cache the caller's identity
+    client.get('/api/NGO/credits', headers=ngo_headers)
+
+    few, payload = _statements(app, client, '/api/NGO/credits', ngo_headers)
+    assert len(payload) == credits
+
+    scaling_ngo(9 * credits)
+    many, payload = _statements(app, client, '/api/NGO/credits', ngo_headers)
+    assert len(payload) == 10 * credits
+
+    assert few == many, f"{few} statements for {credits} credits, {many} for {10 * credits}"
+    assert many <= MAX_STATEMENTS, f"{many} statements per request"
@@ -0,0 +1,47 @@
+"""Hot queries must be able to use the partial indexes built for them.
+
+A predicate Postgres cannot match to an index's WHERE clause (`IS TRUE`
+against `WHERE is_active`) silently turns every listing into a sequential
+scan and sort. Sequential scans are disabled here, so the plan shows which
+index the planner can use regardless of the seeded scale.
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app import db
+from app.routes.buyer_routes import _marketplace_query, _parse_marketplace_query
+
+
+def _index_names(plan):
+    names = set()
+    if 'Index Name' in plan:
+        names.add(plan['Index Name'])
+    for child in plan.get('Plans', []):
+        names |= _index_names(child)
+    return names
+
+
+def _plan_indexes(statement):
+    sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    db.session.execute(text('SET LOCAL enable_seqscan = off'))
+    try:
+        (plan,) = db.session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    finally:
+        db.session.rollback()
+    return _index_names(plan['Plan'])
+
+
+@pytest.mark.parametrize('args, index', [
+    ({}, 'ix_credits_active'),
+    ({'sort': 'price'}, 'ix_credits_active_price'),
+    ({'sort': '-price', 'min_price': '1', 'max_price': '2'}, 'ix_credits_active_price'),
+    ({'sort': '-amount'}, 'ix_credits_active_amount'),
+    ({'creator': '1'}, 'ix_credits_active_creator'),
+    ({'q': 'project 12'}, 'ix_credits_active_search'),
+])
+def test_marketplace_uses_partial_index(app, args, index):
+    with app.app_context():
+        statement = _marketplace_query(_parse_marketplace_query(args)).statement
+        indexes = _plan_indexes(statement)
+    assert index in indexes, f"{args}: planned with {indexes or 'no index'}"
@@ -0,0 +1,60 @@
+"""Micro-benchmark of certificate generation, no database needed.
+
+Compares, for the JSON route, building the full payload against the
+metadata-only payload (?fields=), and for PDFs, letting WeasyPrint parse the
+inline stylesheet on every render (the previous behaviour) against reusing
+one pre-parsed stylesheet:
+
+    python -m benchmarks.certificate_benchmark --repeat 200 --pdf-repeat 20
+"""
+import argparse
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+from weasyprint import CSS, HTML
+
+from app.utilis.certificate_generator import (
+    STYLESHEET, certificate_context, generate_certificate_data, render_certificate_html)
+
+USER = SimpleNamespace(id=7, username='acme_corp')
+CREDIT = SimpleNamespace(id=42, name='Mangrove Restoration', amount=500, price=0.25)
+PURCHASE = SimpleNamespace(id=3, amount=500, purchase_date=datetime(2025, 3, 14))
+TRANSACTION = SimpleNamespace(txn_hash='0x' + 'ab' * 32)
+METADATA_FIELDS = ['certificate_id', 'buyer_name', 'credit_name', 'amount', 'purchase_date', 'transaction_hash']
+
+
+def throughput(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return repeat / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--pdf-repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    inputs = (PURCHASE.id, USER, PURCHASE, CREDIT, TRANSACTION)
+    context = certificate_context(*inputs)
+    stylesheet = CSS(string=STYLESHEET)
+
+    results = [
+        ("JSON payload, with certificate_html", args.repeat,
+         lambda: generate_certificate_data(*inputs)),
+        ("JSON payload, metadata only (?fields=)", args.repeat,
+         lambda: generate_certificate_data(*inputs, METADATA_FIELDS)),
+        ("PDF, stylesheet parsed per render", args.pdf_repeat,
+         lambda: HTML(string=render_certificate_html(context)).write_pdf()),
+        ("PDF, shared pre-parsed stylesheet", args.pdf_repeat,
+         lambda: HTML(string=render_certificate_html(context, inline_styles=False)).write_pdf(stylesheets=[stylesheet])),
+    ]
+    for label, repeat, fn in results:
+        fn()  # warm up
+        print(f"{label:<42} {throughput(fn, repeat):>10.1f} /s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+import statistics
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from benchmarks.seed import PASSWORD
+
+
+def login(client, username, role):
+    response = client.post('/api/login', json={"username": username, "password": PASSWORD, "role": role})
+    assert response.status_code == 200, response.get_json()
+    return {"Authorization": f"Bearer {response.get_json()['access_token']}"}
+
+
+def time_request(client, method, path, headers, repeat):
+    """Issue the request `repeat` times and return the latencies in ms."""
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.open(path, method=method, headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code < 400, (path, response.status_code)
+    return latencies
+
+
+def percentile(latencies, pct):
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize(latencies):
+    return {
+        "mean": statistics.fmean(latencies),
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+    }
+
+
+@contextmanager
+def count_statements(engine):
+    """Count the SQL statements `engine` executes inside the block."""
+    counter = {"statements": 0}
+
+    def after_cursor_execute(*_):
+        counter["statements"] += 1
+
+    event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, 'after_cursor_execute', after_cursor_execute)
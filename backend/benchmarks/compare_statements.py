@@ -0,0 +1,57 @@
+"""Fail when an API benchmark issues more SQL statements than the baseline.
+
+Statement counts are deterministic for a given seed and scale, unlike
+timings on shared CI runners, so they are what a pull request is gated on:
+
+    python -m benchmarks.compare_statements bench.json --baseline .benchmarks
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+
+
+def _statements(path):
+    with open(path) as f:
+        report = json.load(f)
+    return {bench["fullname"]: bench["extra_info"]["sql_statements"]
+            for bench in report["benchmarks"] if "sql_statements" in bench["extra_info"]}
+
+
+def latest_run(directory):
+    """The newest run pytest-benchmark autosaved under `directory`, or None."""
+    # Saved as <machine>/<counter>_<commit>_<date>.json; the counter orders runs
+    runs = glob.glob(os.path.join(directory, '*', '*.json'))
+    return max(runs, key=lambda path: os.path.basename(path)) if runs else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('current', help="--benchmark-json output of this run")
+    parser.add_argument('--baseline', default='.benchmarks', help="pytest-benchmark storage directory")
+    args = parser.parse_args()
+
+    baseline_path = latest_run(args.baseline)
+    if baseline_path is None:
+        print(f"No baseline in {args.baseline}; nothing to compare")
+        return 0
+    baseline, current = _statements(baseline_path), _statements(args.current)
+
+    regressions = 0
+    print(f"{'benchmark':<60} {'baseline':>9} {'current':>8}")
+    for name, count in sorted(current.items()):
+        before = baseline.get(name)
+        flag = ''
+        if before is not None and count > before:
+            regressions += 1
+            flag = '  MORE STATEMENTS'
+        print(f"{name:<60} {before if before is not None else '-':>9} {count:>8}{flag}")
+    if regressions:
+        print(f"{regressions} benchmark(s) issue more SQL statements than {baseline_path}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
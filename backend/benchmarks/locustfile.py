@@ -0,0 +1,163 @@
+"""Mixed-role load on a running server, with Locust.
+
+Buyers, NGOs and auditors log in as seeded users (benchmarks.seed) and
+browse and trade in roughly production proportions. Start the server with
+rate limiting off and SERVER_TIMING=1 so SQL statements per request can be
+read from the Server-Timing header:
+
+    python -m benchmarks.seed --credits 20000
+    SERVER_TIMING=1 LOGIN_RATE_LIMIT=0 gunicorn -c gunicorn.conf.py wsgi:app &
+    locust -f benchmarks/locustfile.py --host http://127.0.0.1:8000 \\
+        --headless -u 50 -r 10 -t 2m --csv bench
+
+Locust reports throughput and p50/p95/p99 per endpoint; the mean SQL
+statements per endpoint are printed when the run ends. BENCH_NGOS,
+BENCH_BUYERS and BENCH_AUDITORS must match the seeded scale.
+"""
+import itertools
+import os
+import random
+import re
+from collections import defaultdict
+
+from locust import HttpUser, between, events, task
+
+# Kept free of app imports so the load generator can run on another host;
+# the defaults are benchmarks.seed's
+PASSWORD = os.getenv('BENCH_PASSWORD', 'benchmark')
+NGOS = int(os.getenv('BENCH_NGOS', 50))
+BUYERS = int(os.getenv('BENCH_BUYERS', 500))
+AUDITORS = int(os.getenv('BENCH_AUDITORS', 100))
+# Far above seeded ids, so credits registered during the run never collide
+_credit_ids = itertools.count(10_000_000 + random.randrange(10_000_000))
+_user_numbers = defaultdict(lambda: itertools.count(random.randrange(1000)))
+_statements = defaultdict(list)
+_SERVER_TIMING_QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+@events.request.add_listener
+def _record_statements(name, response, exception, **_):
+    if exception is None and response is not None:
+        match = _SERVER_TIMING_QUERIES.search(response.headers.get('Server-Timing', ''))
+        if match:
+            _statements[name].append(int(match.group(1)))
+
+
+@events.quitting.add_listener
+def _print_statements(environment, **_):
+    if not _statements:
+        print("No Server-Timing headers seen; start the server with SERVER_TIMING=1")
+        return
+    print(f"{'endpoint':<42} {'SQL/request':>12}")
+    for name, counts in sorted(_statements.items()):
+        print(f"{name:<42} {sum(counts) / len(counts):>12.1f}")
+
+
+class RoleUser(HttpUser):
+    abstract = True
+    wait_time = between(0.5, 2)
+    role = None
+    prefix = None
+    count = 0
+
+    def on_start(self):
+        # Round-robin over the seeded users so concurrent users rarely share one
+        self.username = f"{self.prefix}_{next(_user_numbers[self.role]) % self.count}"
+        response = self.client.post('/api/login', name='/api/login',
+                                    json={"username": self.username, "password": PASSWORD, "role": self.role})
+        response.raise_for_status()
+        self.client.headers['Authorization'] = f"Bearer {response.json()['access_token']}"
+
+
+class Buyer(RoleUser):
+    weight = 7
+    role, prefix, count = 'buyer', 'buyer', BUYERS
+
+    @task(6)
+    def browse(self):
+        query = random.choice(['', '?sort=-price', '?sort=amount&min_amount=500', '?q=project%201'])
+        page = self.client.get(f"/api/buyer/credits{query}", name='/api/buyer/credits').json()
+        if page["credits"] and random.random() < 0.5:
+            credit = random.choice(page["credits"])
+            self.client.get(f"/api/buyer/credits/{credit['id']}", name='/api/buyer/credits/[id]')
+        if page["next_cursor"] and random.random() < 0.3:
+            self.client.get(f"/api/buyer/credits?cursor={page['next_cursor']}",
+                            name='/api/buyer/credits?cursor')
+
+    @task(3)
+    def portfolio(self):
+        self.client.get('/api/buyer/purchased')
+
+    @task(1)
+    def purchase(self):
+        page = self.client.get('/api/buyer/credits?limit=20', name='/api/buyer/credits').json()
+        if page["credits"]:
+            credit = random.choice(page["credits"])
+            with self.client.post('/api/buyer/purchase', catch_response=True, json={
+                    "credit_id": credit["id"], "txn_hash": f"0x{random.getrandbits(256):064x}"}) as response:
+                # Another user bought the listing first
+                if response.status_code == 409:
+                    response.success()
+
+    @task(1)
+    def relist(self):
+        holdings = [c for c in self.client.get('/api/buyer/purchased').json() if not c["is_expired"]]
+        if not holdings:
+            return
+        credit = random.choice(holdings)
+        if credit["is_active"]:
+            self.client.patch('/api/buyer/remove-from-sale', json={"credit_id": credit["id"]})
+        else:
+            self.client.patch('/api/buyer/sell', json={"credit_id": credit["id"],
+                                                       "salePrice": round(random.uniform(0.1, 5), 2)})
+
+    @task(1)
+    def certificate(self):
+        expired = [c for c in self.client.get('/api/buyer/purchased').json() if c["is_expired"]]
+        if expired:
+            self.client.get(f"/api/buyer/generate-certificate/{random.choice(expired)['id']}",
+                            name='/api/buyer/generate-certificate/[id]')
+
+
+class NGO(RoleUser):
+    weight = 2
+    role, prefix, count = 'NGO', 'ngo', NGOS
+
+    @task(5)
+    def dashboard(self):
+        self.client.get('/api/NGO/credits')
+
+    @task(3)
+    def transactions(self):
+        page = self.client.get('/api/NGO/transactions').json()
+        if page["next_cursor"]:
+            self.client.get(f"/api/NGO/transactions?cursor={page['next_cursor']}",
+                            name='/api/NGO/transactions?cursor')
+
+    @task(1)
+    def register_credit(self):
+        amount = random.randint(1, 2000)
+        if not self.client.get(f"/api/NGO/audit-req?amount={amount}", name='/api/NGO/audit-req').ok:
+            return
+        credit_id = next(_credit_ids)
+        self.client.post('/api/NGO/credits', json={
+            "creditId": credit_id, "name": f"Load {credit_id}", "amount": amount,
+            "price": round(random.uniform(0.01, 5), 4),
+            "secure_url": f"https://example.invalid/docs/{credit_id}.pdf"})
+
+
+class Auditor(RoleUser):
+    weight = 1
+    role, prefix, count = 'auditor', 'auditor', AUDITORS
+
+    @task(3)
+    def queue(self):
+        self.client.get('/api/auditor/credits')
+
+    @task(1)
+    def vote(self):
+        open_credits = self.client.get('/api/auditor/credits').json()
+        if open_credits:
+            credit = random.choice(open_credits)
+            self.client.patch(f"/api/auditor/audit/{credit['id']}", name='/api/auditor/audit/[id]',
+                              json={"vote": random.random() < 0.8})
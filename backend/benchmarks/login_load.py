@@ -0,0 +1,73 @@
+"""Login throughput of a running server under increasing concurrency.
+
+Seed the database the server uses first (benchmarks.seed) and start the
+server with rate limiting off, e.g.:
+
+    LOGIN_RATE_LIMIT=0 gunicorn -c gunicorn.conf.py wsgi:app
+    python -m benchmarks.login_load --url http://127.0.0.1:8000 --concurrency 1,8,32,64
+
+Every seeded buyer shares the password benchmarks.seed.PASSWORD.
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.common import summarize
+from benchmarks.seed import PASSWORD
+
+
+def _worker(url, usernames, deadline):
+    latencies, errors = [], 0
+    session = requests.Session()
+    i = 0
+    while time.perf_counter() < deadline:
+        username = usernames[i % len(usernames)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            response = session.post(f"{url}/api/login", timeout=30,
+                                    json={"username": username, "password": PASSWORD, "role": "buyer"})
+            ok = response.status_code == 200
+        except requests.RequestException:
+            ok = False
+        if ok:
+            latencies.append((time.perf_counter() - start) * 1000)
+        else:
+            errors += 1
+    return latencies, errors
+
+
+def run(url, concurrency, duration, buyers):
+    usernames = [f"buyer_{i}" for i in range(buyers)]
+    deadline = time.perf_counter() + duration
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda n: _worker(url, usernames[n::concurrency] or usernames, deadline),
+                                range(concurrency)))
+    latencies = [ms for worker_latencies, _ in results for ms in worker_latencies]
+    errors = sum(worker_errors for _, worker_errors in results)
+    return latencies, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--concurrency', default='1,8,32,64', help="comma separated client counts")
+    parser.add_argument('--duration', type=float, default=15.0, help="seconds per level")
+    parser.add_argument('--buyers', type=int, default=500, help="seeded buyers to log in as")
+    args = parser.parse_args(argv)
+
+    print(f"{'clients':>8} {'logins/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'errors':>7}")
+    for concurrency in (int(c) for c in args.concurrency.split(',')):
+        latencies, errors = run(args.url.rstrip('/'), concurrency, args.duration, args.buyers)
+        if not latencies:
+            print(f"{concurrency:>8} {'-':>10} {'-':>9} {'-':>9} {errors:>7}")
+            continue
+        stats = summarize(latencies)
+        print(f"{concurrency:>8} {len(latencies) / args.duration:>10.1f} "
+              f"{stats['p50']:>9.1f} {stats['p95']:>9.1f} {errors:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""Requests/sec per endpoint under gunicorn, for several worker layouts.
+
+For every layout in --layouts (workers x threads) a gunicorn server is
+started from gunicorn.conf.py against the seeded database and each endpoint
+is loaded for --duration seconds by --clients concurrent HTTP clients:
+
+    python -m benchmarks.seed --credits 20000
+    python -m benchmarks.serve_load --layouts 1x8,2x8,4x4,4x8 --clients 32
+
+Redis caching stays on, as in production; set REDIS_URL to an unreachable
+address to measure uncached database work instead.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.common import summarize
+from benchmarks.seed import PASSWORD
+
+ENDPOINTS = [
+    ('buyer', 'buyer_0', '/api/buyer/credits'),
+    ('buyer', 'buyer_0', '/api/buyer/credits?sort=-price&limit=20'),
+    ('buyer', 'buyer_0', '/api/buyer/purchased'),
+    ('NGO', 'ngo_0', '/api/NGO/credits'),
+    ('NGO', 'ngo_0', '/api/NGO/transactions'),
+    ('auditor', 'auditor_0', '/api/auditor/credits'),
+    (None, None, '/api/healthz'),
+]
+
+
+def start_server(port, workers, threads):
+    env = dict(os.environ, GUNICORN_BIND=f"127.0.0.1:{port}", GUNICORN_WORKERS=str(workers),
+               GUNICORN_THREADS=str(threads), GUNICORN_ACCESSLOG='', LOGIN_RATE_LIMIT='0')
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+                              env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            if requests.get(f"{url}/api/healthz", timeout=1).ok:
+                return server, url
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"gunicorn {workers}x{threads} did not start")
+
+
+def tokens(url):
+    headers = {}
+    for role, username, _ in ENDPOINTS:
+        if username and username not in headers:
+            response = requests.post(f"{url}/api/login", timeout=30,
+                                     json={"username": username, "password": PASSWORD, "role": role})
+            response.raise_for_status()
+            headers[username] = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return headers
+
+
+def load(url, path, headers, clients, duration):
+    deadline = time.perf_counter() + duration
+
+    def client():
+        session, latencies, errors = requests.Session(), [], 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                ok = session.get(f"{url}{path}", headers=headers, timeout=30).ok
+            except requests.RequestException:
+                ok = False
+            if ok:
+                latencies.append((time.perf_counter() - start) * 1000)
+            else:
+                errors += 1
+        return latencies, errors
+
+    with ThreadPoolExecutor(clients) as pool:
+        results = list(pool.map(lambda _: client(), range(clients)))
+    return [ms for latencies, _ in results for ms in latencies], sum(errors for _, errors in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--layouts', default='1x8,2x8,4x8', help="comma separated WORKERSxTHREADS")
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds per endpoint")
+    parser.add_argument('--port', type=int, default=8099)
+    args = parser.parse_args()
+
+    print(f"{'layout':<8} {'endpoint':<42} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    for layout in args.layouts.split(','):
+        workers, threads = (int(n) for n in layout.split('x'))
+        server, url = start_server(args.port, workers, threads)
+        try:
+            headers = tokens(url)
+            for _, username, path in ENDPOINTS:
+                latencies, errors = load(url, path, headers.get(username, {}), args.clients, args.duration)
+                if not latencies:
+                    print(f"{layout:<8} {path:<42} {'-':>8} {'-':>8} {'-':>8} {errors:>7}")
+                    continue
+                stats = summarize(latencies)
+                print(f"{layout:<8} {path:<42} {len(latencies) / args.duration:>8.1f} "
+                      f"{stats['p50']:>8.1f} {stats['p95']:>8.1f} {errors:>7}")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""Local stand-in for the Turnstile siteverify endpoint.
+
+Answers every POST with {"success": true} after an optional delay, so signup
+can be load tested without calling Cloudflare:
+
+    python -m benchmarks.turnstile_stub --port 8787 --delay 0.05
+    TURNSTILE_VERIFY_URL=http://127.0.0.1:8787/ flask run
+"""
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_handler(delay):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            if delay:
+                time.sleep(delay)
+            body = json.dumps({"success": True}).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8787)
+    parser.add_argument('--delay', type=float, default=0.0, help="seconds to wait before answering")
+    args = parser.parse_args()
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), make_handler(args.delay))
+    print(f"Turnstile stub listening on http://127.0.0.1:{args.port}/")
+    server.serve_forever()
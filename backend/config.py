@@ -1,5 +1,6 @@
 from datetime import timedelta
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -13,6 +14,11 @@ class Config:
     SQLALCHEMY_ENGINE_OPTIONS = {
         "pool_recycle": 240,  # Recycle connections before Neon shuts down
         "pool_pre_ping": True,  # Check connection status before queries
+        # Per worker process: keep pool_size + max_overflow at least at the
+        # gunicorn thread count, and workers * that under the server's limit
+        "pool_size": int(os.getenv('DB_POOL_SIZE', 8)),
+        "max_overflow": int(os.getenv('DB_MAX_OVERFLOW', 4)),
+        "pool_timeout": float(os.getenv('DB_POOL_TIMEOUT', 10)),
     }
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = 'your-secret-key'
@@ -20,3 +26,75 @@ class Config:
     REDIS_URL = os.getenv('REDIS_URL',
                           'redis://localhost:6379'
     )
+    # Safety net for cached payloads; entries are normally invalidated on write
+    CACHE_DEFAULT_TTL = int(os.getenv('CACHE_DEFAULT_TTL', 300))
+    # Rendered certificate PDFs, named by the hash of their contents
+    CERTIFICATE_CACHE_DIR = os.getenv('CERTIFICATE_CACHE_DIR',
+                                      os.path.join(tempfile.gettempdir(), 'carbon_credit_certificates'))
+    # Size cap of that directory; the least recently served PDFs are deleted
+    # first, at most once per sweep interval per worker. 0 disables the cap
+    CERTIFICATE_CACHE_MAX_MB = int(os.getenv('CERTIFICATE_CACHE_MAX_MB', 512))
+    CERTIFICATE_CACHE_SWEEP_INTERVAL = float(os.getenv('CERTIFICATE_CACHE_SWEEP_INTERVAL', 60))
+    CERTIFICATE_RENDER_WORKERS = int(os.getenv('CERTIFICATE_RENDER_WORKERS', 2))
+    # Seconds a download waits for a fresh render before answering 202
+    CERTIFICATE_RENDER_WAIT = float(os.getenv('CERTIFICATE_RENDER_WAIT', 0))
+    CERTIFICATE_EXPORT_MAX = int(os.getenv('CERTIFICATE_EXPORT_MAX', 500))
+    # Seconds before a worker reloads auditor workloads from the database
+    AUDITOR_POOL_TTL = float(os.getenv('AUDITOR_POOL_TTL', 60))
+    # Credits per POST /api/NGO/credits/bulk
+    BULK_CREDITS_MAX = int(os.getenv('BULK_CREDITS_MAX', 1000))
+    # username -> id lookups for tokens that predate the user_id claim
+    IDENTITY_CACHE_SIZE = int(os.getenv('IDENTITY_CACHE_SIZE', 1024))
+    IDENTITY_CACHE_TTL = int(os.getenv('IDENTITY_CACHE_TTL', 300))
+    # Password hashing runs in a process pool; 0 workers hashes inline
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    # Each gunicorn worker starts its own pool, so by default the host's cores
+    # are split between them (GUNICORN_WORKERS as in gunicorn.conf.py)
+    BCRYPT_POOL_WORKERS = int(os.getenv('BCRYPT_POOL_WORKERS', max(
+        1, (os.cpu_count() or 2) // int(os.getenv('GUNICORN_WORKERS', (os.cpu_count() or 1) + 1)))))
+    BCRYPT_MAX_QUEUED = int(os.getenv('BCRYPT_MAX_QUEUED', 32))
+    BCRYPT_QUEUE_TIMEOUT = float(os.getenv('BCRYPT_QUEUE_TIMEOUT', 2))
+    TURNSTILE_SECRET_KEY = os.getenv('SECRET_KEY', '1x0000000000000000000000000000000AA')
+    TURNSTILE_VERIFY_URL = os.getenv('TURNSTILE_VERIFY_URL',
+                                     'https://challenges.cloudflare.com/turnstile/v0/siteverify')
+    CAPTCHA_TIMEOUT = float(os.getenv('CAPTCHA_TIMEOUT', 5))
+    CAPTCHA_POOL_SIZE = int(os.getenv('CAPTCHA_POOL_SIZE', 10))
+    # Reverse proxies / load balancers in front of the app whose
+    # X-Forwarded-For and X-Forwarded-Proto are trusted. The client IP (rate
+    # limits, CAPTCHA) is taken that many hops back. Set it when deployed
+    # behind a proxy; left at 0 with clients connecting directly, or anyone
+    # could pick their own IP
+    TRUSTED_PROXY_HOPS = int(os.getenv('TRUSTED_PROXY_HOPS', 0))
+    # Per client IP, per RATE_LIMIT_WINDOW seconds; 0 disables
+    RATE_LIMIT_WINDOW = int(os.getenv('RATE_LIMIT_WINDOW', 60))
+    LOGIN_RATE_LIMIT = int(os.getenv('LOGIN_RATE_LIMIT', 10))
+    SIGNUP_RATE_LIMIT = int(os.getenv('SIGNUP_RATE_LIMIT', 5))
+    # Server-Sent Events: seconds between keep-alive comments, and how many
+    # undelivered events a slow client may have before it is told to resync
+    EVENT_STREAM_HEARTBEAT = float(os.getenv('EVENT_STREAM_HEARTBEAT', 15))
+    EVENT_QUEUE_SIZE = int(os.getenv('EVENT_QUEUE_SIZE', 100))
+    # Under gthread every open stream holds a worker thread. Streams beyond
+    # this many per worker get 503, so half the threads (GUNICORN_THREADS as
+    # in gunicorn.conf.py) stay free for the API; 0 lifts the cap (gevent).
+    # A stream is closed after EVENT_STREAM_MAX_AGE seconds and the client
+    # reconnects, which spreads long-lived clients across workers
+    EVENT_STREAM_MAX_PER_WORKER = int(os.getenv('EVENT_STREAM_MAX_PER_WORKER',
+                                                max(1, int(os.getenv('GUNICORN_THREADS', 8)) // 2)))
+    EVENT_STREAM_MAX_AGE = float(os.getenv('EVENT_STREAM_MAX_AGE', 300))
+    # Chain indexer (flask index-chain); start at the contract's deployment block
+    CHAIN_RPC_URL = os.getenv('CHAIN_RPC_URL', 'http://127.0.0.1:8545')
+    CHAIN_CONTRACT_ADDRESS = os.getenv('CHAIN_CONTRACT_ADDRESS', '')
+    CHAIN_START_BLOCK = int(os.getenv('CHAIN_START_BLOCK', 0))
+    CHAIN_BATCH_SIZE = int(os.getenv('CHAIN_BATCH_SIZE', 100))
+    # Block hashes kept for reorg detection; a deeper reorg stops the indexer
+    CHAIN_REORG_DEPTH = int(os.getenv('CHAIN_REORG_DEPTH', 64))
+    CHAIN_POLL_INTERVAL = float(os.getenv('CHAIN_POLL_INTERVAL', 3))
+    CHAIN_RPC_TIMEOUT = float(os.getenv('CHAIN_RPC_TIMEOUT', 10))
+    # Add Server-Timing headers (app, db and cache time) to every response
+    SERVER_TIMING = os.getenv('SERVER_TIMING', '0') == '1'
+    # /api/readyz: seconds a probe result is reused, the share of the DB pool
+    # (size + overflow) in use at which the worker reports itself degraded, and
+    # whether a Redis outage does too (the app falls back to running without it)
+    READYZ_CACHE_TTL = float(os.getenv('READYZ_CACHE_TTL', 2))
+    READYZ_POOL_SATURATION = float(os.getenv('READYZ_POOL_SATURATION', 1.0))
+    READYZ_REQUIRE_REDIS = os.getenv('READYZ_REQUIRE_REDIS', '0') == '1'
@@ -0,0 +1,52 @@
+"""Production serving profile: gunicorn -c gunicorn.conf.py wsgi:app
+
+Every setting can be overridden through the environment. Apply migrations
+(flask db upgrade) before starting; the app no longer creates tables at boot.
+"""
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+
+# gthread: a few processes, each serving requests from a thread pool. Most
+# handlers wait on Postgres or Redis, and bcrypt and PDF rendering already run
+# in their own process pools, so threads rather than more processes absorb
+# concurrency. Every open /api/stream/marketplace client holds one thread, so
+# streams are capped at EVENT_STREAM_MAX_PER_WORKER (half the threads by
+# default) and answered 503 beyond that. For many concurrent streams, run
+# gevent (pip install gevent) with EVENT_STREAM_MAX_PER_WORKER=0.
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+# Import the app once in the master so workers fork with it loaded
+preload_app = True
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+# Recycle workers now and then so slow leaks cannot build up
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 5000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 500))
+
+accesslog = os.getenv('GUNICORN_ACCESSLOG', '-')
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOGLEVEL', 'info')
+
+
+def child_exit(server, worker):
+    # Drop the exited worker's live samples from the aggregated /api/metrics
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def post_fork(server, worker):
+    # Connections opened in the master must not be shared with the workers
+    from app import db
+    from wsgi import app
+
+    with app.app_context():
+        db.engine.dispose(close=False)
@@ -0,0 +1,26 @@
+"""one chain_calls row per credit of a transaction
+
+Revision ID: 1482bcd16113
+Revises: d5e5ba388223
+Create Date: 2026-10-18 18:02:13.774402
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1482bcd16113'
+down_revision = 'd5e5ba388223'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_constraint('chain_calls_txn_hash_key', 'chain_calls', type_='unique')
+    op.create_unique_constraint('uq_chain_calls_txn_credit', 'chain_calls', ['txn_hash', 'credit_id'])
+
+
+def downgrade():
+    op.drop_constraint('uq_chain_calls_txn_credit', 'chain_calls', type_='unique')
+    op.create_unique_constraint('chain_calls_txn_hash_key', 'chain_calls', ['txn_hash'])
@@ -0,0 +1,51 @@
+"""unique transactions.txn_hash
+
+Revision ID: 199d27e7786d
+Revises: 672901035fb4
+Create Date: 2026-10-18 20:26:53.904127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '199d27e7786d'
+down_revision = '672901035fb4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Retried purchase requests recorded the same on-chain transaction more
+    # than once; keep the first row of each and take the rest out of the
+    # dashboard totals before deleting them
+    op.execute("""
+        CREATE TEMPORARY TABLE duplicate_transactions ON COMMIT DROP AS
+        SELECT t.id, t.buyer_id, t.amount, t.total_price, c.creator_id
+        FROM (SELECT *, row_number() OVER (PARTITION BY lower(trim(txn_hash)) ORDER BY id) AS copy
+              FROM transactions) t
+        JOIN credits c ON c.id = t.credit_id
+        WHERE t.copy > 1
+    """)
+    op.execute("""
+        UPDATE ngo_stats s
+        SET sales = s.sales - d.sales, tons_sold = s.tons_sold - d.tons, revenue = s.revenue - d.revenue
+        FROM (SELECT creator_id, count(*) AS sales, sum(amount) AS tons, sum(total_price) AS revenue
+              FROM duplicate_transactions GROUP BY creator_id) d
+        WHERE s.ngo_id = d.creator_id
+    """)
+    op.execute("""
+        UPDATE buyer_stats s
+        SET purchases = s.purchases - d.purchases, spent = s.spent - d.spent
+        FROM (SELECT buyer_id, count(*) AS purchases, sum(total_price) AS spent
+              FROM duplicate_transactions GROUP BY buyer_id) d
+        WHERE s.buyer_id = d.buyer_id
+    """)
+    op.execute("DELETE FROM transactions WHERE id IN (SELECT id FROM duplicate_transactions)")
+    op.execute("UPDATE transactions SET txn_hash = lower(trim(txn_hash)) WHERE txn_hash <> lower(trim(txn_hash))")
+    op.create_unique_constraint('transactions_txn_hash_key', 'transactions', ['txn_hash'])
+
+
+def downgrade():
+    op.drop_constraint('transactions_txn_hash_key', 'transactions', type_='unique')
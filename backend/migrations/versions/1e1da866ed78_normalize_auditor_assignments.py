@@ -0,0 +1,68 @@
+"""track auditor assignments in auditor_association
+
+Revision ID: 1e1da866ed78
+Revises: 3086cbe16ebd
+Create Date: 2026-10-18 13:05:52.640118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '1e1da866ed78'
+down_revision = '3086cbe16ebd'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('auditor_association', sa.Column('vote', sa.Boolean(), nullable=True))
+    op.add_column('auditor_association', sa.Column('assigned_at', sa.DateTime(), server_default=sa.func.now(), nullable=False))
+    op.add_column('auditor_association', sa.Column('voted_at', sa.DateTime(), nullable=True))
+
+    # credits.auditors holds every assigned auditor, requests.auditors only
+    # those who have not voted yet. Which way a past vote went was never
+    # stored, so backfilled votes keep vote = NULL.
+    op.execute("""
+        INSERT INTO auditor_association (credit_id, auditor_id, assigned_at, voted_at)
+        SELECT c.id, a.auditor_id, now(),
+               CASE WHEN r.auditors @> ARRAY[a.auditor_id] THEN NULL ELSE now() END
+        FROM credits c
+        CROSS JOIN LATERAL unnest(c.auditors) AS a(auditor_id)
+        LEFT JOIN requests r ON r.credit_id = c.id
+        ON CONFLICT (credit_id, auditor_id) DO NOTHING
+    """)
+    op.alter_column('auditor_association', 'assigned_at', server_default=None)
+    op.create_index('ix_auditor_association_pending', 'auditor_association', ['auditor_id'], unique=False, postgresql_where=sa.text('voted_at IS NULL'))
+
+    # Dropping the columns also drops their GIN indexes
+    op.drop_column('requests', 'auditors')
+    op.drop_column('credits', 'auditors')
+
+
+def downgrade():
+    op.add_column('credits', sa.Column('auditors', postgresql.ARRAY(sa.INTEGER()), nullable=True))
+    op.add_column('requests', sa.Column('auditors', postgresql.ARRAY(sa.Integer()), nullable=True))
+    op.execute("""
+        UPDATE credits c SET auditors = a.ids
+        FROM (SELECT credit_id, array_agg(auditor_id ORDER BY assigned_at, auditor_id) AS ids
+              FROM auditor_association GROUP BY credit_id) a
+        WHERE a.credit_id = c.id
+    """)
+    op.execute("""
+        UPDATE requests r SET auditors = coalesce(
+            (SELECT array_agg(auditor_id ORDER BY assigned_at, auditor_id)
+             FROM auditor_association a
+             WHERE a.credit_id = r.credit_id AND a.voted_at IS NULL),
+            ARRAY[]::integer[])
+    """)
+    op.create_index('ix_credits_auditors', 'credits', ['auditors'], unique=False, postgresql_using='gin')
+    op.create_index('ix_requests_auditors', 'requests', ['auditors'], unique=False, postgresql_using='gin')
+
+    op.drop_index('ix_auditor_association_pending', table_name='auditor_association')
+    op.execute('DELETE FROM auditor_association')
+    op.drop_column('auditor_association', 'voted_at')
+    op.drop_column('auditor_association', 'assigned_at')
+    op.drop_column('auditor_association', 'vote')
@@ -0,0 +1,38 @@
+"""indexes for hot lookup columns
+
+Revision ID: 3086cbe16ebd
+Revises: 9c8c8c742ee6
+Create Date: 2026-10-18 11:40:05.218764
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3086cbe16ebd'
+down_revision = '9c8c8c742ee6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_credits_creator_id', 'credits', ['creator_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_credits_active', 'credits', ['id'], unique=False, postgresql_where=sa.text('is_active'), if_not_exists=True)
+    op.create_index('ix_credits_auditors', 'credits', ['auditors'], unique=False, postgresql_using='gin', if_not_exists=True)
+    op.create_index('ix_requests_credit_id', 'requests', ['credit_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_requests_auditors', 'requests', ['auditors'], unique=False, postgresql_using='gin', if_not_exists=True)
+    op.create_index('ix_purchased_credits_credit_id', 'purchased_credits', ['credit_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_purchased_credits_user_id', 'purchased_credits', ['user_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_transactions_credit_id', 'transactions', ['credit_id'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_transactions_credit_id', table_name='transactions', if_exists=True)
+    op.drop_index('ix_purchased_credits_user_id', table_name='purchased_credits', if_exists=True)
+    op.drop_index('ix_purchased_credits_credit_id', table_name='purchased_credits', if_exists=True)
+    op.drop_index('ix_requests_auditors', table_name='requests', if_exists=True)
+    op.drop_index('ix_requests_credit_id', table_name='requests', if_exists=True)
+    op.drop_index('ix_credits_auditors', table_name='credits', if_exists=True)
+    op.drop_index('ix_credits_active', table_name='credits', if_exists=True)
+    op.drop_index('ix_credits_creator_id', table_name='credits', if_exists=True)
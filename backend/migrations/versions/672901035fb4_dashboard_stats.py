@@ -0,0 +1,84 @@
+"""incrementally maintained dashboard totals
+
+Revision ID: 672901035fb4
+Revises: 1482bcd16113
+Create Date: 2026-10-18 19:41:08.215734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '672901035fb4'
+down_revision = '1482bcd16113'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('ngo_stats',
+        sa.Column('ngo_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('credits_issued', sa.Integer(), nullable=False),
+        sa.Column('tons_issued', sa.BigInteger(), nullable=False),
+        sa.Column('pending_audits', sa.Integer(), nullable=False),
+        sa.Column('sales', sa.Integer(), nullable=False),
+        sa.Column('tons_sold', sa.BigInteger(), nullable=False),
+        sa.Column('revenue', sa.Float(), nullable=False),
+        sa.Column('tons_retired', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['ngo_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('ngo_id')
+    )
+    op.create_table('buyer_stats',
+        sa.Column('buyer_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('purchases', sa.Integer(), nullable=False),
+        sa.Column('spent', sa.Float(), nullable=False),
+        sa.Column('credits_held', sa.Integer(), nullable=False),
+        sa.Column('tons_held', sa.BigInteger(), nullable=False),
+        sa.Column('tons_retired', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['buyer_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('buyer_id')
+    )
+
+    # Backfill from the existing data (same queries as `flask rebuild-stats`)
+    op.execute("""
+        WITH issued AS (
+            SELECT creator_id AS id, count(*) AS credits, sum(amount) AS tons,
+                   count(*) FILTER (WHERE req_status = 1) AS pending,
+                   coalesce(sum(amount) FILTER (WHERE is_expired), 0) AS retired
+            FROM credits GROUP BY creator_id
+        ), sold AS (
+            SELECT c.creator_id AS id, count(*) AS sales, sum(t.amount) AS tons, sum(t.total_price) AS revenue
+            FROM transactions t JOIN credits c ON c.id = t.credit_id GROUP BY c.creator_id
+        )
+        INSERT INTO ngo_stats (ngo_id, credits_issued, tons_issued, pending_audits, sales, tons_sold, revenue,
+                               tons_retired, updated_at)
+        SELECT u.id, coalesce(i.credits, 0), coalesce(i.tons, 0), coalesce(i.pending, 0), coalesce(s.sales, 0),
+               coalesce(s.tons, 0), coalesce(s.revenue, 0), coalesce(i.retired, 0), now()
+        FROM users u LEFT JOIN issued i ON i.id = u.id LEFT JOIN sold s ON s.id = u.id
+        WHERE u.role = 'NGO'
+    """)
+    op.execute("""
+        WITH bought AS (
+            SELECT buyer_id AS id, count(*) AS purchases, sum(total_price) AS spent
+            FROM transactions GROUP BY buyer_id
+        ), held AS (
+            SELECT user_id AS id,
+                   count(*) FILTER (WHERE NOT coalesce(is_expired, false)) AS credits,
+                   coalesce(sum(amount) FILTER (WHERE NOT coalesce(is_expired, false)), 0) AS tons,
+                   coalesce(sum(amount) FILTER (WHERE is_expired), 0) AS retired
+            FROM purchased_credits GROUP BY user_id
+        )
+        INSERT INTO buyer_stats (buyer_id, purchases, spent, credits_held, tons_held, tons_retired, updated_at)
+        SELECT u.id, coalesce(b.purchases, 0), coalesce(b.spent, 0), coalesce(h.credits, 0), coalesce(h.tons, 0),
+               coalesce(h.retired, 0), now()
+        FROM users u LEFT JOIN bought b ON b.id = u.id LEFT JOIN held h ON h.id = u.id
+        WHERE u.role = 'buyer'
+    """)
+
+
+def downgrade():
+    op.drop_table('buyer_stats')
+    op.drop_table('ngo_stats')
@@ -0,0 +1,36 @@
+"""marketplace search column and listing indexes
+
+Revision ID: 6800838821b7
+Revises: 1e1da866ed78
+Create Date: 2026-10-18 15:12:40.905316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '6800838821b7'
+down_revision = '1e1da866ed78'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('credits', sa.Column(
+        'search_vector', postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('simple', coalesce(name, ''))", persisted=True),
+        nullable=True))
+    op.create_index('ix_credits_active_price', 'credits', ['price', 'id'], unique=False, postgresql_where=sa.text('is_active'), if_not_exists=True)
+    op.create_index('ix_credits_active_amount', 'credits', ['amount', 'id'], unique=False, postgresql_where=sa.text('is_active'), if_not_exists=True)
+    op.create_index('ix_credits_active_creator', 'credits', ['creator_id', 'id'], unique=False, postgresql_where=sa.text('is_active'), if_not_exists=True)
+    op.create_index('ix_credits_active_search', 'credits', ['search_vector'], unique=False, postgresql_using='gin', postgresql_where=sa.text('is_active'), if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_credits_active_search', table_name='credits', if_exists=True)
+    op.drop_index('ix_credits_active_creator', table_name='credits', if_exists=True)
+    op.drop_index('ix_credits_active_amount', table_name='credits', if_exists=True)
+    op.drop_index('ix_credits_active_price', table_name='credits', if_exists=True)
+    op.drop_column('credits', 'search_vector')
@@ -0,0 +1,24 @@
+"""composite (timestamp, id) index for the transaction feed
+
+Revision ID: 9c8c8c742ee6
+Revises: b1758a43808f
+Create Date: 2026-10-18 10:14:37.902114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c8c8c742ee6'
+down_revision = 'b1758a43808f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_transactions_timestamp_id', 'transactions', ['timestamp', 'id'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_transactions_timestamp_id', table_name='transactions', if_exists=True)
@@ -0,0 +1,105 @@
+"""initial schema
+
+Revision ID: b1758a43808f
+Revises: 
+Create Date: 2026-10-18 10:02:11.481203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b1758a43808f'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases deployed before migrations existed got these tables from
+    # db.create_all(), so only create what is missing.
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'users' not in existing:
+        op.create_table('users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(length=80), nullable=False),
+        sa.Column('email', sa.String(length=120), nullable=False),
+        sa.Column('password', sa.String(length=255), nullable=False),
+        sa.Column('role', sa.String(length=20), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email'),
+        sa.UniqueConstraint('username')
+        )
+    if 'credits' not in existing:
+        op.create_table('credits',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('amount', sa.Integer(), nullable=False),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('is_expired', sa.Boolean(), nullable=True),
+        sa.Column('creator_id', sa.Integer(), nullable=False),
+        sa.Column('docu_url', sa.String(length=200), nullable=True),
+        sa.Column('auditors', postgresql.ARRAY(sa.INTEGER()), nullable=True),
+        sa.Column('req_status', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['creator_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if 'auditor_association' not in existing:
+        op.create_table('auditor_association',
+        sa.Column('credit_id', sa.Integer(), nullable=False),
+        sa.Column('auditor_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['auditor_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['credit_id'], ['credits.id'], ),
+        sa.PrimaryKeyConstraint('credit_id', 'auditor_id')
+        )
+    if 'requests' not in existing:
+        op.create_table('requests',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('credit_id', sa.Integer(), nullable=False),
+        sa.Column('creator_id', sa.Integer(), nullable=False),
+        sa.Column('auditors', postgresql.ARRAY(sa.Integer()), nullable=True),
+        sa.Column('score', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['creator_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['credit_id'], ['credits.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if 'purchased_credits' not in existing:
+        op.create_table('purchased_credits',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('credit_id', sa.Integer(), nullable=False),
+        sa.Column('amount', sa.Integer(), nullable=False),
+        sa.Column('purchase_date', sa.DateTime(), nullable=False),
+        sa.Column('is_expired', sa.Boolean(), nullable=True),
+        sa.Column('creator_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['creator_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['credit_id'], ['credits.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if 'transactions' not in existing:
+        op.create_table('transactions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('buyer_id', sa.Integer(), nullable=False),
+        sa.Column('credit_id', sa.Integer(), nullable=False),
+        sa.Column('amount', sa.Integer(), nullable=False),
+        sa.Column('total_price', sa.Float(), nullable=False),
+        sa.Column('timestamp', sa.DateTime(), nullable=False),
+        sa.Column('txn_hash', sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(['buyer_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['credit_id'], ['credits.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+
+def downgrade():
+    op.drop_table('transactions')
+    op.drop_table('purchased_credits')
+    op.drop_table('requests')
+    op.drop_table('auditor_association')
+    op.drop_table('credits')
+    op.drop_table('users')
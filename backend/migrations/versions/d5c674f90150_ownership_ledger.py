@@ -0,0 +1,96 @@
+"""purchased_credits becomes an append-only ownership ledger
+
+Revision ID: d5c674f90150
+Revises: 199d27e7786d
+Create Date: 2026-10-18 21:05:37.418806
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5c674f90150'
+down_revision = '199d27e7786d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('purchased_credits', sa.Column('is_current', sa.Boolean(), server_default=sa.true(), nullable=False))
+    op.add_column('purchased_credits', sa.Column('released_at', sa.DateTime(), nullable=True))
+    op.add_column('purchased_credits', sa.Column('transaction_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('purchased_credits_transaction_id_fkey', 'purchased_credits', 'transactions',
+                          ['transaction_id'], ['id'])
+    op.alter_column('purchased_credits', 'is_current', server_default=None)
+
+    # Racing purchases could leave several rows for one credit; the newest
+    # is the owner, the others are released when the next one bought
+    op.execute("""
+        UPDATE purchased_credits pc
+        SET is_current = false, released_at = ranked.next_purchase
+        FROM (SELECT id,
+                     row_number() OVER w AS position,
+                     lag(purchase_date) OVER w AS next_purchase
+              FROM purchased_credits
+              WINDOW w AS (PARTITION BY credit_id ORDER BY purchase_date DESC, id DESC)) ranked
+        WHERE pc.id = ranked.id AND ranked.position > 1
+    """)
+    # buyer_stats counted every row as held (672901035fb4); take the rows just
+    # released back out, the same way REBUILD_BUYER_STATS now counts holdings
+    op.execute("""
+        UPDATE buyer_stats bs
+        SET credits_held = bs.credits_held - released.credits,
+            tons_held = bs.tons_held - released.tons,
+            tons_retired = bs.tons_retired - released.retired,
+            updated_at = now()
+        FROM (SELECT user_id,
+                     count(*) FILTER (WHERE NOT coalesce(is_expired, false)) AS credits,
+                     coalesce(sum(amount) FILTER (WHERE NOT coalesce(is_expired, false)), 0) AS tons,
+                     coalesce(sum(amount) FILTER (WHERE is_expired), 0) AS retired
+              FROM purchased_credits WHERE NOT is_current GROUP BY user_id) released
+        WHERE bs.buyer_id = released.user_id
+    """)
+    # Link each row to the buyer's transaction for it: the latest one no later
+    # than the row itself (both were stamped with utcnow() in the same request)
+    op.execute("""
+        UPDATE purchased_credits pc
+        SET transaction_id = (SELECT t.id FROM transactions t
+                              WHERE t.credit_id = pc.credit_id AND t.buyer_id = pc.user_id
+                                AND t.timestamp <= pc.purchase_date + interval '1 minute'
+                              ORDER BY t.timestamp DESC, t.id DESC LIMIT 1)
+    """)
+    # Earlier owners were deleted on resale; rebuild them from the
+    # transactions no ledger row accounts for
+    op.execute("""
+        INSERT INTO purchased_credits (user_id, credit_id, amount, purchase_date, is_expired, creator_id,
+                                       is_current, released_at, transaction_id)
+        SELECT t.buyer_id, t.credit_id, t.amount, t.timestamp, false, c.creator_id,
+               false, t.next_purchase, t.id
+        FROM (SELECT *, lead(timestamp) OVER (PARTITION BY credit_id ORDER BY timestamp, id) AS next_purchase
+              FROM transactions) t
+        JOIN credits c ON c.id = t.credit_id
+        WHERE NOT EXISTS (SELECT 1 FROM purchased_credits pc WHERE pc.transaction_id = t.id)
+    """)
+
+    op.drop_index('ix_purchased_credits_credit_id', table_name='purchased_credits', if_exists=True)
+    op.drop_index('ix_purchased_credits_user_id', table_name='purchased_credits', if_exists=True)
+    op.create_index('ix_purchased_credits_current', 'purchased_credits', ['credit_id'], unique=True,
+                    postgresql_where=sa.text('is_current'))
+    op.create_index('ix_purchased_credits_holdings', 'purchased_credits', ['user_id'], unique=False,
+                    postgresql_where=sa.text('is_current'))
+    op.create_index('ix_purchased_credits_history', 'purchased_credits', ['credit_id', 'purchase_date'],
+                    unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_purchased_credits_history', table_name='purchased_credits')
+    op.drop_index('ix_purchased_credits_holdings', table_name='purchased_credits')
+    op.drop_index('ix_purchased_credits_current', table_name='purchased_credits')
+    op.execute("DELETE FROM purchased_credits WHERE NOT is_current")
+    op.create_index('ix_purchased_credits_user_id', 'purchased_credits', ['user_id'], unique=False)
+    op.create_index('ix_purchased_credits_credit_id', 'purchased_credits', ['credit_id'], unique=False)
+    op.drop_constraint('purchased_credits_transaction_id_fkey', 'purchased_credits', type_='foreignkey')
+    op.drop_column('purchased_credits', 'transaction_id')
+    op.drop_column('purchased_credits', 'released_at')
+    op.drop_column('purchased_credits', 'is_current')
@@ -0,0 +1,74 @@
+"""tables for the chain indexer
+
+Revision ID: d5e5ba388223
+Revises: 6800838821b7
+Create Date: 2026-10-18 16:47:21.530118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5e5ba388223'
+down_revision = '6800838821b7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('chain_checkpoints',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('block_number', sa.BigInteger(), nullable=False),
+        sa.Column('next_credit_id', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.create_table('chain_blocks',
+        sa.Column('number', sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column('hash', sa.String(length=66), nullable=False),
+        sa.Column('parent_hash', sa.String(length=66), nullable=False),
+        sa.PrimaryKeyConstraint('number')
+    )
+    op.create_table('chain_calls',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('block_number', sa.BigInteger(), nullable=False),
+        sa.Column('tx_index', sa.Integer(), nullable=False),
+        sa.Column('txn_hash', sa.String(length=66), nullable=False),
+        sa.Column('method', sa.String(length=32), nullable=False),
+        sa.Column('credit_id', sa.Integer(), nullable=False),
+        sa.Column('sender', sa.String(length=42), nullable=False),
+        sa.Column('value', sa.Numeric(precision=78, scale=0), nullable=False),
+        sa.Column('args', sa.JSON(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('txn_hash')
+    )
+    op.create_index('ix_chain_calls_block_number', 'chain_calls', ['block_number'], unique=False)
+    op.create_index('ix_chain_calls_credit_order', 'chain_calls', ['credit_id', 'block_number', 'tx_index'], unique=False)
+    op.create_table('chain_credits',
+        sa.Column('credit_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('creator', sa.String(length=42), nullable=False),
+        sa.Column('owner', sa.String(length=42), nullable=False),
+        sa.Column('amount', sa.Numeric(precision=78, scale=0), nullable=False),
+        sa.Column('price', sa.Numeric(precision=78, scale=0), nullable=False),
+        sa.Column('for_sale', sa.Boolean(), nullable=False),
+        sa.Column('expired', sa.Boolean(), nullable=False),
+        sa.Column('request_status', sa.SmallInteger(), nullable=False),
+        sa.Column('num_auditors', sa.Integer(), nullable=False),
+        sa.Column('audit_fees', sa.Numeric(precision=78, scale=0), nullable=False),
+        sa.Column('audit_score', sa.Integer(), nullable=False),
+        sa.Column('auditors', sa.JSON(), nullable=False),
+        sa.Column('updated_block', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('credit_id')
+    )
+    op.add_column('transactions', sa.Column('block_number', sa.BigInteger(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('transactions', 'block_number')
+    op.drop_table('chain_credits')
+    op.drop_index('ix_chain_calls_credit_order', table_name='chain_calls')
+    op.drop_index('ix_chain_calls_block_number', table_name='chain_calls')
+    op.drop_table('chain_calls')
+    op.drop_table('chain_blocks')
+    op.drop_table('chain_checkpoints')
@@ -1,4 +1,6 @@
+import os
 from app import create_app
 app = create_app()
 if __name__  == "__main__":
-    app.run(debug = True)
+    # Development server only; production runs gunicorn -c gunicorn.conf.py wsgi:app
+    app.run(debug = os.getenv('FLASK_DEBUG', '1') == '1')
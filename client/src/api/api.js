@@ -21,20 +21,62 @@ export const login = (credentials) => api.post('/login', credentials);
 export const signup = (userData) => api.post('/signup', userData);
 export const getNGOCredits = () => api.get('/NGO/credits');
 export const createNGOCredit = (creditData) => api.post('/NGO/credits', creditData);
-export const getBuyerCredits = () => api.get('/buyer/credits');
+export const createNGOCreditsBulk = (credits) => api.post('/NGO/credits/bulk', { credits });
+export const getBuyerCredits = (params) => api.get('/buyer/credits', { params });
 export const purchaseCredit = (purchaseData) => api.post('/buyer/purchase', purchaseData);
 export const sellCreditApi = (sellData) => api.patch('/buyer/sell', sellData);
 export const removeSaleCreditApi = (removeData) => api.patch('/buyer/remove-from-sale', removeData);
 export const getPurchasedCredits = () => api.get('/buyer/purchased');
-export const getTransactions = () => api.get('/NGO/transactions');
+export const getTransactions = (params) => api.get('/NGO/transactions', { params });
+export const getNGOSummary = () => api.get('/NGO/summary');
+export const getBuyerSummary = () => api.get('/buyer/summary');
 export const generateCertificate = (creditId) => api.get(`/buyer/generate-certificate/${creditId}`);
-export const downloadCertificate = (creditId) => api.get(`/buyer/download-certificate/${creditId}`);
+export const downloadCertificate = (creditId) => api.get(`/buyer/download-certificate/${creditId}`, { responseType: 'blob' });
 export const expireCreditApi = (expireCreditId) => api.patch(`/NGO/credits/expire/${expireCreditId}`);
 export const verifyBeforeExpire = (verificationData) => api.post(`/NGO/expire-req`, verificationData);
 export const getAssignedCredits = () => api.get('/auditor/credits');
 export const auditCreditApi = (auditData) => api.patch(`/auditor/audit/${auditData["creditId"]}`, auditData);
 export const checkAuditorsNumber = (amount) => api.get(`/NGO/audit-req`, { params: { amount } });
 export const getCreditDetailsAPI = (creditId) => api.get(`/buyer/credits/${creditId}`);
+export const getCreditHistory = (creditId) => api.get(`/buyer/credits/${creditId}/history`);
 export const getHealth = () => api.get('/healthz');
 
+// EventSource cannot send an Authorization header, so the token goes in the query string.
+// The browser retries dropped streams by itself but gives up on an error status such as
+// the 503 a worker answers when its stream slots are full, so reopen after a while and
+// ask listeners to resync, since events may have been missed in between.
+export const openMarketplaceStream = () => {
+  const listeners = [];
+  let source;
+  let timer;
+  let closed = false;
+  const open = (reopened) => {
+    source = new EventSource(`${API_URL}/stream/marketplace?jwt=${encodeURIComponent(localStorage.getItem('token') || '')}`);
+    listeners.forEach(([name, listener]) => source.addEventListener(name, listener));
+    source.onerror = () => {
+      if (!closed && source.readyState === EventSource.CLOSED) {
+        timer = setTimeout(() => open(true), 10000 + Math.random() * 5000);
+      }
+    };
+    if (reopened) {
+      source.onopen = () => {
+        source.onopen = null;
+        listeners.filter(([name]) => name === 'resync').forEach(([, listener]) => listener());
+      };
+    }
+  };
+  open(false);
+  return {
+    addEventListener: (name, listener) => {
+      listeners.push([name, listener]);
+      source.addEventListener(name, listener);
+    },
+    close: () => {
+      closed = true;
+      clearTimeout(timer);
+      source.close();
+    },
+  };
+};
+
 export default api;
@@ -1,5 +1,5 @@
-import React, { useState, useEffect, useContext } from 'react';
-import { getBuyerCredits, purchaseCredit, sellCreditApi, removeSaleCreditApi, getPurchasedCredits, generateCertificate, downloadCertificate } from '../api/api';
+import React, { useState, useEffect, useContext, useRef } from 'react';
+import { getBuyerCredits, purchaseCredit, sellCreditApi, removeSaleCreditApi, getPurchasedCredits, generateCertificate, downloadCertificate, openMarketplaceStream } from '../api/api';
 import { CC_Context } from "../context/SmartContractConnector.js";
 import { ethers } from "ethers";
 import { Eye, EyeOff, Loader2, File, Info, Download, ShoppingCart, XCircle, Tag, DollarSign, AlertCircle } from 'lucide-react';
@@ -35,6 +35,25 @@ const LoadingCredit = () => (
   </li>
 );
 
+// Marketplace order for a `sort` value, tie-broken on id like the server's keyset
+const compareListings = (sort) => {
+  const descending = sort.startsWith('-');
+  const key = descending ? sort.slice(1) : sort;
+  return (a, b) => {
+    const diff = (a[key] - b[key]) || (a.id - b.id);
+    return descending ? -diff : diff;
+  };
+};
+
+// Whether a listing passes the query's filters; name search (q) is matched by
+// Postgres and cannot be checked here
+const matchesFilters = (credit, query) =>
+  (query.min_price === undefined || credit.price >= query.min_price) &&
+  (query.max_price === undefined || credit.price <= query.max_price) &&
+  (query.min_amount === undefined || credit.amount >= query.min_amount) &&
+  (query.max_amount === undefined || credit.amount <= query.max_amount) &&
+  (query.creator === undefined || credit.creator === query.creator);
+
 const BuyerDashboard = () => {
   const [availableCredits, setAvailableCredits] = useState([]);
   const [purchasedCredits, setPurchasedCredits] = useState([]);
@@ -43,6 +62,15 @@ const BuyerDashboard = () => {
   const [showCertificate, setShowCertificate] = useState(true);
   const [isLoading, setIsLoading] = useState(true);
   const [pendingTx, setPendingTx] = useState(null);
+  const [search, setSearch] = useState('');
+  const [sort, setSort] = useState('id');
+  const [nextCursor, setNextCursor] = useState(null);
+  // The query the listing on screen was loaded with, and the latest loader and
+  // cursor; the stream handlers are registered once and read them from here
+  const activeQuery = useRef({ sort: 'id' });
+  const fetchRef = useRef(null);
+  const nextCursorRef = useRef(null);
+  const refetchTimer = useRef(null);
 
   const {
     connectWallet,
@@ -56,11 +84,12 @@ const BuyerDashboard = () => {
     currentAccount
   } = useContext(CC_Context);
 
-  const fetchAllCredits = async () => {
+  const fetchAllCredits = async (query = { q: search || undefined, sort }) => {
     try {
       setIsLoading(true);
+      activeQuery.current = query;
       const [availableResponse, purchasedResponse] = await Promise.all([
-        getBuyerCredits(),
+        getBuyerCredits(query),
         getPurchasedCredits()
       ]);
 
@@ -70,7 +99,8 @@ const BuyerDashboard = () => {
       }));
 
       setPurchasedCredits(creditsWithSalePrice);
-      setAvailableCredits(availableResponse.data);
+      setAvailableCredits(availableResponse.data.credits);
+      setNextCursor(availableResponse.data.next_cursor);
     } catch (error) {
       console.error('Failed to fetch credits:', error?.message);
       setError('Failed to fetch credits. Please try again.');
@@ -79,8 +109,72 @@ const BuyerDashboard = () => {
     }
   };
 
+  fetchRef.current = fetchAllCredits;
+  nextCursorRef.current = nextCursor;
+
   useEffect(() => {
     fetchAllCredits();
+  }, [sort]);
+
+  const handleSearch = (event) => {
+    event.preventDefault();
+    fetchAllCredits();
+  };
+
+  const loadMoreCredits = async () => {
+    try {
+      const response = await getBuyerCredits({ ...activeQuery.current, cursor: nextCursor });
+      setAvailableCredits(credits => {
+        const loaded = new Set(credits.map(credit => credit.id));
+        return [...credits, ...response.data.credits.filter(credit => !loaded.has(credit.id))];
+      });
+      setNextCursor(response.data.next_cursor);
+    } catch (error) {
+      console.error('Failed to fetch credits:', error?.message);
+      setError('Failed to fetch credits. Please try again.');
+    }
+  };
+
+  // Apply marketplace changes pushed by the server instead of polling
+  useEffect(() => {
+    const stream = openMarketplaceStream();
+    const removeListing = (event) => {
+      const { id } = JSON.parse(event.data);
+      setAvailableCredits(credits => credits.filter(credit => credit.id !== id));
+    };
+    // Reload with the active query, once for a burst of events
+    const refetch = () => {
+      clearTimeout(refetchTimer.current);
+      refetchTimer.current = setTimeout(() => fetchRef.current(activeQuery.current), 1000);
+    };
+    stream.addEventListener('credit.listed', (event) => {
+      const listed = JSON.parse(event.data);
+      const query = activeQuery.current;
+      if (query.q) {
+        refetch();
+        return;
+      }
+      setAvailableCredits(credits => {
+        const rest = credits.filter(credit => credit.id !== listed.id);
+        if (!matchesFilters(listed, query)) {
+          return rest;
+        }
+        const compare = compareListings(query.sort);
+        // Past the last loaded row it belongs to a later page, which the cursor still fetches
+        if (nextCursorRef.current && rest.length && compare(listed, rest[rest.length - 1]) > 0) {
+          return rest;
+        }
+        return [...rest, listed].sort(compare);
+      });
+    });
+    stream.addEventListener('credit.delisted', removeListing);
+    stream.addEventListener('credit.purchased', removeListing);
+    stream.addEventListener('credit.expired', removeListing);
+    stream.addEventListener('resync', refetch);
+    return () => {
+      clearTimeout(refetchTimer.current);
+      stream.close();
+    };
   }, []);
 
   const handleBuyCredit = async (creditId) => {
@@ -125,13 +219,24 @@ const BuyerDashboard = () => {
   const handleDownloadCertificate = async (creditId) => {
     try {
       setError(null);
-      const response = await downloadCertificate(creditId);
-      const linksource = `data:application/pdf;base64,${response.data.pdf_base64}`;
+      let response = await downloadCertificate(creditId);
+      // 202 means the PDF is still being rendered on the server
+      for (let attempt = 0; response.status === 202 && attempt < 15; attempt++) {
+        await new Promise((resolve) => setTimeout(resolve, 1000));
+        response = await downloadCertificate(creditId);
+      }
+      if (response.status === 202) {
+        throw new Error('Certificate rendering timed out');
+      }
+      const linksource = URL.createObjectURL(response.data);
       const downloadLink = document.createElement("a");
-      const fileName = response.data.filename;
+      // Same name the JSON endpoint used to return, now sent as Content-Disposition
+      const fileName = response.headers['content-disposition']?.match(/filename="?([^";]+)"?/)?.[1]
+        || `Carbon_Credit_Certificate_${creditId}.pdf`;
       downloadLink.href = linksource;
       downloadLink.download = fileName;
       downloadLink.click();
+      URL.revokeObjectURL(linksource);
     } catch (error) {
       console.error("Failed to download Certificate: ", error);
       setError('Failed to download certificate. Please try again.');
@@ -226,6 +331,33 @@ const BuyerDashboard = () => {
             {/* Available Credits Section */}
             <div className="mb-8">
               <h4 className="text-lg font-medium text-gray-700 mb-4">Available Credits</h4>
+              <form onSubmit={handleSearch} className="flex items-center space-x-2 mb-4">
+                <input
+                  type="text"
+                  value={search}
+                  onChange={(e) => setSearch(e.target.value)}
+                  placeholder="Search by name"
+                  className="flex-1 px-3 py-1 text-sm border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-emerald-300"
+                />
+                <select
+                  value={sort}
+                  onChange={(e) => setSort(e.target.value)}
+                  className="px-3 py-1 text-sm border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-emerald-300"
+                >
+                  <option value="id">Oldest first</option>
+                  <option value="-id">Newest first</option>
+                  <option value="price">Price: low to high</option>
+                  <option value="-price">Price: high to low</option>
+                  <option value="amount">Amount: low to high</option>
+                  <option value="-amount">Amount: high to low</option>
+                </select>
+                <button
+                  type="submit"
+                  className="px-3 py-1 text-sm font-medium text-white bg-emerald-500 rounded-md hover:bg-emerald-600 focus:outline-none focus:ring-2 focus:ring-emerald-300 transition-colors"
+                >
+                  Search
+                </button>
+              </form>
               <ul className="space-y-2">
                 {isLoading ? (
                   <>
@@ -276,6 +408,14 @@ const BuyerDashboard = () => {
                   </li>
                 ))}
               </ul>
+              {!isLoading && nextCursor && (
+                <button
+                  onClick={loadMoreCredits}
+                  className="mt-4 px-3 py-1 text-sm font-medium text-emerald-600 bg-white border border-emerald-300 rounded-md hover:bg-emerald-50 focus:outline-none focus:ring-2 focus:ring-emerald-300 transition-colors"
+                >
+                  Load more
+                </button>
+              )}
             </div>
 
             {/* Purchased Credits Section */}
@@ -1,6 +1,6 @@
 import React, { useEffect, useState, useContext } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
-import { getCreditDetailsAPI } from '../api/api.js';
+import { getCreditDetailsAPI, getCreditHistory } from '../api/api.js';
 import { ethers } from 'ethers';
 import { FaEthereum } from "react-icons/fa6";
 import { CC_Context } from '../context/SmartContractConnector.js';
@@ -24,6 +24,7 @@ const CreditDetails = () => {
   const { getCreditDetails } = useContext(CC_Context);
   const [credit, setCredit] = useState(null);
   const [dbCredit, setDbCredit] = useState(null);
+  const [history, setHistory] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
 
@@ -44,16 +45,23 @@ const CreditDetails = () => {
       try {
         setLoading(true);
 
-        // Fetch from smart contract
-        let contractData = null;
-        try {
-          contractData = await getCreditDetails(creditId);
-        } catch (contractErr) {
-          console.error('Smart contract error:', contractErr);
-          setError('Failed to load blockchain data.');
-        }
+        const [response, historyResponse] = await Promise.all([
+          getCreditDetailsAPI(creditId),
+          getCreditHistory(creditId),
+        ]);
+        setHistory(historyResponse.data);
 
-        const response = await getCreditDetailsAPI(creditId);
+        // Contract state comes from the backend's chain index; only ask the
+        // contract directly when the indexer has not seen this credit yet
+        let contractData = response.data.onchain;
+        if (!contractData) {
+          try {
+            contractData = await getCreditDetails(creditId);
+          } catch (contractErr) {
+            console.error('Smart contract error:', contractErr);
+            setError('Failed to load blockchain data.');
+          }
+        }
 
         setCredit(contractData);
         setDbCredit(response.data);
@@ -209,6 +217,27 @@ const CreditDetails = () => {
             </div>
           </div>
 
+          {/* Ownership history */}
+          {history.length > 0 && (
+            <div className="flex items-start">
+              <div className="p-2 mr-3 bg-emerald-50 rounded-full">
+                <User className="w-5 h-5 text-emerald-500" />
+              </div>
+              <div>
+                <p className="text-sm text-gray-500">Ownership History</p>
+                <ul className="text-xs font-medium md:text-sm">
+                  {history.map(entry => (
+                    <li key={`${entry.owner_id}-${entry.acquired_at}`}>
+                      {entry.owner}: {new Date(entry.acquired_at).toLocaleDateString()}
+                      {' – '}
+                      {entry.released_at ? new Date(entry.released_at).toLocaleDateString() : 'current'}
+                    </li>
+                  ))}
+                </ul>
+              </div>
+            </div>
+          )}
+
           {/* Request Status */}
           <div className="flex items-start">
             <div className="p-2 mr-3 bg-emerald-50 rounded-full">
@@ -1,5 +1,5 @@
-import React, { useState, useEffect } from 'react';
-import { getNGOCredits, getTransactions } from '../../api/api';
+import React, { useState, useEffect, useRef } from 'react';
+import { getNGOCredits, getNGOSummary, getTransactions, openMarketplaceStream } from '../../api/api';
 import CreateCreditForm from './CreateCreditForm';
 import MyCreditsList from './MyCreditsList';
 import RecentTransactionsList from './RecentTransactionsList';
@@ -7,25 +7,47 @@ import RecentTransactionsList from './RecentTransactionsList';
 const NGODashboard = () => {
   const [myCredits, setMyCredits] = useState([]);
   const [transactions, setTransactions] = useState([]);
+  const [summary, setSummary] = useState(null);
   const [isLoading, setIsLoading] = useState(true);
   const [activeTab, setActiveTab] = useState('create');
 
+  const myCreditIds = useRef(new Set());
+
+  const fetchData = async () => {
+    try {
+      const [creditsResponse, transactionsResponse, summaryResponse] = await Promise.all([
+        getNGOCredits(),
+        getTransactions(),
+        getNGOSummary(),
+      ]);
+      setMyCredits(creditsResponse.data);
+      myCreditIds.current = new Set(creditsResponse.data.map(credit => credit.id));
+      setTransactions(transactionsResponse.data.transactions);
+      setSummary(summaryResponse.data);
+    } catch (error) {
+      console.error('Failed to fetch data:', error);
+    } finally {
+      setIsLoading(false);
+    }
+  };
+
+  useEffect(() => {
+    fetchData();
+  }, []);
+
+  // Refresh only when the server reports a change to one of our credits
   useEffect(() => {
-    const fetchData = async () => {
-      try {
-        const [creditsResponse, transactionsResponse] = await Promise.all([
-          getNGOCredits(),
-          getTransactions(),
-        ]);
-        setMyCredits(creditsResponse.data);
-        setTransactions(transactionsResponse.data);
-      } catch (error) {
-        console.error('Failed to fetch data:', error);
-      } finally {
-        setIsLoading(false);
+    const stream = openMarketplaceStream();
+    const refreshIfMine = (event) => {
+      const { id } = JSON.parse(event.data);
+      if (myCreditIds.current.has(id)) {
+        fetchData();
       }
     };
-    fetchData();
+    ['credit.listed', 'credit.delisted', 'credit.purchased', 'credit.audited', 'credit.expired']
+      .forEach(name => stream.addEventListener(name, refreshIfMine));
+    stream.addEventListener('resync', () => fetchData());
+    return () => stream.close();
   }, []);
 
   return (
@@ -37,6 +59,24 @@ const NGODashboard = () => {
           <p className="mt-1 text-sm text-gray-500">Manage your carbon credits with ease</p>
         </div>
 
+        {/* Totals */}
+        {summary && (
+          <div className="mb-8 grid grid-cols-2 gap-4 sm:grid-cols-5">
+            {[
+              ['Tons issued', summary.tons_issued],
+              ['Tons sold', summary.tons_sold],
+              ['Revenue', summary.revenue.toFixed(4)],
+              ['Tons retired', summary.tons_retired],
+              ['Pending audits', summary.pending_audits],
+            ].map(([label, value]) => (
+              <div key={label} className="bg-white rounded-xl shadow-sm p-4">
+                <p className="text-xs text-gray-500">{label}</p>
+                <p className="mt-1 text-xl font-semibold text-gray-800">{value}</p>
+              </div>
+            ))}
+          </div>
+        )}
+
         {/* Card Container */}
         <div className="bg-white rounded-xl shadow-sm overflow-hidden">
           {/* Tab Navigation */}
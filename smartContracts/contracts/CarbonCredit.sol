@@ -18,6 +18,30 @@ contract CarbonCredit {
         mapping(address => bool) AuditInfo;
     }
 
+    // Copy of Credit without the mapping, so it can be returned from a view
+    struct CreditView {
+        uint256 id;
+        uint256 amount;
+        address creator;
+        address owner;
+        bool expired;
+        uint256 price;
+        bool forSale;
+        uint8 requestStatus;
+        uint numOfAuditors;
+        uint auditFees;
+        int auditScore;
+        uint numOfVotes;
+    }
+
+    event CreditGenerated(uint256 indexed creditId, address indexed creator, uint256 amount, uint256 price);
+    event Listed(uint256 indexed creditId, address indexed owner, uint256 price);
+    event Delisted(uint256 indexed creditId, address indexed owner);
+    event Sold(uint256 indexed creditId, address indexed seller, address indexed buyer, uint256 price);
+    event AuditRequested(uint256 indexed creditId, uint256 fees);
+    event Audited(uint256 indexed creditId, address indexed auditor, bool vote, int256 auditScore, uint8 requestStatus);
+    event Expired(uint256 indexed creditId, address indexed creator);
+
     error CreditNotForSale();
     error PriceNotMet();
     error OnlyOwnerCanSell();
@@ -31,13 +55,35 @@ contract CarbonCredit {
     error CreatorCantAudit();
     error FeeTransactionFailed();
     error CreditFailedAudit();
+    error LengthMismatch();
 
     mapping(uint256 => Credit) public credits;
+    // creditId => auditor => voted; O(1) duplicate-vote check
+    mapping(uint256 => mapping(address => bool)) public hasAudited;
     uint256 nextCreditId;
 
     // Generate a new carbon credit
     function generateCredit(uint256 amount, uint256 price) external {
-        Credit storage newCredit = credits[nextCreditId]; 
+        _generateCredit(nextCreditId, amount, price);
+        nextCreditId++;
+    }
+
+    // Generate several credits in one transaction; ids are consecutive from
+    // the returned one
+    function generateCredits(uint256[] calldata amounts, uint256[] calldata prices) external returns (uint256 firstId) {
+        if (amounts.length != prices.length) {
+            revert LengthMismatch();
+        }
+        firstId = nextCreditId;
+        for (uint256 i = 0; i < amounts.length; i++) {
+            _generateCredit(firstId + i, amounts[i], prices[i]);
+        }
+        // One storage write for the whole batch
+        nextCreditId = firstId + amounts.length;
+    }
+
+    function _generateCredit(uint256 creditId, uint256 amount, uint256 price) private {
+        Credit storage newCredit = credits[creditId]; 
         newCredit.amount = amount;
         newCredit.creator = msg.sender;
         newCredit.owner = msg.sender;
@@ -45,8 +91,7 @@ contract CarbonCredit {
         // newCredit.forSale = false; //by default false
         newCredit.numOfAuditors = (amount/500)*2 + 3;
         
-        
-        nextCreditId++;
+        emit CreditGenerated(creditId, msg.sender, amount, price);
     }
 
     // Buy a carbon credit listed for sale
@@ -67,11 +112,14 @@ contract CarbonCredit {
         
         payable (credit.creator).transfer(creator_share);
         
-        payable(credit.owner).transfer(owner_share);
+        address seller = credit.owner;
+        payable(seller).transfer(owner_share);
 
         // Transfer ownership to the buyer
         credit.owner = msg.sender;
         credit.forSale = false;  
+
+        emit Sold(creditId, seller, msg.sender, msg.value);
     }
 
     // List a carbon credit for sale
@@ -94,6 +142,8 @@ contract CarbonCredit {
 
         credit.price = price;
         credit.forSale = true;
+
+        emit Listed(creditId, msg.sender, price);
     }
 
     // Remove a credit from sale
@@ -105,6 +155,8 @@ contract CarbonCredit {
         }
 
         credit.forSale = false;
+
+        emit Delisted(creditId, msg.sender);
     }
 
     // Check if the credit has expired
@@ -118,6 +170,8 @@ contract CarbonCredit {
             revert OnlyCreatorCanExpire();
         }
         credits[creditId].expired = true;
+
+        emit Expired(creditId, msg.sender);
     }
 
     // Get the owner of a credit
@@ -144,6 +198,8 @@ contract CarbonCredit {
 
         credits[creditId].requestStatus = 1;
         credits[creditId].auditFees = msg.value;
+
+        emit AuditRequested(creditId, msg.value);
     }
 
     function auditCredit(uint256 creditId, bool vote) external {
@@ -155,11 +211,10 @@ contract CarbonCredit {
         if(credit.requestStatus != 1){
             revert AlreadyAudited();
         }
-        for (uint i = 0; i < credit.auditorsList.length; i++) {
-            if (credit.auditorsList[i] == msg.sender) {
-                revert AlreadyAudited();
-            }
+        if (hasAudited[creditId][msg.sender]) {
+            revert AlreadyAudited();
         }
+        hasAudited[creditId][msg.sender] = true;
         credit.AuditInfo[msg.sender] = vote;
         credit.auditorsList.push(msg.sender);
 
@@ -174,6 +229,8 @@ contract CarbonCredit {
             credit.requestStatus = 2;
         }
 
+        emit Audited(creditId, msg.sender, vote, credit.auditScore, credit.requestStatus);
+
         (bool txnStatus, ) = payable(msg.sender).call{value: (credit.auditFees/3)}("");
 
         if(!txnStatus){revert FeeTransactionFailed();}
@@ -187,6 +244,34 @@ contract CarbonCredit {
         return credits[creditId].auditorsList;
     }
 
+    // Up to `count` credits starting at `from`, for dashboards to load in one call
+    function getCredits(uint256 from, uint256 count) external view returns (CreditView[] memory page) {
+        if (from >= nextCreditId) {
+            return new CreditView[](0);
+        }
+        uint256 end = nextCreditId;
+        if (count < end - from) {
+            end = from + count;
+        }
+        page = new CreditView[](end - from);
+        for (uint256 i = from; i < end; i++) {
+            Credit storage credit = credits[i];
+            CreditView memory item = page[i - from];
+            item.id = i;
+            item.amount = credit.amount;
+            item.creator = credit.creator;
+            item.owner = credit.owner;
+            item.expired = credit.expired;
+            item.price = credit.price;
+            item.forSale = credit.forSale;
+            item.requestStatus = credit.requestStatus;
+            item.numOfAuditors = credit.numOfAuditors;
+            item.auditFees = credit.auditFees;
+            item.auditScore = credit.auditScore;
+            item.numOfVotes = credit.auditorsList.length;
+        }
+    }
+
     function getContractBalance() external view returns (uint256) {
         return address(this).balance;
     }
@@ -0,0 +1,172 @@
+const { loadFixture } = require("@nomicfoundation/hardhat-network-helpers");
+const { expect } = require("chai");
+const { ethers } = require("hardhat");
+
+// Gas of the same credit lifecycle on the legacy contract (no events, linear
+// duplicate-vote scan) and the current one. Run with `npx hardhat test test/gas.js`.
+describe("Carbon Credit gas", function () {
+  const AMOUNT = 3000n;            // (3000 / 500) * 2 + 3 = 15 auditors
+  const PRICE = ethers.parseEther("1");
+  const AUDIT_FEES = 10n ** 14n * AMOUNT;
+  // Every vote pays out a third of one credit's fees, so fund the contract
+  // with the fees of several credits before running a full audit
+  const FUNDED_CREDITS = 5n;
+
+  async function deployFixture() {
+    const signers = await ethers.getSigners();
+    const legacy = await ethers.deployContract("CarbonCreditV1");
+    const current = await ethers.deployContract("CarbonCredit");
+    await Promise.all([legacy.waitForDeployment(), current.waitForDeployment()]);
+    return { legacy, current, signers };
+  }
+
+  async function gasOf(txPromise) {
+    const receipt = await (await txPromise).wait();
+    return receipt.gasUsed;
+  }
+
+  // Runs the lifecycle on `contract` and returns gas used per step
+  async function lifecycle(contract, signers) {
+    const [creator, ...others] = signers;
+    const auditors = others.slice(0, Number((AMOUNT / 500n) * 2n + 3n));
+    const buyer = others[auditors.length];
+    const gas = {};
+
+    gas.generateCredit = await gasOf(contract.connect(creator).generateCredit(AMOUNT, PRICE));
+    for (let i = 1n; i < FUNDED_CREDITS; i++) {
+      await contract.connect(creator).generateCredit(AMOUNT, PRICE);
+    }
+    gas.requestAudit = await gasOf(contract.connect(creator).requestAudit(0, { value: AUDIT_FEES }));
+    for (let i = 1n; i < FUNDED_CREDITS; i++) {
+      await contract.connect(creator).requestAudit(i, { value: AUDIT_FEES });
+    }
+
+    for (let i = 0; i < auditors.length; i++) {
+      const used = await gasOf(contract.connect(auditors[i]).auditCredit(0, true));
+      if (i === 0) gas["auditCredit (first vote)"] = used;
+      if (i === auditors.length - 1) gas["auditCredit (last vote)"] = used;
+    }
+
+    gas.sellCredit = await gasOf(contract.connect(creator).sellCredit(0, PRICE));
+    gas.buyCredit = await gasOf(contract.connect(buyer).buyCredit(0, { value: PRICE }));
+    await contract.connect(buyer).sellCredit(0, PRICE);
+    gas.removeFromSale = await gasOf(contract.connect(buyer).removeFromSale(0));
+    gas.Expire = await gasOf(contract.connect(creator).Expire(0));
+    return gas;
+  }
+
+  it("compares gas per operation with the legacy contract", async function () {
+    const { legacy, current, signers } = await loadFixture(deployFixture);
+    const before = await lifecycle(legacy, signers);
+    const after = await lifecycle(current, signers);
+
+    console.table(Object.keys(before).map((operation) => ({
+      operation,
+      legacy: Number(before[operation]),
+      current: Number(after[operation]),
+      delta: Number(after[operation] - before[operation]),
+    })));
+
+    // The duplicate-vote check no longer scans earlier voters
+    expect(after["auditCredit (last vote)"]).to.be.lessThan(before["auditCredit (last vote)"]);
+    const legacyGrowth = before["auditCredit (last vote)"] - before["auditCredit (first vote)"];
+    const currentGrowth = after["auditCredit (last vote)"] - after["auditCredit (first vote)"];
+    expect(currentGrowth).to.be.lessThan(legacyGrowth);
+  });
+
+  it("compares one generateCredits call with a generateCredit per credit", async function () {
+    const { legacy, current, signers } = await loadFixture(deployFixture);
+    const [creator] = signers;
+    const count = 50;
+    const amounts = Array.from({ length: count }, (_, i) => BigInt(100 + i));
+    const prices = amounts.map(() => PRICE);
+
+    let oneByOne = 0n;
+    for (let i = 0; i < count; i++) {
+      oneByOne += await gasOf(legacy.connect(creator).generateCredit(amounts[i], prices[i]));
+    }
+    const batched = await gasOf(current.connect(creator).generateCredits(amounts, prices));
+    console.table([
+      { issue: `${count} x generateCredit`, transactions: count, gas: Number(oneByOne) },
+      { issue: "generateCredits", transactions: 1, gas: Number(batched) },
+    ]);
+
+    expect(await current.getNextCreditId()).to.equal(BigInt(count));
+    const page = await current.getCredits(0, count);
+    expect(page[count - 1].amount).to.equal(amounts[count - 1]);
+    expect(batched).to.be.lessThan(oneByOne);
+    await expect(current.generateCredits([1n], []))
+      .to.be.revertedWithCustomError(current, "LengthMismatch");
+  });
+
+  it("compares one getCredits call with per-field getters", async function () {
+    const { legacy, current, signers } = await loadFixture(deployFixture);
+    const [creator] = signers;
+    const count = 20;
+    for (let i = 0; i < count; i++) {
+      await legacy.connect(creator).generateCredit(AMOUNT, PRICE);
+      await current.connect(creator).generateCredit(AMOUNT, PRICE);
+    }
+
+    // What a dashboard had to do before: several eth_calls per credit
+    let legacyGas = 0n;
+    let legacyCalls = 0;
+    for (let i = 0; i < count; i++) {
+      for (const getter of ["getOwner", "getPrice", "isExpired", "credits"]) {
+        legacyGas += await legacy[getter].estimateGas(i);
+        legacyCalls++;
+      }
+    }
+    const batchGas = await current.getCredits.estimateGas(0, count);
+    console.table([
+      { read: "per-field getters", calls: legacyCalls, gas: Number(legacyGas) },
+      { read: "getCredits", calls: 1, gas: Number(batchGas) },
+    ]);
+
+    const page = await current.getCredits(0, count);
+    expect(page.length).to.equal(count);
+    expect(page[count - 1].id).to.equal(BigInt(count - 1));
+    expect(page[0].owner).to.equal(creator.address);
+    expect(batchGas).to.be.lessThan(legacyGas);
+  });
+});
+
+describe("Carbon Credit events", function () {
+  async function deployFixture() {
+    const [creator, auditor, buyer] = await ethers.getSigners();
+    const carbonCredit = await ethers.deployContract("CarbonCredit");
+    await carbonCredit.waitForDeployment();
+    return { carbonCredit, creator, auditor, buyer };
+  }
+
+  it("emits an event for every state change", async function () {
+    const { carbonCredit, creator, auditor, buyer } = await loadFixture(deployFixture);
+    const amount = 10n;  // 3 auditors
+    const price = 1000n;
+
+    await expect(carbonCredit.generateCredit(amount, price))
+      .to.emit(carbonCredit, "CreditGenerated").withArgs(0, creator.address, amount, price);
+    await expect(carbonCredit.requestAudit(0, { value: 10n ** 14n * amount }))
+      .to.emit(carbonCredit, "AuditRequested").withArgs(0, 10n ** 14n * amount);
+    await expect(carbonCredit.connect(auditor).auditCredit(0, true))
+      .to.emit(carbonCredit, "Audited").withArgs(0, auditor.address, true, 1, 1);
+    await expect(carbonCredit.connect(auditor).auditCredit(0, true))
+      .to.be.revertedWithCustomError(carbonCredit, "AlreadyAudited");
+    expect(await carbonCredit.hasAudited(0, auditor.address)).to.be.true;
+
+    const [, , , second, third] = await ethers.getSigners();
+    await carbonCredit.connect(second).auditCredit(0, true);
+    await expect(carbonCredit.connect(third).auditCredit(0, false))
+      .to.emit(carbonCredit, "Audited").withArgs(0, third.address, false, 1, 2);
+
+    await expect(carbonCredit.sellCredit(0, price))
+      .to.emit(carbonCredit, "Listed").withArgs(0, creator.address, price);
+    await expect(carbonCredit.removeFromSale(0))
+      .to.emit(carbonCredit, "Delisted").withArgs(0, creator.address);
+    await carbonCredit.sellCredit(0, price);
+    await expect(carbonCredit.connect(buyer).buyCredit(0, { value: price }))
+      .to.emit(carbonCredit, "Sold").withArgs(0, creator.address, buyer.address, price);
+    await expect(carbonCredit.Expire(0))
+      .to.emit(carbonCredit, "Expired").withArgs(0, creator.address);
+  });
+});